@@ -0,0 +1,196 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from minesweeper_classes import Board, CompactBoard, Flag, Island, Mines, Game
+
+
+BOARD_CLASSES = {'list': Board, 'compact': CompactBoard}
+DEFAULT_SIZES = [(9, 9), (16, 30), (100, 100), (500, 500), (2000, 2000)]
+DEFAULT_DENSITIES = [0.12, 0.2]
+
+
+def create_game(board_class, rows, columns, mines_amount):
+    """
+    Creates game with empty boards of given size.
+    """
+    play_board = board_class(rows, columns)
+    play_board.set_visualization(rows, columns)
+    island_board = Board(rows, columns)
+    island_board.set_visualization(rows, columns)
+    return Game(play_board, Flag(), Island(island_board), Mines(mines_amount))
+
+
+def first_click(game):
+    return game.play_board.rows() // 2, game.play_board.columns() // 2
+
+
+def planted_game(board_class, rows, columns, mines_amount, seed):
+    game = create_game(board_class, rows, columns, mines_amount)
+    game.play_board.fill_mines(game.mines, first_click(game), seed)
+    return game
+
+
+def numbered_game(board_class, rows, columns, mines_amount, seed):
+    game = planted_game(board_class, rows, columns, mines_amount, seed)
+    game.play_board.info_about_mines_pos()
+    return game
+
+
+def mapped_game(board_class, rows, columns, mines_amount, seed):
+    game = numbered_game(board_class, rows, columns, mines_amount, seed)
+    game.islands.map_islands(game.play_board)
+    game.index_tiles()
+    game.track_mines()
+    return game
+
+
+def play_full_game(game):
+    """
+    Reveals every safe tile which is still hidden and flags every mine,
+    checking winning conditions after each move.
+    """
+    mines_coordinates = set(game.play_board.search_symbol_coordinates('*'))
+    for row in range(game.play_board.rows()):
+        for column in range(game.play_board.columns()):
+            if (row, column) in mines_coordinates:
+                game.flags.add_flag(row, column)
+            elif (row, column) in game.remaining_tiles():
+                game.reveal(row, column)
+            else:
+                continue
+            game.made_move()
+            game.winning_conditions()
+    return game.winning_conditions()
+
+
+def benchmark_cases(seed):
+    """
+    Returns dictionary of operations, each one as pair of setup function,
+    which builds fresh state, and function which is measured.
+    """
+    return {
+        'fill_mines': (
+            create_game,
+            lambda game: game.play_board.fill_mines(game.mines, first_click(game), seed)
+        ),
+        'info_about_mines_pos': (
+            lambda *args: planted_game(*args, seed),
+            lambda game: game.play_board.info_about_mines_pos()
+        ),
+        'map_islands': (
+            lambda *args: numbered_game(*args, seed),
+            lambda game: game.islands.map_islands(game.play_board)
+        ),
+        'search_symbol_coordinates': (
+            lambda *args: numbered_game(*args, seed),
+            lambda game: [game.play_board.search_symbol_coordinates(symbol) for symbol in ('*', '.', '1')]
+        ),
+        'calculate_3bv': (
+            lambda *args: mapped_game(*args, seed),
+            lambda game: game.calculate_3bv()
+        ),
+        'winning_conditions': (
+            lambda *args: mapped_game(*args, seed),
+            lambda game: [game.winning_conditions() for repeat in range(1000)]
+        ),
+        'full_game': (
+            lambda *args: numbered_game(*args, seed),
+            lambda game: (
+                game.islands.map_islands(game.play_board),
+                game.index_tiles(),
+                game.track_mines(),
+                play_full_game(game)
+            )
+        )
+    }
+
+
+def measure(setup, operation, setup_arguments, repeat):
+    """
+    Returns timings of operation on fresh states and peak memory allocated by it.
+    """
+    timings = []
+    for index in range(repeat):
+        state = setup(*setup_arguments)
+        start = time.perf_counter()
+        operation(state)
+        timings.append(time.perf_counter() - start)
+    state = setup(*setup_arguments)
+    tracemalloc.start()
+    operation(state)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return timings, peak_memory
+
+
+def run_benchmarks(sizes, densities, operations=None, board='list', repeat=3, seed=0):
+    """
+    Runs chosen operations for each board size and density of mines.
+    Returns list of results.
+    """
+    cases = benchmark_cases(seed)
+    results = []
+    for rows, columns in sizes:
+        for density in densities:
+            mines_amount = min(rows * columns - 1, max(1, int(density * rows * columns)))
+            for name in operations or cases:
+                setup, operation = cases[name]
+                timings, peak_memory = measure(
+                    setup, operation, (BOARD_CLASSES[board], rows, columns, mines_amount), repeat
+                )
+                results.append({
+                    'operation': name,
+                    'board': board,
+                    'rows': rows,
+                    'columns': columns,
+                    'density': density,
+                    'mines': mines_amount,
+                    'repeat': repeat,
+                    'min_seconds': min(timings),
+                    'mean_seconds': sum(timings) / len(timings),
+                    'peak_memory_bytes': peak_memory
+                })
+    return results
+
+
+def parse_size(size):
+    rows, columns = size.lower().split('x')
+    return int(rows), int(columns)
+
+
+def benchmarkMain(args):
+    parser = argparse.ArgumentParser(description='Benchmarks model of the minesweeper game.')
+    parser.add_argument('--sizes', type=parse_size, nargs='+', default=DEFAULT_SIZES, metavar='ROWSxCOLUMNS')
+    parser.add_argument('--densities', type=float, nargs='+', default=DEFAULT_DENSITIES)
+    parser.add_argument('--operations', nargs='+', choices=list(benchmark_cases(0)))
+    parser.add_argument('--board', choices=list(BOARD_CLASSES), default='list')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='-')
+    arguments = parser.parse_args(args[1:])
+    results = run_benchmarks(
+        arguments.sizes, arguments.densities, arguments.operations, arguments.board, arguments.repeat, arguments.seed
+    )
+    report = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'seed': arguments.seed,
+        'results': results
+    }
+    if arguments.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(arguments.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(benchmarkMain(sys.argv))
@@ -1,22 +1,150 @@
-from random import randint
+from random import Random
 from itertools import product
+from collections.abc import Sequence
+from collections import deque
+import numpy as np
 from minesweeper_errors import (
     check_board_coordinates,
     WrongSymbolError,
-    InvalidCoordinatesFormatError, check_if_in_range, WrongClassError
+    InvalidCoordinatesFormatError, check_if_in_range, WrongClassError, NotInRangeError, NegativeCoordinatesError
 )
+from minesweeper_profiling import profiling_enabled, instrument
 import time
 
 
+def adjacent_mines_count(mine_mask):
+    """
+    Returns array with number of mines adjacent to each cell
+    of given boolean mask of mines. Mask can also be a stack of boards,
+    then the count is done over two last axes.
+    """
+    rows, columns = mine_mask.shape[-2:]
+    padding = ((0, 0),) * (mine_mask.ndim - 2) + ((1, 1), (1, 1))
+    padded_mask = np.pad(mine_mask.astype(np.int8), padding)
+    mines_count = np.zeros(mine_mask.shape, dtype=np.int8)
+    for row_shift, column_shift in product(range(3), range(3)):
+        if (row_shift, column_shift) != (1, 1):
+            mines_count += padded_mask[..., row_shift:row_shift + rows, column_shift:column_shift + columns]
+    return mines_count
+
+
+def _join_empty_runs(empty_mask):
+    """
+    Splits each row of given boolean mask into runs of empty cells and joins
+    them with touching runs of previous row using union-find.
+    Returns list of parents and list of runs as pairs of label and length.
+    """
+    parents = []
+
+    def find(label):
+        while parents[label] != label:
+            parents[label] = parents[parents[label]]
+            label = parents[label]
+        return label
+
+    empty_mask = np.asarray(empty_mask, dtype=bool)
+    rows, columns = empty_mask.shape
+    padded_mask = np.zeros((rows, columns + 2), dtype=np.int8)
+    padded_mask[:, 1:-1] = empty_mask
+    changes = np.flatnonzero(np.diff(padded_mask.ravel())) + 1
+    run_rows, run_starts = np.divmod(changes[::2], columns + 2)
+    run_ends = changes[1::2] - run_rows * (columns + 2)
+    runs = []
+    previous_runs = []
+    current_runs = []
+    current_row = -1
+    first_touching = 0
+    for row, start, end in zip(run_rows.tolist(), run_starts.tolist(), run_ends.tolist()):
+        if row != current_row:
+            previous_runs = current_runs if row == current_row + 1 else []
+            current_runs = []
+            current_row = row
+            first_touching = 0
+        run_label = len(parents)
+        parents.append(run_label)
+        while first_touching < len(previous_runs) and previous_runs[first_touching][1] < start:
+            first_touching += 1
+        touching = first_touching
+        while touching < len(previous_runs) and previous_runs[touching][0] <= end:
+            root, previous_root = find(run_label), find(previous_runs[touching][2])
+            parents[max(root, previous_root)] = min(root, previous_root)
+            touching += 1
+        current_runs.append((start, end, run_label))
+        runs.append((run_label, end - start))
+    return [find(label) for label in range(len(parents))], runs
+
+
+def count_openings(empty_mask):
+    """
+    Returns number of islands (groups of connected empty cells)
+    in given boolean mask.
+    """
+    parents, runs = _join_empty_runs(empty_mask)
+    return sum(1 for label, parent in enumerate(parents) if label == parent)
+
+
+def opening_sizes(empty_mask):
+    """
+    Returns list of sizes of islands in given boolean mask,
+    in order of their first cell.
+    """
+    parents, runs = _join_empty_runs(empty_mask)
+    sizes = {}
+    for run_label, length in runs:
+        sizes[parents[run_label]] = sizes.get(parents[run_label], 0) + length
+    return list(sizes.values())
+
+
+def board_3bv(mine_mask):
+    """
+    Calculates 3bv indicator of board with given boolean mask of mines:
+    number of islands plus number of digits which do not surround any island.
+    """
+    mine_mask = np.asarray(mine_mask, dtype=bool)
+    mines_count = adjacent_mines_count(mine_mask)
+    empty_mask = ~mine_mask & (mines_count == 0)
+    isolated_digits = ~mine_mask & ~empty_mask & (adjacent_mines_count(empty_mask) == 0)
+    return int(isolated_digits.sum()) + count_openings(empty_mask)
+
+
+def batch_board_3bv(mine_masks):
+    """
+    Calculates 3bv indicator for stack of boards with the same size.
+    Returns numpy array with indicator of each board.
+    """
+    mine_masks = np.asarray(mine_masks, dtype=bool)
+    mines_count = adjacent_mines_count(mine_masks)
+    empty_masks = ~mine_masks & (mines_count == 0)
+    isolated_digits = ~mine_masks & ~empty_masks & (adjacent_mines_count(empty_masks) == 0)
+    bv = isolated_digits.sum(axis=(-2, -1))
+    return bv + np.array([count_openings(empty_mask) for empty_mask in empty_masks], dtype=bv.dtype)
+
+
 class Board:
-    def __init__(self, rows=2, columns=2):
+    symbol_index_min_cells = 100
+
+    def __init__(self, rows=2, columns=2, symbol_index=True):
         self._columns = columns
         self._rows = rows
         check_board_coordinates((rows, columns))
         if type(rows) != int or type(columns) != int:
             raise ValueError("Coordinates of board must be integers.")
+        self._use_symbol_index = symbol_index
         self.visualization = [[]]
 
+    @property
+    def visualization(self):
+        """
+        Nested lists with symbols of each cell of the board.
+        """
+        return self._visualization
+
+    @visualization.setter
+    def visualization(self, symbols):
+        self._visualization = symbols
+        self._symbol_index = None
+        self._mine_free = False
+
     def columns(self):
         """
         Get attribute : columns of the board.
@@ -57,8 +185,46 @@ class Board:
         Modifies given board cell with given value.
         """
         check_board_coordinates((row_pos, column_pos))
+        if self._symbol_index is not None:
+            self._update_symbol_index(row_pos, column_pos, self.visualization[row_pos][column_pos], str(value))
+        if str(value) == '*':
+            self._mine_free = False
         self.visualization[row_pos][column_pos] = str(value)
 
+    def uses_symbol_index(self):
+        """
+        Checks if searching for symbols uses index instead of scanning
+        entire board. Small boards are always scanned.
+        """
+        return self._use_symbol_index and self.rows() * self.columns() >= self.symbol_index_min_cells
+
+    def _build_symbol_index(self):
+        """
+        Creates dictionary of symbols and sets of their coordinates.
+        """
+        self._symbol_index = {}
+        for row_index, each_row in enumerate(self.visualization):
+            for column_index, cell in enumerate(each_row):
+                self._symbol_index.setdefault(cell, set()).add((row_index, column_index))
+
+    def _update_symbol_index(self, row_pos, column_pos, old_symbol, new_symbol):
+        """
+        Moves coordinates of cell between symbols of the index.
+        """
+        self._symbol_index.get(old_symbol, set()).discard((row_pos, column_pos))
+        self._symbol_index.setdefault(new_symbol, set()).add((row_pos, column_pos))
+
+    def _scan_symbol_coordinates(self, symbol):
+        """
+        Searches entire board for given symbol.
+        """
+        symbol_coordinates = []
+        for row_index, each_row in enumerate(self.visualization):
+            for column_index, cell in enumerate(each_row):
+                if cell == symbol:
+                    symbol_coordinates.append((row_index, column_index))
+        return symbol_coordinates
+
     def search_symbol_coordinates(self, symbol):
         """
         Searches board for given symbol. Returns a list of coordinates
@@ -69,14 +235,19 @@ class Board:
             raise TypeError('Symbol must be string type')
         if not symbol.lstrip('-').isdigit() and symbol not in allowed_symbols:
             raise WrongSymbolError(f'Given symbol is not in allowed_symbols: {allowed_symbols}')
-        symbol_coordinates = []
-        for row_index, each_row in enumerate(self.visualization):
-            for column_index, cell in enumerate(each_row):
-                if cell == symbol:
-                    i_col = each_row.index(cell, column_index)
-                    i_row = self.visualization.index(each_row, row_index)
-                    symbol_coordinates.append((i_row, i_col))
-        return symbol_coordinates
+        if not self.uses_symbol_index():
+            return self._scan_symbol_coordinates(symbol)
+        if self._symbol_index is None:
+            self._build_symbol_index()
+        return sorted(self._symbol_index.get(symbol, ()))
+
+    def symbol_mask(self, symbol):
+        """
+        Returns boolean numpy array which is True
+        in cells containing given symbol.
+        """
+        mask = np.array([[cell == symbol for cell in row] for row in self.visualization], dtype=bool)
+        return mask.reshape(self.rows(), self.columns())
 
     def set_visualization(self, rows, columns):
         """
@@ -85,24 +256,60 @@ class Board:
         if rows != self.rows() or columns != self.columns():
             raise ValueError
         self.visualization = [["."] * columns for index in range(rows)]
+        self._mine_free = True
+
+    def clear(self):
+        """
+        Makes all cells of the board empty. Lists of rows are reused
+        when they already have size of the board.
+        """
+        rows, columns = self.rows(), self.columns()
+        if len(self._visualization) != rows or any(len(row) != columns for row in self._visualization):
+            self.set_visualization(rows, columns)
+            return
+        empty_row = ["."] * columns
+        for row in self._visualization:
+            row[:] = empty_row
+        self._symbol_index = None
+        self._mine_free = True
 
-    def fill_mines(self, mines, first_move):
+    def fill_mines(self, mines, first_move, seed=None, safe_neighbours=False):
         """
         Places randomly given amount of mines on board.
-        Uses random.randint for choosing cell
-        in which the bomb will be planted.
-        Ignores first chosen by player cell.
+        Cells are sampled without replacement, so it takes time
+        proportional to number of mines. Cells of mines already on the board are skipped,
+        board which was just emptied isn't searched for them at all. Seed can be given as number
+        or random.Random instance to make placement reproducible.
+        Ignores first chosen by player cell and optionally its neighbours.
         """
         check_board_coordinates(first_move)
         check_if_in_range(first_move[0], first_move[1], self.rows(), self.columns())
-        mines_to_plant = mines.amount()
-        while mines_to_plant > 0:
-            random_row = randint(0, self._rows-1)
-            random_column = randint(0, self._columns-1)
-            cell = self.get_coordinates_info(random_row, random_column)
-            if cell != '*' and (random_row, random_column) != first_move:
-                self.set_coordinates(random_row, random_column, "*")
-                mines_to_plant -= 1
+        generator = seed if isinstance(seed, Random) else Random(seed)
+        excluded_cells = {tuple(first_move)}
+        if safe_neighbours:
+            excluded_cells.update(self.cell_neighbours(first_move[0], first_move[1]))
+        if not self._mine_free:
+            # mask doesn't build index of all symbols like search_symbol_coordinates
+            excluded_cells.update(map(tuple, np.argwhere(self.symbol_mask('*')).tolist()))
+        excluded_indexes = sorted(row * self._columns + column for row, column in excluded_cells)
+        free_cells = self._rows * self._columns - len(excluded_indexes)
+        if mines.amount() > free_cells:
+            raise ValueError(f'There is only place for {free_cells} mines on the board')
+        for cell_index in generator.sample(range(free_cells), mines.amount()):
+            for excluded_index in excluded_indexes:
+                if cell_index < excluded_index:
+                    break
+                cell_index += 1
+            self.set_coordinates(cell_index // self._columns, cell_index % self._columns, "*")
+
+    def plant_mines(self, mines_coordinates):
+        """
+        Places mines on given coordinates, e.g. layout prepared by generator.
+        """
+        for row, column in mines_coordinates:
+            check_board_coordinates((row, column))
+            check_if_in_range(row, column, self.rows(), self.columns())
+            self.set_coordinates(row, column, "*")
 
     def cell_neighbours(self, row, column):
         """
@@ -113,12 +320,8 @@ class Board:
         check_if_in_range(row, column, self.rows(), self.columns())
         possible_rows = [row, row+1, row-1]
         possible_columns = [column, column+1, column-1]  # determine possible neighbors of cell
-        for check_row in possible_rows:
-            if check_row < 0 or check_row >= self.rows():
-                possible_rows.pop(possible_rows.index(check_row))
-        for check_column in possible_columns:
-            if check_column < 0 or check_column >= self.columns():
-                possible_columns.pop(possible_columns.index(check_column))
+        possible_rows = [check_row for check_row in possible_rows if 0 <= check_row < self.rows()]
+        possible_columns = [check_column for check_column in possible_columns if 0 <= check_column < self.columns()]
         combinations = list(product(possible_rows, possible_columns))
         combinations.pop(0)  # base cell has to be ignored
         return combinations
@@ -127,20 +330,16 @@ class Board:
         """
         Modifies board that it contains numbers which inform
         player about mines adjacent to certain cell of the board.
-        Function uses product from itertools module to determine
-        surrounding of certain cell.
-        """
-        mines_coords = self.search_symbol_coordinates('*')
-        for coordinates in mines_coords:
-            row, column = coordinates
-            combinations = self.cell_neighbours(row, column)
-            for mine_neighbour in combinations:
-                symbol = self.get_coordinates_info(mine_neighbour[0], mine_neighbour[1])
-                if not symbol.isdigit() and symbol != "*":
-                    symbol = "1"
-                elif symbol.isdigit():
-                    symbol = int(symbol) + 1
-                self.set_coordinates(mine_neighbour[0], mine_neighbour[1], symbol)
+        Numbers of all cells are computed at once as 3x3 sum over mask of mines.
+        """
+        mine_mask = self.symbol_mask('*')
+        mines_count = adjacent_mines_count(mine_mask)
+        for row, column in np.argwhere((mines_count > 0) & ~mine_mask).tolist():
+            symbol = self.get_coordinates_info(row, column)
+            count = int(mines_count[row, column])
+            if symbol.isdigit():
+                count += int(symbol)
+            self.set_coordinates(row, column, count)
 
     def adjacent_symbols(self, combinations):
         """
@@ -154,6 +353,198 @@ class Board:
         return neighbour_indexes
 
 
+HIDDEN_CODE = -1
+EMPTY_CODE = 0
+MINE_CODE = 9
+FLAG_CODE = 10
+CODE_SYMBOLS = {HIDDEN_CODE: '#', EMPTY_CODE: '.', MINE_CODE: '*', FLAG_CODE: '?'}
+CODE_SYMBOLS.update({digit: str(digit) for digit in range(1, 9)})
+SYMBOL_CODES = {symbol: code for code, symbol in CODE_SYMBOLS.items()}
+
+
+def encode_symbol(symbol):
+    """
+    Returns int8 code of given board symbol.
+    """
+    code = SYMBOL_CODES.get(str(symbol))
+    if code is None:
+        raise WrongSymbolError(f'Symbol {symbol} cannot be stored on compact board')
+    return code
+
+
+class BoardRowView(Sequence):
+    """
+    Read-only view of one row of CompactBoard, returns symbols as strings.
+    """
+    def __init__(self, row_codes):
+        self._row_codes = row_codes
+
+    def __getitem__(self, column):
+        if isinstance(column, slice):
+            return [CODE_SYMBOLS[int(code)] for code in self._row_codes[column]]
+        return CODE_SYMBOLS[int(self._row_codes[column])]
+
+    def __len__(self):
+        return len(self._row_codes)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, BoardRowView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class BoardView(Sequence):
+    """
+    Read-only view of CompactBoard which can be indexed
+    like visualization of Board: view[row][column].
+    """
+    def __init__(self, cells):
+        self._cells = cells
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [BoardRowView(row_codes) for row_codes in self._cells[row]]
+        return BoardRowView(self._cells[row])
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, BoardView)):
+            return len(self) == len(other) and all(row == other_row for row, other_row in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return repr([list(row) for row in self])
+
+
+class CompactBoard(Board):
+    """
+    Board which stores cells as int8 codes in numpy array
+    instead of nested lists of strings.
+    """
+    def __init__(self, rows=2, columns=2, symbol_index=True):
+        self.cells = np.zeros((0, 0), dtype=np.int8)
+        super().__init__(rows, columns, symbol_index)
+
+    @property
+    def visualization(self):
+        """
+        Read-only compatibility view of the board.
+        """
+        return BoardView(self.cells)
+
+    @visualization.setter
+    def visualization(self, symbols):
+        """
+        Encodes given nested lists of symbols into the board.
+        """
+        codes = [[encode_symbol(symbol) for symbol in row] for row in symbols if len(row)]
+        if not codes:
+            self.cells = np.zeros((0, 0), dtype=np.int8)
+        else:
+            self.cells = np.array(codes, dtype=np.int8)
+        self._symbol_index = None
+        self._mine_free = False
+
+    def get_coordinates_info(self, row_pos, column_pos):
+        check_board_coordinates((row_pos, column_pos))
+        return CODE_SYMBOLS[int(self.cells[row_pos, column_pos])]
+
+    def plant_mines(self, mines_coordinates):
+        """
+        Places mines on given coordinates, which can also be given as array of pairs.
+        """
+        coordinates = np.asarray(mines_coordinates, dtype=np.int64).reshape(-1, 2)
+        if (coordinates < 0).any():
+            raise NegativeCoordinatesError("Coordinates of minesweeper board must be greater than zero")
+        if (coordinates[:, 0] >= self._rows).any() or (coordinates[:, 1] >= self._columns).any():
+            raise NotInRangeError('Given coordinates are out of range.')
+        self.cells[coordinates[:, 0], coordinates[:, 1]] = MINE_CODE
+        self._symbol_index = None
+        self._mine_free = False
+
+    def get_code(self, row_pos, column_pos):
+        """
+        Returns int8 code of given cell of the board.
+        """
+        check_board_coordinates((row_pos, column_pos))
+        return int(self.cells[row_pos, column_pos])
+
+    def set_coordinates(self, row_pos, column_pos, value):
+        check_board_coordinates((row_pos, column_pos))
+        code = encode_symbol(value)
+        if self._symbol_index is not None:
+            old_symbol = CODE_SYMBOLS[int(self.cells[row_pos, column_pos])]
+            self._update_symbol_index(row_pos, column_pos, old_symbol, CODE_SYMBOLS[code])
+        if code == MINE_CODE:
+            self._mine_free = False
+        self.cells[row_pos, column_pos] = code
+
+    def _build_symbol_index(self):
+        self._symbol_index = {}
+        for code, symbol in CODE_SYMBOLS.items():
+            coordinates = np.argwhere(self.cells == code).tolist()
+            if coordinates:
+                self._symbol_index[symbol] = set(map(tuple, coordinates))
+
+    def _scan_symbol_coordinates(self, symbol):
+        if symbol not in SYMBOL_CODES:
+            return []
+        return [tuple(coordinates) for coordinates in np.argwhere(self.cells == SYMBOL_CODES[symbol]).tolist()]
+
+    def symbol_mask(self, symbol):
+        if str(symbol) not in SYMBOL_CODES:
+            return np.zeros(self.cells.shape, dtype=bool)
+        return self.cells == SYMBOL_CODES[str(symbol)]
+
+    def set_visualization(self, rows, columns):
+        if rows != self.rows() or columns != self.columns():
+            raise ValueError
+        self.cells = np.zeros((rows, columns), dtype=np.int8)
+        self._symbol_index = None
+        self._mine_free = True
+
+    def clear(self):
+        if self.cells.shape != (self.rows(), self.columns()):
+            self.set_visualization(self.rows(), self.columns())
+            return
+        self.cells.fill(EMPTY_CODE)
+        self._symbol_index = None
+        self._mine_free = True
+
+    def info_about_mines_pos(self):
+        mine_mask = self.cells == MINE_CODE
+        mines_count = adjacent_mines_count(mine_mask)
+        digit_mask = (self.cells >= 1) & (self.cells <= 8)
+        mines_count += np.where(digit_mask & (mines_count > 0), self.cells, 0).astype(np.int8)
+        update_mask = (mines_count > 0) & ~mine_mask
+        self.cells[update_mask] = mines_count[update_mask]
+        self._symbol_index = None
+
+
+class CellMask:
+    """
+    Read-only set of coordinates of cells which are True in boolean array of the board.
+    """
+    def __init__(self, mask):
+        self.mask = np.asarray(mask, dtype=bool)
+
+    def __contains__(self, coordinates):
+        row, column = coordinates
+        rows, columns = self.mask.shape
+        return 0 <= row < rows and 0 <= column < columns and bool(self.mask[row, column])
+
+    def __len__(self):
+        return int(self.mask.sum())
+
+    def __iter__(self):
+        return (tuple(cell) for cell in np.argwhere(self.mask).tolist())
+
+
 class Entity:
     def __init__(self, amount=0, symbol=None):
         if type(amount) != int:
@@ -200,29 +591,82 @@ class Mines(Entity):
 class Flag(Entity):
     def __init__(self, flags_placed=0, symbol="?"):
         super().__init__(flags_placed, symbol)
-        self._flag_coordinates = []
+        self._flag_coordinates = {}  # dictionary keeps flags in order of placing
+        self._tracked_mines = set()
+        self._correct_flags = 0
 
     def flag_coordinates(self):
         """
         Getter of list of coordinates with placed flags
         """
-        return self._flag_coordinates
+        return list(self._flag_coordinates)
+
+    def has_flag(self, row, column):
+        """
+        Checks if flag is placed on given cell.
+        """
+        return (row, column) in self._flag_coordinates
+
+    def flags_count(self):
+        """
+        Get number of placed flags.
+        """
+        return len(self._flag_coordinates)
+
+    def track_mines(self, mines_coordinates):
+        """
+        Remembers coordinates of mines to count flags placed on them.
+        """
+        self._tracked_mines = mines_coordinates if isinstance(mines_coordinates, CellMask) else set(mines_coordinates)
+        self._correct_flags = sum(1 for flag in self._flag_coordinates if flag in self._tracked_mines)
+
+    def correct_flags(self):
+        """
+        Get number of flags placed on tracked mines.
+        """
+        return self._correct_flags
+
+    def wrong_flags(self):
+        """
+        Get number of flags placed on cells without tracked mines.
+        """
+        return len(self._flag_coordinates) - self._correct_flags
 
     def add_flag(self, row, column):
         check_board_coordinates((row, column))
         if (row, column) not in self._flag_coordinates:
-            self._flag_coordinates.append((row, column))
+            self._flag_coordinates[(row, column)] = None
+            if (row, column) in self._tracked_mines:
+                self._correct_flags += 1
 
     def remove_flag(self, row, column):
         check_board_coordinates((row, column))
         if (row, column) in self._flag_coordinates:
-            self._flag_coordinates.pop(self._flag_coordinates.index((row, column)))
+            del self._flag_coordinates[(row, column)]
+            if (row, column) in self._tracked_mines:
+                self._correct_flags -= 1
+
+    def add_flags(self, coordinates):
+        """
+        Places flags on all given coordinates.
+        """
+        for row, column in coordinates:
+            self.add_flag(row, column)
+
+    def clear(self):
+        """
+        Removes all placed flags.
+        """
+        self._flag_coordinates = {}
+        self._correct_flags = 0
 
 
 class Island(Entity):
     def __init__(self, island_board, amount=0, icon='.'):
         super().__init__(amount, icon)
         self._island_board = island_board
+        self._island_sizes = {}
+        self._island_boundaries = {}
 
     def island_board(self):
         """
@@ -232,68 +676,113 @@ class Island(Entity):
         """
         return self._island_board
 
+    def island_sizes(self):
+        """
+        Get dictionary of island indexes and number of their cells.
+        """
+        return self._island_sizes
+
+    def island_boundaries(self):
+        """
+        Get dictionary of island indexes and sets of coordinates
+        of digit cells which surround each island.
+        """
+        return self._island_boundaries
+
     def map_islands(self, board):
         """
         fills island board with indexes of islands.
+        Islands are labelled in one pass with union-find,
+        each island gets the lowest index assigned to any of its parts.
         """
         if not isinstance(board, Board):
             raise WrongClassError("You must give object of Board class as argument")
-        island_index = 0
-        island_parts_coordinates = board.search_symbol_coordinates('.')
-        for row, column in island_parts_coordinates:
-            neighbour_digits = []
-            neighbors = self._island_board.cell_neighbours(row, column)
-            for cell_row, cell_column in neighbors:
-                cell_icon = self._island_board.get_coordinates_info(cell_row, cell_column)
-                if cell_icon.isdigit():
-                    neighbour_digits.append(cell_icon)
-            if neighbour_digits:
-                self._island_board.set_coordinates(row, column, min(neighbour_digits))
+        rows = board.rows()
+        columns = board.columns()
+        empty_cells = board.symbol_mask('.').tolist()
+        labels = [[0] * columns for row in range(rows)]
+        parents = [0]
+
+        def find(label):
+            while parents[label] != label:
+                parents[label] = parents[parents[label]]
+                label = parents[label]
+            return label
+
+        for row, column in product(range(rows), range(columns)):
+            if not empty_cells[row][column]:
+                continue
+            visited_neighbours = ((row, column - 1), (row - 1, column - 1), (row - 1, column), (row - 1, column + 1))
+            roots = {
+                find(labels[cell_row][cell_column]) for cell_row, cell_column in visited_neighbours
+                if cell_row >= 0 and 0 <= cell_column < columns and labels[cell_row][cell_column]
+            }
+            if roots:
+                island_index = min(roots)
+                for root in roots:
+                    parents[root] = island_index
             else:
-                island_index += 1
-                self._island_board.set_coordinates(row, column, island_index)
-        for island_number in range(1, island_index):  # combines islands connected with each other on island board
-            island_coords = self._island_board.search_symbol_coordinates(str(island_number))
-            for row, column in island_coords:
-                neighbours = self._island_board.cell_neighbours(row, column)
-                for neighbour_row, neighbour_column in neighbours:
-                    connected_island = self._island_board.get_coordinates_info(neighbour_row, neighbour_column)
-                    if connected_island.isdigit() and int(connected_island) != island_number:
-                        merge_coordinates = self._island_board.search_symbol_coordinates(connected_island)
-                        for merge_row, merge_column in merge_coordinates:
-                            self._island_board.set_coordinates(merge_row, merge_column, str(island_number))
+                island_index = len(parents)
+                parents.append(island_index)
+            labels[row][column] = island_index
+        self._island_sizes = {}
+        self._island_boundaries = {}
+        for row, column in product(range(rows), range(columns)):
+            if not labels[row][column]:
+                continue
+            island_index = find(labels[row][column])
+            labels[row][column] = island_index
+            self._island_sizes[island_index] = self._island_sizes.get(island_index, 0) + 1
+            boundary = self._island_boundaries.setdefault(island_index, set())
+            for cell_row, cell_column in board.cell_neighbours(row, column):
+                if not empty_cells[cell_row][cell_column]:
+                    boundary.add((cell_row, cell_column))
+            self._island_board.set_coordinates(row, column, island_index)
+        self._amount = len(self._island_sizes)
+
+    def clear(self):
+        """
+        Forgets mapped islands, island board has to be cleared separately.
+        """
+        self._island_sizes = {}
+        self._island_boundaries = {}
+        self._amount = 0
 
     def calculate_islands(self):
         """
         calculates number of total islands
         returns list of island indexes
         """
-        island_numbers = []
+        island_numbers = {}  # dictionary keeps indexes in order of appearance
         for row in self._island_board.visualization:
             for island_part in row:
-                if island_part.isdigit() and island_part not in island_numbers:
-                    island_numbers.append(island_part)
+                if island_part.isdigit():
+                    island_numbers[island_part] = None
         self._amount = len(island_numbers)
-        return island_numbers
+        return list(island_numbers)
 
 
 class Difficulty:
-    def __init__(self, name, board_size, number_of_mines):
+    def __init__(self, name, board_size, number_of_mines, no_guess=False):
         self.name = str(name)
         self.board_size = board_size
         check_board_coordinates(board_size)
         self.number_of_mines = number_of_mines
         if number_of_mines < 0:
             raise ValueError
+        self.no_guess = bool(no_guess)
 
     def __str__(self):
         mines = self.number_of_mines
         name = self.name
         (row, column) = self.board_size
         s, form = ('', 'is') if mines == 1 else ('s', 'are')
-        return f'You have chosen {name.lower()} difficulty.\n\
+        info = f'You have chosen {name.lower()} difficulty.\n\
 Size of board is {row}x{column}.\n\
 Be careful, there {form} {mines} mine{s}.'
+        if self.no_guess:
+            info += '\nBoard can be solved without guessing.'
+        return info
 
     def insert_difficulty(self, play_board, island_board, mines):
         """
@@ -310,6 +799,185 @@ Be careful, there {form} {mines} mine{s}.'
         mines.set_mines(self.number_of_mines)
 
 
+def premade_difficulties():
+    """
+    Returns dictionary of predefined levels which player can choose.
+    """
+    return {
+        "Easy": Difficulty("Easy", (9, 9), 10),
+        "Medium": Difficulty("Medium", (13, 15), 40),
+        "Hard": Difficulty("Hard", (30, 16), 99)
+    }
+
+
+class RemainingTiles:
+    """
+    Collection of coordinates not revealed by player.
+    Keeps one byte per cell of the board, so membership test,
+    removal and length take constant time.
+    """
+    def __init__(self, rows=0, columns=0):
+        self._rows = rows
+        self._columns = columns
+        self._bitmap = bytearray(b'\x01') * (rows * columns)
+        self._count = rows * columns
+        self._mines_bitmap = bytearray(rows * columns)
+        self._mines = 0
+        self._unrevealed_mines = 0
+
+    def _cell_index(self, coordinates):
+        """
+        Returns index of coordinates in bitmap or None if they are not on the board.
+        """
+        row, column = coordinates
+        if 0 <= row < self._rows and 0 <= column < self._columns:
+            return row * self._columns + column
+        return None
+
+    def __contains__(self, coordinates):
+        try:
+            cell_index = self._cell_index(coordinates)
+        except (TypeError, ValueError):
+            return False
+        return cell_index is not None and self._bitmap[cell_index] == 1
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        cell_index = self._bitmap.find(1)
+        while cell_index != -1:
+            yield divmod(cell_index, self._columns)
+            cell_index = self._bitmap.find(1, cell_index + 1)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, RemainingTiles)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def shape(self):
+        return self._rows, self._columns
+
+    def clear(self):
+        """
+        Marks all tiles as not revealed and forgets tracked mines, reusing bitmaps.
+        """
+        np.frombuffer(self._bitmap, dtype=np.uint8).fill(1)
+        np.frombuffer(self._mines_bitmap, dtype=np.uint8).fill(0)
+        self._count = self._rows * self._columns
+        self._mines = 0
+        self._unrevealed_mines = 0
+
+    def revealed_tiles(self):
+        """
+        Yields coordinates of revealed tiles in row-major order.
+        """
+        cell_index = self._bitmap.find(0)
+        while cell_index != -1:
+            yield divmod(cell_index, self._columns)
+            cell_index = self._bitmap.find(0, cell_index + 1)
+
+    def track_mines(self, mines_coordinates):
+        """
+        Remembers coordinates of mines to count not revealed safe tiles.
+        """
+        if isinstance(mines_coordinates, CellMask):
+            if mines_coordinates.mask.shape != (self._rows, self._columns):
+                raise NotInRangeError('Mask of mines does not match size of the board.')
+            mines_coordinates = np.argwhere(mines_coordinates.mask)
+        coordinates = np.asarray(mines_coordinates, dtype=np.int64).reshape(-1, 2)
+        if coordinates.size and (
+            (coordinates < 0).any() or (coordinates[:, 0] >= self._rows).any()
+            or (coordinates[:, 1] >= self._columns).any()
+        ):
+            raise NotInRangeError('Given coordinates are out of range.')
+        mines = np.zeros(self._rows * self._columns, dtype=np.uint8)
+        mines[coordinates[:, 0] * self._columns + coordinates[:, 1]] = 1
+        self._mines_bitmap = bytearray(mines.tobytes())
+        self._mines = int(mines.sum())
+        self._unrevealed_mines = int((mines & np.frombuffer(self._bitmap, dtype=np.uint8)).sum())
+
+    def tracked_mines(self):
+        """
+        Get number of tracked mines.
+        """
+        return self._mines
+
+    def unrevealed_mines(self):
+        """
+        Get number of tracked mines which are not revealed.
+        """
+        return self._unrevealed_mines
+
+    def safe_count(self):
+        """
+        Get number of not revealed tiles without tracked mines.
+        """
+        return self._count - self._unrevealed_mines
+
+    def add(self, coordinates):
+        """
+        Marks given coordinates as not revealed.
+        """
+        cell_index = self._cell_index(coordinates)
+        if cell_index is None:
+            raise NotInRangeError('Given coordinates are out of range.')
+        if not self._bitmap[cell_index]:
+            self._bitmap[cell_index] = 1
+            self._count += 1
+            self._unrevealed_mines += self._mines_bitmap[cell_index]
+
+    def discard(self, coordinates):
+        """
+        Marks given coordinates as revealed.
+        Returns True if they were not revealed before.
+        """
+        if coordinates not in self:
+            return False
+        cell_index = self._cell_index(coordinates)
+        self._bitmap[cell_index] = 0
+        self._count -= 1
+        self._unrevealed_mines -= self._mines_bitmap[cell_index]
+        return True
+
+    def snapshot(self):
+        """
+        Returns bitmap of not revealed tiles packed into bytes.
+        """
+        return np.packbits(np.frombuffer(self._bitmap, dtype=np.uint8)).tobytes()
+
+    def restore(self, snapshot):
+        """
+        Reverses snapshot, tracked mines are kept.
+        """
+        cells = self._rows * self._columns
+        bits = np.unpackbits(np.frombuffer(snapshot, dtype=np.uint8))[:cells]
+        if bits.size != cells:
+            raise ValueError('Snapshot does not match size of the board')
+        self._bitmap = bytearray(bits.tobytes())
+        self._count = int(bits.sum())
+        mines = np.frombuffer(self._mines_bitmap, dtype=np.uint8)
+        self._unrevealed_mines = int((mines & bits).sum())
+
+    def remove(self, coordinates):
+        """
+        Marks given coordinates as revealed, raises ValueError if they already were.
+        """
+        if not self.discard(coordinates):
+            raise ValueError(f'{coordinates} is not in remaining tiles')
+
+    def pop(self, index=-1):
+        """
+        Removes and returns coordinates with given position in row-major order.
+        """
+        coordinates = list(self)[index]
+        self.discard(coordinates)
+        return coordinates
+
+
 class Game:
     def __init__(self, play_board, flags, islands, mines):
         if not isinstance(play_board, Board) or not isinstance(flags, Flag):
@@ -321,7 +989,11 @@ class Game:
         self.islands = islands
         self.mines = mines
         self._number_of_moves = 0
-        self._remaining_tiles = []
+        self._remaining_tiles = RemainingTiles()
+        self._mines_tracked = False
+        self._islands_mapped = False
+        self._lost = False
+        self.seed = None
         self.time = 0
 
     def number_of_moves(self):
@@ -338,26 +1010,203 @@ class Game:
 
     def remaining_tiles(self):
         """
-        Get list of coordinates not revealed by player.
+        Get collection of coordinates not revealed by player.
         """
         return self._remaining_tiles
 
+    def remaining_tiles_count(self):
+        """
+        Get number of tiles not revealed by player.
+        """
+        return len(self._remaining_tiles)
+
     def index_tiles(self):
         """
         Creates collection of all coordinates of the game's board
         """
-        for row in range(0, self.play_board.rows()):
-            for column in range(0, self.play_board.columns()):
-                self._remaining_tiles.append((row, column))
+        self._remaining_tiles = RemainingTiles(self.play_board.rows(), self.play_board.columns())
+        self._mines_tracked = False
+        self._lost = False
+
+    def reset(self, difficulty, seed=None):
+        """
+        Starts new game with given difficulty using the same objects.
+        Board, island board and remaining tiles keep their buffers when size
+        of the board doesn't change. Mine field is created at the first move with given seed.
+        """
+        rows, columns = difficulty.board_size
+        island_board = self.islands.island_board()
+        same_size = self._remaining_tiles.shape() == (rows, columns)
+        difficulty.insert_difficulty(self.play_board, island_board, self.mines)
+        if same_size:
+            self.play_board.clear()
+            island_board.clear()
+            self._remaining_tiles.clear()
+        else:
+            self.play_board.set_visualization(rows, columns)
+            island_board.set_visualization(rows, columns)
+            self._remaining_tiles = RemainingTiles(rows, columns)
+        self.flags.clear()
+        self.islands.clear()
+        self._islands_mapped = False
+        self._number_of_moves = 0
+        self._mines_tracked = False
+        self._lost = False
+        self.seed = seed
+
+    def reveal_tile(self, row, column):
+        """
+        Removes given coordinates from remaining tiles.
+        Returns True if tile was not revealed before.
+        """
+        check_board_coordinates((row, column))
+        return self._remaining_tiles.discard((row, column))
+
+    def lost(self):
+        """
+        Checks if player revealed a mine.
+        """
+        return self._lost
+
+    def create_mine_field(self, first_move, seed=None, safe_neighbours=False, mines_coordinates=None):
+        """
+        Plants mines avoiding first move of the player and fills board with numbers.
+        Islands are not needed to play, they are mapped by mapped_islands when asked for.
+        Already generated layout can be given as mines_coordinates.
+        Seed given to reset is used when seed is not given.
+        """
+        if mines_coordinates is None:
+            seed = self.seed if seed is None else seed
+            self.play_board.fill_mines(self.mines, first_move, seed, safe_neighbours)
+        else:
+            self.play_board.plant_mines(mines_coordinates)
+        self.play_board.info_about_mines_pos()
+        self._islands_mapped = False
+        self.track_mines()
+
+    def mapped_islands(self):
+        """
+        Returns islands of the game, mapping them first
+        when mine field was created after the last mapping.
+        """
+        if not self._islands_mapped:
+            self.islands.map_islands(self.play_board)
+            self._islands_mapped = True
+        return self.islands
+
+    def reveal(self, row, column):
+        """
+        Reveals given tile. Empty tile reveals its whole island with surrounding digits,
+        revealed mine shows all mines and ends the game.
+        Returns list of changed tiles as tuples of row, column and symbol.
+        """
+        check_board_coordinates((row, column))
+        check_if_in_range(row, column, self.play_board.rows(), self.play_board.columns())
+        if (row, column) not in self._remaining_tiles or self.flags.has_flag(row, column):
+            return []
+        symbol = self.play_board.get_coordinates_info(row, column)
+        if symbol == '*':
+            self._lost = True
+            mines_coordinates = self.mines.coordinate_list(self.play_board)
+            return [(mine_row, mine_column, '*') for mine_row, mine_column in mines_coordinates]
+        self._remaining_tiles.discard((row, column))
+        changed_tiles = [(row, column, symbol)]
+        islands_to_reveal = deque([(row, column)] if symbol == '.' else [])
+        while islands_to_reveal:
+            island_row, island_column = islands_to_reveal.popleft()
+            for neighbour in self.play_board.cell_neighbours(island_row, island_column):
+                if neighbour not in self._remaining_tiles or self.flags.has_flag(*neighbour):
+                    continue
+                neighbour_symbol = self.play_board.get_coordinates_info(*neighbour)
+                self._remaining_tiles.discard(neighbour)
+                changed_tiles.append((*neighbour, neighbour_symbol))
+                if neighbour_symbol == '.':
+                    islands_to_reveal.append(neighbour)
+        return changed_tiles
+
+    def chord(self, row, column):
+        """
+        Reveals all neighbours of revealed digit which are not flagged,
+        when number of flags around it is equal to the digit.
+        Returns list of changed tiles as tuples of row, column and symbol.
+        """
+        check_board_coordinates((row, column))
+        check_if_in_range(row, column, self.play_board.rows(), self.play_board.columns())
+        if (row, column) in self._remaining_tiles or self._lost:
+            return []
+        symbol = self.play_board.get_coordinates_info(row, column)
+        if not symbol.isdigit():
+            return []
+        neighbours = self.play_board.cell_neighbours(row, column)
+        if sum(self.flags.has_flag(*neighbour) for neighbour in neighbours) != int(symbol):
+            return []
+        changed_tiles = []
+        for neighbour in neighbours:
+            changed_tiles += self.reveal(*neighbour)
+            if self._lost:
+                break
+        return changed_tiles
+
+    def visible_tiles(self):
+        """
+        Returns list of tiles which player sees, as tuples of row, column and symbol:
+        revealed tiles, flags and, when the game is lost, all mines.
+        """
+        board = self.play_board
+        tiles = [
+            (row, column, board.get_coordinates_info(row, column))
+            for row, column in self._remaining_tiles.revealed_tiles()
+        ]
+        tiles += [(row, column, self.flags.symbol()) for row, column in self.flags.flag_coordinates()]
+        if self._lost:
+            tiles += [(row, column, '*') for row, column in self.mines.coordinate_list(board)]
+        return tiles
+
+    def snapshot(self):
+        """
+        Returns state of the game which changes during play: packed bitmap of not revealed
+        tiles, coordinates of flags, number of moves and if the game is lost.
+        """
+        return (
+            self._remaining_tiles.snapshot(), tuple(self.flags.flag_coordinates()), self._number_of_moves, self._lost
+        )
+
+    def restore(self, snapshot):
+        """
+        Brings back state of the game saved by snapshot on the same mine field.
+        """
+        remaining_tiles, flags, number_of_moves, lost = snapshot
+        if not self._mines_tracked:
+            self.track_mines()
+        self._remaining_tiles.restore(remaining_tiles)
+        self.flags.clear()
+        self.flags.add_flags(flags)
+        self._number_of_moves = number_of_moves
+        self._lost = lost
+
+    def track_mines(self):
+        """
+        Remembers positions of planted mines, so revealed tiles and flags
+        update counters used by winning conditions.
+        Has to be called again when mines on the board change.
+        """
+        mines_coordinates = CellMask(self.play_board.symbol_mask('*'))
+        self._remaining_tiles.track_mines(mines_coordinates)
+        self.flags.track_mines(mines_coordinates)
+        self._mines_tracked = True
 
     def winning_conditions(self):
         """
         Checks if condition of win are met.
+        Uses counters of flags and revealed tiles, so it takes constant time.
         """
-        mines_coordinates = self.mines.coordinate_list(self.play_board)
-        flags_coordinates = self.flags.flag_coordinates()
-        flags_win = (sorted(flags_coordinates) == sorted(mines_coordinates))
-        cleared_board_win = (sorted(mines_coordinates) == sorted(self._remaining_tiles))
+        if not self._mines_tracked:
+            self.track_mines()
+        mines_amount = self._remaining_tiles.tracked_mines()
+        flags_win = self.flags.correct_flags() == mines_amount and self.flags.wrong_flags() == 0
+        cleared_board_win = (
+            self._remaining_tiles.safe_count() == 0 and self._remaining_tiles.unrevealed_mines() == mines_amount
+        )
         if cleared_board_win or flags_win:
             return True
         else:
@@ -374,14 +1223,13 @@ class Game:
         calculates 3bv indicator
         return value of this indicator.
         """
-        bv = 0
-        self.islands.calculate_islands()
-        for row_index, rows in enumerate(self.play_board.visualization):
-            for column_index, tile_symbol in enumerate(rows):
-                if tile_symbol.isdigit():
-                    island_cell_neighbours = self.islands.island_board().cell_neighbours(row_index, column_index)
-                    island_cell_neighbours_icons = self.islands.island_board().adjacent_symbols(island_cell_neighbours)
-                    if not any(cell.isdigit() for cell in island_cell_neighbours_icons):
-                        bv += 1
-        bv += self.islands.amount()
-        return bv
+        return board_3bv(self.play_board.symbol_mask('*'))
+
+
+if profiling_enabled():
+    instrument(Board, 'fill_mines')
+    instrument(Board, 'info_about_mines_pos')
+    instrument(CompactBoard, 'info_about_mines_pos')
+    instrument(Island, 'map_islands')
+    instrument(Game, 'calculate_3bv')
+    instrument(Game, 'winning_conditions')
@@ -0,0 +1,338 @@
+import argparse
+import sys
+import zlib
+from collections import OrderedDict, deque
+from random import Random
+
+import numpy as np
+
+from minesweeper_classes import HIDDEN_CODE, EMPTY_CODE, MINE_CODE, FLAG_CODE, CODE_SYMBOLS, adjacent_mines_count
+
+
+class Chunk:
+    """
+    Generated chunk of endless board: codes of its cells (digits or mine),
+    which of them are revealed and flags placed on them.
+    """
+    __slots__ = ('codes', 'revealed', 'flags')
+
+    def __init__(self, codes, revealed, flags):
+        self.codes = codes
+        self.revealed = revealed
+        self.flags = flags
+
+    def has_player_state(self):
+        return bool(self.flags) or bool(self.revealed.any())
+
+
+class EndlessBoard:
+    """
+    Board without edges, split into square chunks. Mines of each chunk are derived from seed
+    and coordinates of the chunk, so chunk is generated only when reveal reaches it.
+    Only max_active_chunks recently used chunks are kept decoded. Older chunks are dropped
+    when player hasn't touched them, otherwise only their revealed cells and flags are kept compressed.
+    Cells around start cell (0, 0) never contain mines.
+    """
+    chunk_size = 32
+    max_active_chunks = 256
+    max_cached_mine_masks = 64
+    max_flood_cells = 10000
+
+    def __init__(self, seed=0, density=0.16, chunk_size=None):
+        if chunk_size is not None:
+            self.chunk_size = chunk_size
+        if self.chunk_size < 2:
+            raise ValueError('Chunk has to be at least 2 cells wide')
+        if not 0 < density < 1:
+            raise ValueError('Density of mines must be between 0 and 1')
+        self.seed = seed
+        self.mines_per_chunk = max(1, round(density * self.chunk_size ** 2))
+        self._active_chunks = OrderedDict()
+        self._compressed_chunks = {}
+        self._mine_masks = OrderedDict()
+        self._pending_reveal = deque()
+        self._revealed_count = 0
+        self._number_of_moves = 0
+        self._lost = False
+
+    def chunk_coordinates(self, row, column):
+        """
+        Returns coordinates of chunk containing given cell and position of the cell in it.
+        """
+        chunk_row, local_row = divmod(row, self.chunk_size)
+        chunk_column, local_column = divmod(column, self.chunk_size)
+        return (chunk_row, chunk_column), (local_row, local_column)
+
+    def chunk_mine_mask(self, chunk_row, chunk_column):
+        """
+        Returns boolean mask of mines in given chunk, always the same for the same seed.
+        """
+        key = (chunk_row, chunk_column)
+        if key in self._mine_masks:
+            self._mine_masks.move_to_end(key)
+            return self._mine_masks[key]
+        size = self.chunk_size
+        generator = Random(f'{self.seed}-{chunk_row}-{chunk_column}')
+        mask = np.zeros(size * size, dtype=bool)
+        mask[generator.sample(range(size * size), self.mines_per_chunk)] = True
+        mask = mask.reshape(size, size)
+        for row in range(-1, 2):
+            for column in range(-1, 2):
+                if self.chunk_coordinates(row, column)[0] == key:
+                    mask[row % size, column % size] = False
+        self._mine_masks[key] = mask
+        if len(self._mine_masks) > self.max_cached_mine_masks:
+            self._mine_masks.popitem(last=False)
+        return mask
+
+    def _generate_chunk(self, key):
+        chunk_row, chunk_column = key
+        size = self.chunk_size
+        surrounding_mines = np.block([
+            [self.chunk_mine_mask(chunk_row + row_shift, chunk_column + column_shift) for column_shift in (-1, 0, 1)]
+            for row_shift in (-1, 0, 1)
+        ])
+        mine_mask = surrounding_mines[size:2 * size, size:2 * size]
+        codes = adjacent_mines_count(surrounding_mines)[size:2 * size, size:2 * size].copy()
+        codes[mine_mask] = MINE_CODE
+        revealed = np.zeros((size, size), dtype=bool)
+        flags = set()
+        if key in self._compressed_chunks:
+            packed_revealed, flags = self._compressed_chunks.pop(key)
+            bits = np.unpackbits(np.frombuffer(zlib.decompress(packed_revealed), dtype=np.uint8))
+            revealed = bits[:size * size].reshape(size, size).astype(bool)
+            flags = set(flags)
+        return Chunk(codes, revealed, flags)
+
+    def _chunk(self, key):
+        """
+        Returns decoded chunk, generating it when needed. Chunks are not evicted here,
+        so returned chunk stays valid until _evict_chunks is called.
+        """
+        chunk = self._active_chunks.get(key)
+        if chunk is None:
+            chunk = self._active_chunks[key] = self._generate_chunk(key)
+        else:
+            self._active_chunks.move_to_end(key)
+        return chunk
+
+    def _evict_chunks(self):
+        while len(self._active_chunks) > self.max_active_chunks:
+            key, chunk = self._active_chunks.popitem(last=False)
+            if chunk.has_player_state():
+                packed_revealed = zlib.compress(np.packbits(chunk.revealed).tobytes())
+                self._compressed_chunks[key] = (packed_revealed, tuple(chunk.flags))
+
+    def active_chunks_count(self):
+        return len(self._active_chunks)
+
+    def compressed_chunks_count(self):
+        return len(self._compressed_chunks)
+
+    def memory_usage(self):
+        """
+        Returns approximate number of bytes used by cells of chunks.
+        """
+        active = sum(chunk.codes.nbytes + chunk.revealed.nbytes for chunk in self._active_chunks.values())
+        compressed = sum(len(packed_revealed) + 16 * len(flags) for packed_revealed, flags in self._compressed_chunks.values())
+        return active + compressed
+
+    def get_coordinates_info(self, row, column):
+        """
+        Returns symbol of given cell: '*', '.' or digit.
+        """
+        key, (local_row, local_column) = self.chunk_coordinates(row, column)
+        symbol = CODE_SYMBOLS[int(self._chunk(key).codes[local_row, local_column])]
+        self._evict_chunks()
+        return symbol
+
+    def is_revealed(self, row, column):
+        key, (local_row, local_column) = self.chunk_coordinates(row, column)
+        revealed = bool(self._chunk(key).revealed[local_row, local_column])
+        self._evict_chunks()
+        return revealed
+
+    def has_flag(self, row, column):
+        key, local_cell = self.chunk_coordinates(row, column)
+        if key in self._active_chunks:
+            return local_cell in self._active_chunks[key].flags
+        return key in self._compressed_chunks and local_cell in self._compressed_chunks[key][1]
+
+    def toggle_flag(self, row, column):
+        """
+        Places flag on hidden cell or removes it. Returns True if flag was placed.
+        """
+        key, local_cell = self.chunk_coordinates(row, column)
+        chunk = self._chunk(key)
+        placed = False
+        if not chunk.revealed[local_cell]:
+            placed = local_cell not in chunk.flags
+            if placed:
+                chunk.flags.add(local_cell)
+            else:
+                chunk.flags.discard(local_cell)
+        self._evict_chunks()
+        return placed
+
+    def reveal(self, row, column):
+        """
+        Reveals given cell, empty cell reveals its whole island with surrounding digits.
+        Returns list of changed cells as tuples of row, column and symbol.
+        Revealed mine ends the game, only this mine is shown and it doesn't count to score.
+        At most max_flood_cells cells are revealed at once. Rest of bigger island is kept
+        as pending reveal (see has_pending_reveal), continue_reveal reveals its next part.
+        """
+        key, local_cell = self.chunk_coordinates(row, column)
+        chunk = self._chunk(key)
+        if self._lost or chunk.revealed[local_cell] or local_cell in chunk.flags:
+            return []
+        self._number_of_moves += 1
+        if chunk.codes[local_cell] == MINE_CODE:
+            self._lost = True
+            chunk.revealed[local_cell] = True
+            self._pending_reveal.clear()
+            return [(row, column, '*')]
+        self._pending_reveal.append((row, column))
+        return self._flood()
+
+    def has_pending_reveal(self):
+        return bool(self._pending_reveal)
+
+    def continue_reveal(self):
+        """
+        Reveals next part of island which was too big to be revealed at once, see reveal.
+        Returns list of changed cells like reveal.
+        """
+        return self._flood()
+
+    def _flood(self):
+        changed_cells = []
+        cells_to_reveal = self._pending_reveal
+        while cells_to_reveal and len(changed_cells) < self.max_flood_cells:
+            cell_row, cell_column = cells_to_reveal.popleft()
+            key, local_cell = self.chunk_coordinates(cell_row, cell_column)
+            chunk = self._chunk(key)
+            if chunk.revealed[local_cell] or local_cell in chunk.flags:
+                continue
+            chunk.revealed[local_cell] = True
+            code = int(chunk.codes[local_cell])
+            changed_cells.append((cell_row, cell_column, CODE_SYMBOLS[code]))
+            if code == EMPTY_CODE:
+                cells_to_reveal.extend(
+                    (cell_row + row_shift, cell_column + column_shift)
+                    for row_shift in (-1, 0, 1) for column_shift in (-1, 0, 1) if row_shift or column_shift
+                )
+        self._revealed_count += len(changed_cells)
+        self._evict_chunks()
+        return changed_cells
+
+    def lost(self):
+        return self._lost
+
+    def revealed_count(self):
+        """
+        Get number of revealed cells, which is the score of the game.
+        """
+        return self._revealed_count
+
+    def number_of_moves(self):
+        return self._number_of_moves
+
+    def visible_codes(self, top, left, rows, columns):
+        """
+        Returns array of codes of cells which player sees in given window of the board,
+        like BoardModel states: hidden cells have HIDDEN_CODE and flags FLAG_CODE.
+        Chunks which were never touched are not generated.
+        """
+        codes = np.full((rows, columns), HIDDEN_CODE, dtype=np.int8)
+        size = self.chunk_size
+        first_chunk = self.chunk_coordinates(top, left)[0]
+        last_chunk = self.chunk_coordinates(top + rows - 1, left + columns - 1)[0]
+        for chunk_row in range(first_chunk[0], last_chunk[0] + 1):
+            for chunk_column in range(first_chunk[1], last_chunk[1] + 1):
+                key = (chunk_row, chunk_column)
+                if key not in self._active_chunks and key not in self._compressed_chunks:
+                    continue
+                chunk = self._chunk(key)
+                chunk_codes = np.where(chunk.revealed, chunk.codes, HIDDEN_CODE)
+                for flag_row, flag_column in chunk.flags:
+                    chunk_codes[flag_row, flag_column] = FLAG_CODE
+                window_top = max(top, chunk_row * size)
+                window_left = max(left, chunk_column * size)
+                window_bottom = min(top + rows, (chunk_row + 1) * size)
+                window_right = min(left + columns, (chunk_column + 1) * size)
+                codes[window_top - top:window_bottom - top, window_left - left:window_right - left] = chunk_codes[
+                    window_top - chunk_row * size:window_bottom - chunk_row * size,
+                    window_left - chunk_column * size:window_right - chunk_column * size
+                ]
+        self._evict_chunks()
+        return codes
+
+
+def render_window(board, top, left, rows, columns):
+    """
+    Returns text of given window of the board, one line per row.
+    """
+    codes = board.visible_codes(top, left, rows, columns)
+    return '\n'.join(''.join(CODE_SYMBOLS[int(code)] for code in row) for row in codes)
+
+
+def play_endless(board, commands, output, rows=20, columns=40):
+    """
+    Plays endless board with text commands: 'reveal ROW COLUMN', 'flag ROW COLUMN',
+    'more' (continues reveal of big island), 'view ROW COLUMN' and 'quit'.
+    After every command window of the board centered at last used cell and score are written to output.
+    Returns score of the game.
+    """
+    center = (0, 0)
+    for line in commands:
+        words = line.split()
+        if not words:
+            continue
+        command = words[0].lower()
+        if command == 'quit':
+            break
+        try:
+            if command == 'more':
+                board.continue_reveal()
+            elif command in ('reveal', 'flag', 'view') and len(words) == 3:
+                center = (int(words[1]), int(words[2]))
+                if command == 'reveal':
+                    board.reveal(*center)
+                elif command == 'flag':
+                    board.toggle_flag(*center)
+            else:
+                raise ValueError(command)
+        except ValueError:
+            print(f'Wrong command: {line.strip()}', file=output)
+            continue
+        print(render_window(board, center[0] - rows // 2, center[1] - columns // 2, rows, columns), file=output)
+        status = f'Score: {board.revealed_count()}, moves: {board.number_of_moves()}'
+        if board.lost():
+            status += ', game over'
+        elif board.has_pending_reveal():
+            status += ", island is not fully revealed, type 'more'"
+        print(status, file=output)
+        if board.lost():
+            break
+    return board.revealed_count()
+
+
+def endlessMain(args):
+    parser = argparse.ArgumentParser(description='Plays minesweeper on endless board in terminal.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--density', type=float, default=0.16)
+    parser.add_argument('--rows', type=int, default=20, help='rows of shown window')
+    parser.add_argument('--columns', type=int, default=40, help='columns of shown window')
+    arguments = parser.parse_args(args[1:])
+    try:
+        board = EndlessBoard(arguments.seed, arguments.density)
+    except ValueError as error:
+        parser.error(str(error))
+    print("Commands: reveal ROW COLUMN, flag ROW COLUMN, more, view ROW COLUMN, quit. Start at 'reveal 0 0'.")
+    play_endless(board, sys.stdin, sys.stdout, arguments.rows, arguments.columns)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(endlessMain(sys.argv))
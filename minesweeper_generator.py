@@ -0,0 +1,146 @@
+import argparse
+import base64
+import gzip
+import json
+import sys
+from functools import partial
+from multiprocessing import Pool
+
+import numpy as np
+
+from minesweeper_classes import (
+    CompactBoard,
+    Mines,
+    Difficulty,
+    premade_difficulties,
+    adjacent_mines_count,
+    board_3bv,
+    opening_sizes
+)
+from minesweeper_solver import generate_no_guess_layout
+
+
+def pack_layout(mine_mask):
+    """
+    Returns mine layout packed into bits and encoded as base64 text.
+    """
+    return base64.b64encode(np.packbits(mine_mask).tobytes()).decode('ascii')
+
+
+def unpack_layout(packed_layout, rows, columns):
+    """
+    Reverses pack_layout, returns boolean mask of mines.
+    """
+    bits = np.unpackbits(np.frombuffer(base64.b64decode(packed_layout), dtype=np.uint8))
+    return bits[:rows * columns].reshape(rows, columns).astype(bool)
+
+
+def board_seed(seed, index):
+    """
+    Returns seed of board with given index, independent of worker generating it.
+    """
+    return f'{seed}-{index}'
+
+
+def generate_board(difficulty, seed, safe_neighbours, index):
+    """
+    Generates one board of given difficulty with first click in the middle.
+    Returns dictionary with its layout and statistics.
+    Boards of no guess difficulty always have safe neighbours of first click.
+    """
+    rows, columns = difficulty.board_size
+    first_click = (rows // 2, columns // 2)
+    board = CompactBoard(rows, columns, symbol_index=False)
+    board.set_visualization(rows, columns)
+    if difficulty.no_guess:
+        mines_coordinates, statistics = generate_no_guess_layout(
+            rows, columns, difficulty.number_of_mines, first_click, board_seed(seed, index), time_budget=1.0
+        )
+        board.plant_mines(mines_coordinates)
+    else:
+        board.fill_mines(Mines(difficulty.number_of_mines), first_click, board_seed(seed, index), safe_neighbours)
+    mine_mask = board.symbol_mask('*')
+    openings = opening_sizes(~mine_mask & (adjacent_mines_count(mine_mask) == 0))
+    result = {
+        'index': index,
+        'rows': rows,
+        'columns': columns,
+        'mines': difficulty.number_of_mines,
+        'first_click': first_click,
+        'layout': pack_layout(mine_mask),
+        '3bv': board_3bv(mine_mask),
+        'islands': len(openings),
+        'openings': openings
+    }
+    if difficulty.no_guess:
+        result['no_guess'] = statistics['solved']
+        result['repairs'] = statistics['repairs']
+    return result
+
+
+def generate_boards(difficulty, count, seed=0, workers=1, safe_neighbours=False):
+    """
+    Yields generated boards in order of their indexes.
+    Boards are generated in pool of processes when more than one worker is given.
+    """
+    generate = partial(generate_board, difficulty, seed, safe_neighbours)
+    if workers <= 1:
+        yield from map(generate, range(count))
+        return
+    chunk_size = max(1, min(1000, count // (workers * 16)))
+    with Pool(workers) as pool:
+        yield from pool.imap(generate, range(count), chunk_size)
+
+
+def parse_difficulty(arguments):
+    """
+    Creates Difficulty from parsed command line arguments.
+    """
+    if arguments.custom is None:
+        difficulty = premade_difficulties()[arguments.level]
+        difficulty.no_guess = arguments.no_guess
+        return difficulty
+    rows, columns, mines = arguments.custom
+    if mines >= rows * columns:
+        raise ValueError('Number of mines cannot be higher or equal total size of Board!')
+    return Difficulty("Custom", (rows, columns), mines, arguments.no_guess)
+
+
+def open_output(path):
+    """
+    Opens output file, files ending with .gz are compressed.
+    """
+    if path == '-':
+        return sys.stdout
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt')
+    return open(path, 'w')
+
+
+def generatorMain(args):
+    parser = argparse.ArgumentParser(description='Generates minesweeper boards without GUI.')
+    parser.add_argument('--level', choices=list(premade_difficulties()), default='Easy')
+    parser.add_argument('--custom', type=int, nargs=3, metavar=('ROWS', 'COLUMNS', 'MINES'))
+    parser.add_argument('--count', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--safe-neighbours', action='store_true')
+    parser.add_argument('--no-guess', action='store_true')
+    parser.add_argument('--output', default='boards.jsonl')
+    arguments = parser.parse_args(args[1:])
+    difficulty = parse_difficulty(arguments)
+    output = open_output(arguments.output)
+    try:
+        boards = generate_boards(
+            difficulty, arguments.count, arguments.seed, arguments.workers, arguments.safe_neighbours
+        )
+        for board in boards:
+            output.write(json.dumps(board, separators=(',', ':')) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(generatorMain(sys.argv))
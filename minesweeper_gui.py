@@ -1,10 +1,19 @@
 from minesweeper_errors import check_board_coordinates, IconNotInKeysError
 from ui_difficulty import Ui_MainWindow
-from PySide2.QtCore import QSize, Qt, QEvent, QObject
-from PySide2.QtGui import QPixmap, QIcon
-from PySide2.QtWidgets import QMainWindow, QTableWidget, QLabel
-from PySide2.QtWidgets import QPushButton, QMessageBox, QHBoxLayout, QVBoxLayout
-from minesweeper_classes import Board, Flag, Mines, Island, Game, Difficulty
+from PySide2.QtCore import QSize, Qt, QEvent, QObject, QAbstractTableModel, QModelIndex, Signal, QTimer
+from PySide2.QtGui import QPixmap, QIcon, QBrush, QColor
+from PySide2.QtWidgets import QMainWindow, QTableWidget, QTableView, QLabel, QAbstractItemView, QHeaderView
+from PySide2.QtWidgets import QPushButton, QMessageBox, QHBoxLayout, QVBoxLayout, QFileDialog
+from minesweeper_classes import Board, Flag, Mines, Island, Game, Difficulty, premade_difficulties
+from minesweeper_classes import HIDDEN_CODE, EMPTY_CODE, MINE_CODE, FLAG_CODE
+from minesweeper_solver import generate_no_guess_layout
+from minesweeper_probability import MineProbabilities, bot_moves
+from minesweeper_recorder import GameRecorder
+from minesweeper_save import save_game
+from minesweeper_profiling import profiling_enabled, instrument, profiler
+from random import randrange
+import numpy as np
+import os
 import sys
 
 
@@ -87,6 +96,7 @@ class SetDifficulty(QMainWindow):
         inserts chosen difficulty and informs player about that with proper text.
         """
         level.insert_difficulty(self.Game.play_board, self.Game.islands.island_board(), self.Game.mines)
+        self.board_gui.no_guess = level.no_guess
         self.difficulty_ui.infoLabel.setText(str(level))
         self.difficulty_ui.startButton.setEnabled(True)
 
@@ -94,46 +104,282 @@ class SetDifficulty(QMainWindow):
         """
         creates customBox of predefined levels which player can choose instead of creating own one.
         """
-        premade_levels = {
-            "Easy": Difficulty("Easy", (9, 9), 10),
-            "Medium": Difficulty("Medium", (13, 15), 40),
-            "Hard": Difficulty("Hard", (30, 16), 99)
-        }
+        premade_levels = premade_difficulties()
+        no_guess = bool(self.difficulty_ui.noGuessBox.checkState())
         if self.difficulty_ui.customBox.checkState():
             rows_amount = self.difficulty_ui.rowsSlider.value()
             columns_amount = self.difficulty_ui.columnsSlider.value()
             mines_amount = self.difficulty_ui.minesSlider.value()
-            if mines_amount >= rows_amount*columns_amount:
-                self.amount_error_popup()
+            # no guessing mode keeps first click and its neighbours free of mines
+            safe_cells = min(rows_amount, 3) * min(columns_amount, 3) if no_guess else 1
+            if mines_amount > rows_amount*columns_amount - safe_cells:
+                self.amount_error_popup(safe_cells)
             else:
-                level = Difficulty("Custom", (rows_amount, columns_amount), mines_amount)
+                level = Difficulty("Custom", (rows_amount, columns_amount), mines_amount, no_guess)
                 self.exec_difficulty(level)
                 self.difficulty_ui.startButton.setEnabled(True)
         else:
             self.difficulty_ui.startButton.setEnabled(True)
             level_chosen = self.difficulty_ui.difficultyBox.currentText()
             level = premade_levels.get(level_chosen)
+            level.no_guess = no_guess
             self.exec_difficulty(level)
 
-    def amount_error_popup(self):
+    def amount_error_popup(self, safe_cells=1):
         """
-        error pop-up when player choose more/equal mines to size of board
+        error pop-up when player choose more/equal mines to size of board,
+        or doesn't leave enough cells without mines for no guessing mode
         """
         self.error_popup = QMessageBox()
         self.error_popup.setWindowTitle("CustomSettingsError")
         self.error_popup.setIcon(QMessageBox.Warning)
-        self.error_popup.setText("Number of mines cannot be higher or equal total size of Board!")
+        if safe_cells > 1:
+            self.error_popup.setText(f"With no guessing there must be at least {safe_cells} cells without mines!")
+        else:
+            self.error_popup.setText("Number of mines cannot be higher or equal total size of Board!")
         self.error_popup.exec_()
 
 
+def cell_code(icon_type, digit=None):
+    """
+    returns code of cell state shown with icon of given type
+    """
+    codes = {
+        'blank_icon': EMPTY_CODE,
+        'bomb_icon': MINE_CODE,
+        'flag_icon': FLAG_CODE
+    }
+    if icon_type == 'number_icon':
+        return int(digit)
+    if icon_type not in codes:
+        raise IconNotInKeysError("There isn't icon of this name in the database")
+    return codes[icon_type]
+
+
+def code_icon(code):
+    """
+    returns type and digit of icon which shows cell state with given code
+    """
+    icon_types = {
+        EMPTY_CODE: 'blank_icon',
+        MINE_CODE: 'bomb_icon',
+        FLAG_CODE: 'flag_icon'
+    }
+    if code in icon_types:
+        return icon_types[code], None
+    return 'number_icon', code
+
+
+def hint_color(probability):
+    """
+    returns color of hidden cell with given probability of mine, from green (safe) to red (mine)
+    """
+    return QColor(int(255 * probability), int(255 * (1 - probability)), 90)
+
+
+def symbol_cell(row, column, symbol):
+    """
+    returns cell tuple used by MinesweeperBoard.show_cells for symbol of the board
+    """
+    if symbol == '*':
+        return row, column, 'bomb_icon', None, False
+    if symbol == '.':
+        return row, column, 'blank_icon', None, True
+    if symbol == '?':
+        return row, column, 'flag_icon', None, True
+    return row, column, 'number_icon', symbol, True
+
+
+class IconCache:
+    """
+    Stores icons of cells scaled to given size,
+    so each picture is read from disk and scaled only once.
+    """
+    icon_types = [('blank_icon', None), ('bomb_icon', None), ('flag_icon', None)]
+    icon_types += [('number_icon', digit) for digit in range(1, 9)]
+
+    def __init__(self):
+        self._icons = {}
+
+    def load(self, size):
+        """
+        creates icons of all types scaled to given size
+        """
+        for icon_type, digit in self.icon_types:
+            self.icon(icon_type, digit, size)
+
+    def icon(self, icon_type, digit=None, size=QSize(45, 45)):
+        """
+        returns icon of given type and size, creates it when it is needed for the first time
+        """
+        digit = None if digit is None else int(digit)
+        key = (icon_type, digit, size.width(), size.height())
+        if key not in self._icons:
+            pixmap = QPixmap(icon_path(icon_type, digit)).scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            icon = QIcon()
+            icon.addPixmap(pixmap, QIcon.Disabled)
+            if icon_type == 'blank_icon':
+                icon.addPixmap(pixmap, QIcon.Active)
+            self._icons[key] = icon
+        return self._icons[key]
+
+
+class BoardModel(QAbstractTableModel):
+    """
+    Model of board cells shown by BoardTableView.
+    Stores only code of state of each cell, icons are created once per state.
+    """
+    def __init__(self, icon_cache, rows=0, columns=0, parent=None):
+        super().__init__(parent)
+        self._states = np.full((rows, columns), HIDDEN_CODE, dtype=np.int8)
+        self.icon_cache = icon_cache
+        self.icon_size = QSize(45, 45)
+        self._hints = None
+
+    def resize(self, rows, columns):
+        """
+        hides all cells and changes size of the board
+        """
+        self.beginResetModel()
+        self._states = np.full((rows, columns), HIDDEN_CODE, dtype=np.int8)
+        self._hints = None
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._states.shape[0]
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._states.shape[1]
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled
+
+    def cell_state(self, row, column):
+        """
+        returns code of state of given cell
+        """
+        return int(self._states[row, column])
+
+    def set_cell_state(self, row, column, code):
+        """
+        changes state of given cell and repaints it
+        """
+        self.set_cell_states([(row, column, code)])
+
+    def set_cell_states(self, cell_states):
+        """
+        changes states of many cells and repaints them with one signal
+        """
+        if not cell_states:
+            return
+        rows, columns, codes = zip(*cell_states)
+        self._states[list(rows), list(columns)] = codes
+        top_left = self.index(min(rows), min(columns))
+        bottom_right = self.index(max(rows), max(columns))
+        self.dataChanged.emit(top_left, bottom_right, [Qt.DecorationRole, Qt.BackgroundRole])
+
+    def set_hints(self, probabilities=None, other_probability=None):
+        """
+        shows probabilities of mines on hidden cells, without arguments hides them
+        """
+        self._hints = None if probabilities is None else (probabilities, other_probability)
+        if self._states.size:
+            bottom_right = self.index(self._states.shape[0] - 1, self._states.shape[1] - 1)
+            self.dataChanged.emit(self.index(0, 0), bottom_right, [Qt.BackgroundRole, Qt.ToolTipRole])
+
+    def hint(self, row, column):
+        """
+        returns probability of mine shown on given cell or None
+        """
+        if self._hints is None or self._states[row, column] != HIDDEN_CODE:
+            return None
+        probabilities, other_probability = self._hints
+        return probabilities.get((row, column), other_probability)
+
+    def state_icon(self, code):
+        """
+        returns icon of given cell state
+        """
+        icon_type, digit = code_icon(code)
+        return self.icon_cache.icon(icon_type, digit, self.icon_size)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        code = int(self._states[index.row(), index.column()])
+        if role == Qt.DecorationRole and code != HIDDEN_CODE:
+            return self.state_icon(code)
+        if role in (Qt.BackgroundRole, Qt.ToolTipRole):
+            probability = self.hint(index.row(), index.column())
+            if role == Qt.ToolTipRole:
+                return None if probability is None else f'{probability:.0%}'
+            if probability is not None:
+                return QBrush(hint_color(probability))
+            return QBrush(QColor(225, 225, 225) if code == HIDDEN_CODE else QColor(190, 190, 190))
+        return None
+
+
+class BoardTableView(QTableView):
+    """
+    Table view which paints only visible cells of BoardModel
+    and reports clicks by coordinates of the cell.
+    """
+    left_clicked = Signal(int, int)
+    right_clicked = Signal(int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+    def set_cell_size(self, size):
+        """
+        sets the same width and height of all cells
+        """
+        self.verticalHeader().setDefaultSectionSize(size)
+        self.horizontalHeader().setDefaultSectionSize(size)
+        self.verticalHeader().setMinimumSectionSize(size)
+        self.horizontalHeader().setMinimumSectionSize(size)
+
+    def mousePressEvent(self, event):
+        index = self.indexAt(event.pos())
+        if index.isValid():
+            if event.button() == Qt.LeftButton:
+                self.left_clicked.emit(index.row(), index.column())
+            elif event.button() == Qt.RightButton:
+                self.right_clicked.emit(index.row(), index.column())
+
+
 class MinesweeperBoard(QMainWindow):
-    def __init__(self, game, parent=None):
+    def __init__(self, game, parent=None, virtual=False, record_path=None):
         super().__init__(parent)
 
         self.Game = game
         self.buttons = {}
         self.start_time = 0
-        self.table = QTableWidget()
+        self.game_ended = False
+        self.virtual = virtual
+        self.no_guess = False
+        self.no_guess_time_budget = 0.1
+        self.generation_statistics = None
+        self.probabilities = MineProbabilities()
+        self.hints_shown = False
+        self.hinted_buttons = []
+        self.record_path = record_path
+        self.recorded_games = 0
+        self.recorder = None
+        self.icon_cache = IconCache()
+        if virtual:
+            self.board_model = BoardModel(self.icon_cache)
+            self.table = BoardTableView()
+            self.table.setModel(self.board_model)
+            self.table.left_clicked.connect(self.cell_left_clicked)
+            self.table.right_clicked.connect(self.cell_right_clicked)
+        else:
+            self.table = QTableWidget()
         self.setCentralWidget(self.table)
         self.table_layout = QHBoxLayout(self.centralWidget())
         self.moves_label = QLabel('Current move:')
@@ -148,16 +394,74 @@ class MinesweeperBoard(QMainWindow):
         """
         creates board gui with given size.
         """
-        self.configure_table()
         rows = self.Game.play_board.rows()
         columns = self.Game.play_board.columns()
         self.Game.play_board.set_visualization(rows, columns)
         self.Game.islands.island_board().set_visualization(rows, columns)
-        self.create_buttons()
-        self.table.setMaximumSize(self.table_size())
-        self.table.setMinimumSize(self.table_size())
+        self.build_board()
         self.Game.index_tiles()
 
+    def resume_game(self, elapsed_time=0.0):
+        """
+        creates board gui for game which is already in progress, e.g. loaded from file
+        """
+        self.build_board()
+        self.show_board_state(self.Game.visible_tiles())
+        self.start_time = self.Game.toogle_time() - elapsed_time
+        self.flag_and_moves_labels_info()
+
+    def restart_game(self, difficulty=None, seed=None):
+        """
+        starts new game in the same window, by default with the same difficulty.
+        Cells of the board are reused when its size doesn't change, only shown ones are hidden again.
+        """
+        board = self.Game.play_board
+        if difficulty is None:
+            difficulty = Difficulty("Restart", (board.rows(), board.columns()), self.Game.mines.amount(), self.no_guess)
+        same_size = difficulty.board_size == (board.rows(), board.columns())
+        shown_cells = self.Game.visible_tiles() if same_size else []
+        if self.recorder:
+            self.recorder.abandon()
+            self.recorder.close()
+            self.recorder = None
+        self.Game.reset(difficulty, seed)
+        self.no_guess = difficulty.no_guess
+        self.generation_statistics = None
+        if not same_size:
+            self.hinted_buttons = []
+            self.build_board()
+        elif self.virtual:
+            self.board_model.resize(*difficulty.board_size)
+        else:
+            self.table.setUpdatesEnabled(False)
+            try:
+                for row, column, symbol in shown_cells:
+                    self.hide_cell(row, column)
+            finally:
+                self.table.setUpdatesEnabled(True)
+        self.start_time = 0
+        self.game_ended = False
+        self.flag_and_moves_labels_info()
+        self.update_hints()
+
+    def build_board(self):
+        """
+        creates cells of the board gui for size of the game
+        """
+        self.configure_table()
+        rows = self.Game.play_board.rows()
+        columns = self.Game.play_board.columns()
+        self.icon_cache.load(self.icon_size())
+        if self.virtual:
+            self.board_model.icon_size = self.icon_size()
+            self.board_model.resize(rows, columns)
+            self.table.set_cell_size(self.cell_size())
+            self.table.setIconSize(self.icon_size())
+        else:
+            self.create_buttons()
+            self.table.setMaximumSize(self.table_size())
+            self.table.setMinimumSize(self.table_size())
+
     def table_size(self):
         """
         Scales size of window
@@ -175,11 +479,35 @@ class MinesweeperBoard(QMainWindow):
     def configure_table(self):
         self.table.verticalHeader().setVisible(False)
         self.table.horizontalHeader().setVisible(False)
+        if self.virtual:
+            self.table.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            self.table.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            return
         self.table.setRowCount(self.Game.play_board.rows())
         self.table.setColumnCount(self.Game.play_board.columns())
         self.table.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.table.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
 
+    def is_small_board(self):
+        """
+        checks if board fits the screen with big cells
+        """
+        screen_size_rows = 20
+        screen_size_columns = 30
+        return self.Game.play_board.rows() < screen_size_rows and self.Game.play_board.columns() < screen_size_columns
+
+    def cell_size(self):
+        """
+        returns width and height of one cell of the board
+        """
+        return 50 if self.is_small_board() else 30
+
+    def icon_size(self):
+        """
+        returns size of icons which fits cells of the board
+        """
+        return QSize(45, 45) if self.is_small_board() else QSize(28, 28)
+
     def get_button(self, row, column):
         """
         returns button with given row and column on the board
@@ -192,25 +520,18 @@ class MinesweeperBoard(QMainWindow):
         removes coordinate of given row and column from remaining tiles when it is clicked.
         """
         check_board_coordinates((row, column))
-        if (row, column) in self.Game.remaining_tiles():
-            return self.Game.remaining_tiles().pop(self.Game.remaining_tiles().index((row, column)))
+        if self.Game.reveal_tile(row, column):
+            return row, column
 
     def create_buttons(self):
         """
         Fills table Widget with buttons.
         """
+        self.buttons = {}
         for row in range(0, self.Game.play_board.rows()):
-            screen_size_rows = 20
-            screen_size_columns = 30
-            if self.Game.play_board.rows() < screen_size_rows and self.Game.play_board.columns() < screen_size_columns:
-                self.table.setRowHeight(row, 50)
-            else:
-                self.table.setRowHeight(row, 30)
+            self.table.setRowHeight(row, self.cell_size())
             for column in range(0, self.Game.play_board.columns()):
-                if self.Game.play_board.rows() < screen_size_rows and self.Game.play_board.columns() < screen_size_columns:
-                    self.table.setColumnWidth(column, 50)
-                else:
-                    self.table.setColumnWidth(column, 30)
+                self.table.setColumnWidth(column, self.cell_size())
                 self.buttons[f"button{row},{column}"] = QPushButton("")
                 self.table.setCellWidget(row, column, self.get_button(row, column))
                 self.get_button(row, column).installEventFilter(self)
@@ -221,33 +542,198 @@ class MinesweeperBoard(QMainWindow):
         """
         changes size of icon on the buttons to fit the screen
         """
-        if self.Game.play_board.rows() < 20 and self.Game.play_board.columns() < 30:
-            button.setIconSize(QSize(45, 45))
-        else:
-            button.setIconSize(QSize(28, 28))
+        button.setIconSize(self.icon_size())
 
     def insert_icon(self, button, icon_type, is_digit=None):
         """
         adds icon to button with given type
         """
-        path = icon_path(icon_type, is_digit)
-        icon = QIcon()
-        icon.addPixmap(QPixmap(path), QIcon.Disabled)
         self.scale_icons(button)
-        button.setIcon(icon)
+        button.setIcon(self.icon_cache.icon(icon_type, is_digit, self.icon_size()))
+
+    def is_cell_enabled(self, row, column):
+        """
+        checks if cell can still be clicked (it is not revealed or flagged)
+        """
+        if self.virtual:
+            return self.board_model.cell_state(row, column) == HIDDEN_CODE
+        return self.get_button(row, column).isEnabled()
+
+    def show_cell(self, row, column, icon_type, digit=None, block=True):
+        """
+        shows icon of given type on the cell, blocked cell can't be clicked
+        """
+        self.show_cells([(row, column, icon_type, digit, block)])
+
+    def show_cells(self, cells):
+        """
+        shows icons on many cells at once, painting of the board is suspended until all of them are changed.
+        cells are tuples: row, column, icon type, digit and if cell should be blocked
+        """
+        if self.virtual:
+            self.board_model.set_cell_states([
+                (row, column, cell_code(icon_type, digit)) for row, column, icon_type, digit, block in cells
+            ])
+            return
+        self.table.setUpdatesEnabled(False)
+        try:
+            for row, column, icon_type, digit, block in cells:
+                button = self.get_button(row, column)
+                self.insert_icon(button, icon_type, digit)
+                if block:
+                    button.setEnabled(False)
+        finally:
+            self.table.setUpdatesEnabled(True)
+
+    def hide_cell(self, row, column):
+        """
+        removes icon from the cell and makes it clickable again
+        """
+        if self.virtual:
+            self.board_model.set_cell_state(row, column, HIDDEN_CODE)
+            return
+        button = self.get_button(row, column)
+        button.setEnabled(True)
+        button.setIcon(QIcon())
+
+    def toggle_hints(self):
+        """
+        shows or hides probabilities of mines on hidden cells
+        """
+        self.hints_shown = not self.hints_shown
+        self.update_hints()
+
+    def update_hints(self):
+        """
+        paints hidden cells with colors of probability of mine when hints are shown
+        """
+        if not self.hints_shown or self.Game.number_of_moves() == 0:
+            probabilities, other_probability = None, None
+        else:
+            probabilities, other_probability = self.probabilities.from_game(self.Game)
+        if self.virtual:
+            self.board_model.set_hints(probabilities, other_probability)
+            return
+        self.table.setUpdatesEnabled(False)
+        try:
+            for button in self.hinted_buttons:
+                button.setStyleSheet('')
+                button.setToolTip('')
+            self.hinted_buttons = []
+            if probabilities is None:
+                return
+            for row, column in self.Game.remaining_tiles():
+                button = self.get_button(row, column)
+                probability = probabilities.get((row, column), other_probability)
+                if probability is None or not button.isEnabled():
+                    continue
+                button.setStyleSheet(f'background-color: {hint_color(probability).name()}')
+                button.setToolTip(f'{probability:.0%}')
+                self.hinted_buttons.append(button)
+        finally:
+            self.table.setUpdatesEnabled(True)
+
+    def bot_move(self):
+        """
+        lets bot reveal all cells which are surely safe or guess the safest one
+        """
+        if self.Game.number_of_moves() == 0:
+            cells = [(self.Game.play_board.rows() // 2, self.Game.play_board.columns() // 2)]
+        else:
+            cells = bot_moves(self.Game, self.probabilities)
+        for row, column in cells:
+            self.left_click(row, column)
+            if self.Game.lost():
+                return
+        if self.Game.winning_conditions():
+            self.end_game(game_won=True)
+        self.update_hints()
+
+    def save_game(self, path=None):
+        """
+        saves game in progress to file chosen by player
+        """
+        if self.Game.number_of_moves() == 0:
+            return
+        if path is None:
+            path = QFileDialog.getSaveFileName(self, 'Save game', 'game.mss', 'Minesweeper saves (*.mss)')[0]
+            if not path:
+                return
+        save_game(self.Game, path, self.Game.toogle_time() - self.start_time)
+
+    def keyPressEvent(self, event):
+        """
+        H shows or hides hints, B makes move of the bot, N starts new game, Ctrl+S saves the game
+        """
+        if event.key() == Qt.Key_N:
+            self.restart_game()
+        elif event.key() == Qt.Key_H:
+            self.toggle_hints()
+        elif event.key() == Qt.Key_B:
+            self.bot_move()
+        elif event.key() == Qt.Key_S and event.modifiers() & Qt.ControlModifier:
+            self.save_game()
+        else:
+            super().keyPressEvent(event)
+
+    def show_board_state(self, cells):
+        """
+        hides all cells and shows given ones, cells are tuples of row, column and symbol of the board
+        """
+        rows = self.Game.play_board.rows()
+        columns = self.Game.play_board.columns()
+        if self.virtual:
+            self.board_model.resize(rows, columns)
+        else:
+            self.table.setUpdatesEnabled(False)
+            try:
+                for row in range(rows):
+                    for column in range(columns):
+                        self.hide_cell(row, column)
+            finally:
+                self.table.setUpdatesEnabled(True)
+        self.show_cells([symbol_cell(*cell) for cell in cells])
 
     def flag_and_moves_labels_info(self):
         """
         updates labels which shows current move and placed flags to number of mines
         """
         self.moves_label.setText(f'Current move:\n{self.Game.number_of_moves()}')
-        self.flags_label.setText(f'Flags placed:\n{len(self.Game.flags.flag_coordinates())}/{self.Game.mines.amount()}')
+        self.flags_label.setText(f'Flags placed:\n{self.Game.flags.flags_count()}/{self.Game.mines.amount()}')
+
+    def game_record_path(self):
+        """
+        returns path of recording of current game. The first game is recorded to record_path,
+        next ones after restart get their number before extension, e.g. game-2.msr.
+        Game left by restart ends its recording as abandoned.
+        """
+        if self.recorded_games <= 1:
+            return self.record_path
+        root, extension = os.path.splitext(self.record_path)
+        return f'{root}-{self.recorded_games}{extension}'
 
     def create_mine_field(self, first_click_coordinates):
+        """
+        creates mine field at the first click. Game without given seed gets a random one,
+        so it is saved in the recording and the same mine field can be generated again.
+        Seed is used as text, like recording stores it, because Random(123) and Random('123') differ.
+        """
         row, column = first_click_coordinates
-        self.Game.play_board.fill_mines(self.Game.mines, (row, column))
-        self.Game.play_board.info_about_mines_pos()
-        self.Game.islands.map_islands(self.Game.play_board)
+        if self.Game.seed is None:
+            self.Game.seed = randrange(2 ** 32)
+        self.Game.seed = str(self.Game.seed)
+        if self.no_guess:
+            mines_coordinates, self.generation_statistics = generate_no_guess_layout(
+                self.Game.play_board.rows(), self.Game.play_board.columns(), self.Game.mines.amount(),
+                (row, column), self.Game.seed, time_budget=self.no_guess_time_budget
+            )
+            self.Game.create_mine_field((row, column), mines_coordinates=mines_coordinates)
+        else:
+            self.Game.create_mine_field((row, column))
+        if self.record_path is not None:
+            self.recorded_games += 1
+            self.recorder = GameRecorder(open(self.game_record_path(), 'wb'))
+            self.recorder.start(self.Game, self.Game.seed)
         self.start_time = self.Game.toogle_time()
 
     def eventFilter(self, button, event):
@@ -256,32 +742,49 @@ class MinesweeperBoard(QMainWindow):
         """
         if event.type() == QEvent.MouseButtonPress:
             if event.button() == Qt.LeftButton:
-                self.left_click(button.row, button.column)
-            elif event.button() == Qt.RightButton and (button.row, button.column) in self.Game.remaining_tiles():
-                self.right_click(button, self.Game.flags.flag_coordinates())
-            if self.Game.winning_conditions():
-                self.endgame_popup(game_won=True)
+                self.cell_left_clicked(button.row, button.column)
+            elif event.button() == Qt.RightButton:
+                self.cell_right_clicked(button.row, button.column)
 
         return QObject.event(button, event)
 
-    def right_click(self, button, flag_list):
+    def cell_left_clicked(self, row, column):
+        """
+        handles left click on cell of the board and checks if game is won
+        """
+        self.left_click(row, column)
+        if self.Game.winning_conditions():
+            self.end_game(game_won=True)
+        self.update_hints()
+
+    def cell_right_clicked(self, row, column):
+        """
+        handles right click on cell of the board and checks if game is won
+        """
+        if (row, column) in self.Game.remaining_tiles():
+            self.right_click(row, column)
+        if self.Game.winning_conditions():
+            self.end_game(game_won=True)
+        self.update_hints()
+
+    def right_click(self, row, column):
         """
         handles right click on button
         """
-        row = button.row
-        column = button.column
         if self.Game.number_of_moves() == 0:
             self.create_mine_field((row, column))
-        if (button.row, button.column) in self.Game.remaining_tiles():
+        if (row, column) in self.Game.remaining_tiles():
             self.Game.made_move()
-        if (row, column) not in flag_list:
-            button.setEnabled(False)
-            self.Game.flags.add_flag(button.row, button.column)
-            self.insert_icon(button, 'flag_icon')
+        if not self.Game.flags.has_flag(row, column):
+            self.show_cell(row, column, 'flag_icon')
+            self.Game.flags.add_flag(row, column)
+            if self.recorder:
+                self.recorder.flag(row, column)
         else:
-            button.setEnabled(True)
-            button.setIcon(QIcon())
-            self.Game.flags.remove_flag(button.row, button.column)
+            self.hide_cell(row, column)
+            self.Game.flags.remove_flag(row, column)
+            if self.recorder:
+                self.recorder.unflag(row, column)
         self.flag_and_moves_labels_info()
 
     def left_click(self, row, column):
@@ -289,61 +792,43 @@ class MinesweeperBoard(QMainWindow):
         handles left click on button.
         """
         check_board_coordinates((row, column))
-        button = self.get_button(row, column)
         if self.Game.number_of_moves() == 0:
             self.create_mine_field((row, column))
-        if (button.row, button.column) not in self.Game.flags.flag_coordinates():
-            if (button.row, button.column) in self.Game.remaining_tiles():
-                self.Game.made_move()
-            self.flag_and_moves_labels_info()
-            indicator = self.Game.play_board.get_coordinates_info(row, column)
-            if indicator == ".":
-                empty_icon = QIcon()
-                empty_icon.addPixmap(QPixmap(icon_path('blank_icon')), QIcon.Active)
-                empty_icon.addPixmap(QPixmap(icon_path('blank_icon')), QIcon.Disabled)
-                self.get_button(row, column).setIcon(empty_icon)
-                self.scale_icons(button)
-                button.setEnabled(False)
-                self.pop_tile(row, column)
-            if self.Game.winning_conditions():
-                self.endgame_popup(game_won=True)
-            island_indicator = self.Game.islands.island_board().get_coordinates_info(row, column)
-            if indicator == "." and island_indicator.isdigit():
-                coordinates = self.Game.islands.island_board().search_symbol_coordinates(island_indicator)
-                for row, column in coordinates:
-                    if self.get_button(row, column).isEnabled():
-                        button = self.get_button(row, column)
-                        self.scale_icons(button)
-                        button.setIcon(empty_icon)
-                        button.setEnabled(False)
-                        self.pop_tile(row, column)
-                    neighbours_indexes = self.Game.islands.island_board().cell_neighbours(row, column)
-                    for neighbour_row, neighbour_column in neighbours_indexes:
-                        neighbour_symbol = self.Game.play_board.get_coordinates_info(neighbour_row, neighbour_column)
-                        if neighbour_symbol.isdigit():
-                            button = self.get_button(neighbour_row, neighbour_column)
-                            self.insert_icon(button, 'number_icon', neighbour_symbol)
-                            button.setEnabled(False)
-                            self.pop_tile(neighbour_row, neighbour_column)
-                if self.Game.winning_conditions():
-                    self.endgame_popup(game_won=True)
-            elif indicator == '*' and self.get_button(row, column).isEnabled():
-                bombs = self.Game.play_board.search_symbol_coordinates('*')
-                for row, column in bombs:
-                    button = self.get_button(row, column)
-                    self.insert_icon(button, 'bomb_icon')
-                self.endgame_popup(game_won=False)
-            elif indicator.isdigit():
-                self.insert_icon(button, 'number_icon', indicator)
-                self.pop_tile(row, column)
-
-    def endgame_popup(self, game_won):
+        if self.Game.flags.has_flag(row, column):
+            return
+        if (row, column) in self.Game.remaining_tiles():
+            self.Game.made_move()
+            if self.recorder:
+                self.recorder.reveal(row, column)
+        self.flag_and_moves_labels_info()
+        self.show_cells([symbol_cell(*cell) for cell in self.Game.reveal(row, column)])
+        if self.Game.lost():
+            self.end_game(game_won=False)
+        elif self.Game.winning_conditions():
+            self.end_game(game_won=True)
+
+    def end_game(self, game_won):
+        """
+        stops time and recording of ended game. Pop-up with result is shown after the click
+        is handled, so it isn't counted in time of the click
+        """
+        if self.game_ended:
+            return
+        self.game_ended = True
+        time = self.Game.toogle_time() - self.start_time
+        if self.recorder:
+            self.recorder.finish(game_won)
+            self.recorder.close()
+            self.recorder = None
+        QTimer.singleShot(0, lambda: self.endgame_popup(game_won, time))
+
+    def endgame_popup(self, game_won, time):
         """
         shows result of the game after clicking ok program ends
         """
-        end_time = self.Game.toogle_time()
-        time = end_time - self.start_time
         BV_of_board = self.Game.calculate_3bv()
+        if profiling_enabled():
+            profiler.dump()
         popup = QMessageBox()
         popup.setWindowTitle("GAME ENDED")
         if game_won:
@@ -358,3 +843,71 @@ class MinesweeperBoard(QMainWindow):
         popup.setIcon(QMessageBox.Information)
         popup.exec_()
         popup.buttonClicked.connect(sys.exit())
+
+
+class ReplayPlayer(QObject):
+    """
+    Plays recorded game on MinesweeperBoard, keeping time between events
+    of the recording divided by speed.
+    """
+    def __init__(self, board_gui, replay, speed=1.0, parent=None):
+        super().__init__(parent)
+        self.board_gui = board_gui
+        self.replay = replay
+        self.speed = speed
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.next_event)
+        board_gui.build_game()
+        board_gui.table.setAttribute(Qt.WA_TransparentForMouseEvents)
+
+    def set_speed(self, speed):
+        if speed <= 0:
+            raise ValueError('Speed of replay must be positive')
+        self.speed = speed
+
+    def seek(self, index):
+        """
+        shows state of the game after given number of events
+        """
+        self.replay.seek(index)
+        self.board_gui.show_board_state(self.replay.visible_cells())
+        self.update_labels()
+
+    def update_labels(self):
+        game = self.replay.game
+        self.board_gui.moves_label.setText(f'Current move:\n{game.number_of_moves()}')
+        self.board_gui.flags_label.setText(f'Flags placed:\n{game.flags.flags_count()}/{game.mines.amount()}')
+
+    def play(self):
+        """
+        starts playing from current event
+        """
+        self.schedule_next_event()
+
+    def pause(self):
+        self.timer.stop()
+
+    def schedule_next_event(self):
+        if self.replay.index() >= self.replay.events_count():
+            return
+        next_timestamp = self.replay.recording.events[self.replay.index()][3]
+        self.timer.start(int(max(0, next_timestamp - self.replay.timestamp()) / self.speed))
+
+    def next_event(self):
+        """
+        applies next event of the recording and shows cells changed by it
+        """
+        changed_cells = self.replay.step()
+        hidden_cells = [(row, column) for row, column, symbol in changed_cells if symbol is None]
+        for row, column in hidden_cells:
+            self.board_gui.hide_cell(row, column)
+        self.board_gui.show_cells([symbol_cell(*cell) for cell in changed_cells if cell[2] is not None])
+        self.update_labels()
+        self.schedule_next_event()
+
+
+if profiling_enabled():
+    instrument(MinesweeperBoard, 'left_click')
+    instrument(MinesweeperBoard, 'cell_left_clicked', click=True)
+    instrument(MinesweeperBoard, 'cell_right_clicked', click=True)
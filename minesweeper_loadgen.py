@@ -0,0 +1,133 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from random import Random
+
+from minesweeper_server import DEFAULT_PORT, PLAYING, LatencyStats
+
+
+class ServerConnection:
+    """
+    Connection to minesweeper server which sends one command at a time
+    and measures time until its response arrives.
+    """
+    def __init__(self, reader, writer, latency):
+        self._reader = reader
+        self._writer = writer
+        self.latency = latency
+
+    @classmethod
+    async def open(cls, host, port, latency):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, latency)
+
+    async def command(self, line):
+        start = time.perf_counter()
+        self._writer.write(line.encode('utf-8') + b'\n')
+        await self._writer.drain()
+        response = await self._reader.readline()
+        self.latency.add(time.perf_counter() - start)
+        if not response:
+            raise ConnectionError('Server closed connection')
+        return json.loads(response)
+
+    async def close(self):
+        await self.command('quit')
+        self._writer.close()
+
+
+async def play_game(connection, level, seed, generator):
+    """
+    Plays one game revealing random hidden cells until it ends.
+    Returns final status of the game.
+    """
+    response = await connection.command(f'new {level} {seed}')
+    if not response['ok']:
+        raise ValueError(response['error'])
+    cells = [(row, column) for row in range(response['rows']) for column in range(response['columns'])]
+    generator.shuffle(cells)
+    revealed = set()
+    status = response['status']
+    for row, column in cells:
+        if (row, column) in revealed:
+            continue
+        response = await connection.command(f'reveal {row} {column}')
+        revealed.update((cell_row, cell_column) for cell_row, cell_column, symbol in response['cells'])
+        status = response['status']
+        if status != PLAYING:
+            break
+    return status
+
+
+async def run_load(host, port, sessions, games, level, seed=0):
+    """
+    Opens given number of sessions at once, each of them plays given number of games.
+    Statistics of the server are taken while all sessions are still connected.
+    Returns report with latency seen by clients and statistics of the server.
+    """
+    latency = LatencyStats()
+    results = {}
+    all_played = asyncio.Event()
+    release = asyncio.Event()
+    finished_sessions = 0
+
+    async def session(index):
+        nonlocal finished_sessions
+        connection = await ServerConnection.open(host, port, latency)
+        generator = Random(f'{seed}-{index}')
+        for game in range(games):
+            status = await play_game(connection, level, f'{seed}-{index}-{game}', generator)
+            results[status] = results.get(status, 0) + 1
+        finished_sessions += 1
+        if finished_sessions == sessions:
+            all_played.set()
+        await release.wait()
+        await connection.close()
+
+    start = time.perf_counter()
+    tasks = [asyncio.ensure_future(session(index)) for index in range(sessions)]
+    try:
+        await asyncio.wait([asyncio.ensure_future(all_played.wait())] + tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            if task.done() and task.exception():
+                raise task.exception()
+        seconds = time.perf_counter() - start
+        stats_connection = await ServerConnection.open(host, port, LatencyStats())
+        server_stats = await stats_connection.command('stats')
+        await stats_connection.close()
+    finally:
+        release.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    server_stats.pop('ok')
+    return {
+        'sessions': sessions,
+        'games': sessions * games,
+        'results': results,
+        'seconds': seconds,
+        'commands_per_second': latency.count() / seconds,
+        'client': latency.summary(),
+        'server': server_stats
+    }
+
+
+def loadGeneratorMain(args):
+    parser = argparse.ArgumentParser(description='Plays many games at once against minesweeper server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--sessions', type=int, default=100)
+    parser.add_argument('--games', type=int, default=5, help='games played by each session')
+    parser.add_argument('--level', default='hard', help='name of level or size with mines, e.g. "16x30 99"')
+    parser.add_argument('--seed', type=int, default=0)
+    arguments = parser.parse_args(args[1:])
+    report = asyncio.run(run_load(
+        arguments.host, arguments.port, arguments.sessions, arguments.games, arguments.level, arguments.seed
+    ))
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(loadGeneratorMain(sys.argv))
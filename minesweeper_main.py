@@ -2,6 +2,7 @@ import sys
 from PySide2.QtWidgets import QApplication
 from minesweeper_classes import Board, Flag, Mines, Island, Game
 from minesweeper_gui import MinesweeperBoard, SetDifficulty
+from minesweeper_save import load_game
 
 
 def guiMain(args):
@@ -12,7 +13,14 @@ def guiMain(args):
     islands = Island(board_islands)
     game1 = Game(board1, flags, islands, mines)
     app = QApplication(args)
-    board_ui = MinesweeperBoard(game1)
+    record_path = args[args.index('--record') + 1] if '--record' in args else None
+    if '--load' in args:
+        game1, elapsed_time = load_game(args[args.index('--load') + 1])
+        board_ui = MinesweeperBoard(game1, virtual='--virtual' in args, record_path=record_path)
+        board_ui.resume_game(elapsed_time)
+        board_ui.show()
+        return app.exec_()
+    board_ui = MinesweeperBoard(game1, virtual='--virtual' in args, record_path=record_path)
     start_ui = SetDifficulty(board_ui, game1)
     start_ui.show()
     return app.exec_()
@@ -0,0 +1,353 @@
+from math import exp, inf, lgamma, log
+
+from minesweeper_solver import Solver, visible_digits
+
+
+def placement_steps(cells, constraints):
+    """
+    Prepares going through cells in given order for counting placements of mines.
+    Returns function advance(state, position, is_mine), which gives state after deciding
+    if cell at given position has a mine (numbers of mines left in constraints which are
+    still open) or None when the decision breaks some constraint. Starting state is ().
+    """
+    positions = {cell: position for position, cell in enumerate(cells)}
+    constraint_positions = [sorted(positions[cell] for cell in constraint_cells) for constraint_cells, mines in constraints]
+    starting = [[] for cell in cells]
+    for index, cell_positions in enumerate(constraint_positions):
+        starting[cell_positions[0]].append(index)
+    # for each cell: constraints checked by it as tuples (contains cell, cells left after it, stays open)
+    steps = []
+    starting_mines = []
+    open_constraints = []
+    for position in range(len(cells)):
+        checked = open_constraints + starting[position]
+        steps.append([
+            (
+                position in constraint_positions[index],
+                sum(cell_position > position for cell_position in constraint_positions[index]),
+                constraint_positions[index][-1] > position
+            )
+            for index in checked
+        ])
+        starting_mines.append(tuple(constraints[index][1] for index in starting[position]))
+        open_constraints = [index for index in checked if constraint_positions[index][-1] > position]
+
+    def advance(state, position, is_mine):
+        new_state = []
+        for mines_left, (contains, cells_left, stays_open) in zip(state + starting_mines[position], steps[position]):
+            if contains:
+                mines_left -= is_mine
+            if mines_left < 0 or mines_left > cells_left:
+                return None
+            if stays_open:
+                new_state.append(mines_left)
+        return tuple(new_state)
+
+    return advance
+
+
+def count_group(cells, constraints, max_work=None):
+    """
+    Counts placements of mines in group of cells which satisfy given constraints
+    (pairs of set of cells and number of mines in them), going through cells in given order.
+    Partial placements are merged when constraints which are still open have the same
+    numbers of mines left, so long but narrow frontier is counted in linear time.
+    Returns dictionary: number of mines in group -> [number of placements,
+    dictionary cell -> number of placements in which it has a mine].
+    Counting cells grows with square of the range of numbers of mines, so when max_work is given
+    and the estimate of work (counts kept for partial placements times the widest range) exceeds it,
+    counting is abandoned and None is returned.
+    """
+    advance = placement_steps(cells, constraints)
+    kept_counts = 0
+    widest_range = 0
+    forward = [{(): {0: 1}}]
+    for position in range(len(cells)):
+        layer = {}
+        for state, placements in forward[-1].items():
+            for is_mine in (0, 1):
+                new_state = advance(state, position, is_mine)
+                if new_state is None:
+                    continue
+                counts = layer.setdefault(new_state, {})
+                for mines, count in placements.items():
+                    counts[mines + is_mine] = counts.get(mines + is_mine, 0) + count
+        forward.append(layer)
+        kept_counts += sum(len(counts) for counts in layer.values())
+        widest_range = max([widest_range] + [len(counts) for counts in layer.values()])
+        if max_work is not None and kept_counts * widest_range > max_work:
+            return None
+    backward = [{(): {0: 1}}]
+    for position in reversed(range(len(cells))):
+        layer = {}
+        for state in forward[position]:
+            counts = {}
+            for is_mine in (0, 1):
+                new_state = advance(state, position, is_mine)
+                for mines, count in backward[-1].get(new_state, {}).items():
+                    counts[mines + is_mine] = counts.get(mines + is_mine, 0) + count
+            if counts:
+                layer[state] = counts
+        backward.append(layer)
+    backward.reverse()
+
+    results = {mines: [count, {}] for mines, count in backward[0].get((), {}).items()}
+    for position, cell in enumerate(cells):
+        for result in results.values():
+            result[1][cell] = 0
+        for state, placements in forward[position].items():
+            completions = backward[position + 1].get(advance(state, position, 1), {})
+            for mines_before, count_before in placements.items():
+                for mines_after, count_after in completions.items():
+                    results[mines_before + 1 + mines_after][1][cell] += count_before * count_after
+    return results
+
+
+def weighted_group(cells, constraints, mine_weight):
+    """
+    Approximates probabilities of mines in group of cells which is too big to be counted exactly.
+    Every placement satisfying constraints gets weight mine_weight ** (number of mines), as if
+    each cell had a mine independently, so numbers of mines don't have to be tracked and partial
+    placements are kept as floats normalized in each step.
+    Returns pair: dictionary cell -> probability of mine and expected number of mines in group.
+    """
+    advance = placement_steps(cells, constraints)
+    forward = [{(): 1.0}]
+    for position in range(len(cells)):
+        layer = {}
+        for state, weight in forward[-1].items():
+            for is_mine, factor in ((0, 1.0), (1, mine_weight)):
+                new_state = advance(state, position, is_mine)
+                if new_state is not None:
+                    layer[new_state] = layer.get(new_state, 0.0) + weight * factor
+        total = sum(layer.values())
+        if not total:
+            raise ValueError('Visible state of the board does not match number of mines')
+        forward.append({state: weight / total for state, weight in layer.items()})
+    backward = [{(): 1.0}]
+    for position in reversed(range(len(cells))):
+        layer = {}
+        for state in forward[position]:
+            weight = backward[-1].get(advance(state, position, 0), 0.0)
+            weight += mine_weight * backward[-1].get(advance(state, position, 1), 0.0)
+            if weight:
+                layer[state] = weight
+        total = sum(layer.values())
+        backward.append({state: weight / total for state, weight in layer.items()})
+    backward.reverse()
+
+    probabilities = {}
+    for position, cell in enumerate(cells):
+        with_mine = without_mine = 0.0
+        for state, weight in forward[position].items():
+            with_mine += weight * mine_weight * backward[position + 1].get(advance(state, position, 1), 0.0)
+            without_mine += weight * backward[position + 1].get(advance(state, position, 0), 0.0)
+        probabilities[cell] = with_mine / (with_mine + without_mine)
+    return probabilities, sum(probabilities.values())
+
+
+def convolve(first, second):
+    """
+    Returns distribution of sum of mines in two independent groups,
+    given as dictionaries: number of mines -> number of placements.
+    """
+    result = {}
+    for first_mines, first_count in first.items():
+        for second_mines, second_count in second.items():
+            result[first_mines + second_mines] = result.get(first_mines + second_mines, 0) + first_count * second_count
+    return result
+
+
+def log_comb(n, k):
+    if k < 0 or k > n:
+        return -inf
+    return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+
+
+def log_sum(values):
+    values = [value for value in values if value != -inf]
+    if not values:
+        return -inf
+    highest = max(values)
+    return highest + log(sum(exp(value - highest) for value in values))
+
+
+class MineProbabilities:
+    """
+    Calculates probability of mine in each hidden cell from what player can see.
+    Frontier is split into independent components, their placements are weighted
+    by number of ways to place the rest of mines in cells which are not next to any digit.
+    Counts of components are cached, so after a move only components changed by it are counted again.
+    """
+    max_cached_components = 10000
+    max_exact_work = 2000000
+    density_search_steps = 20
+
+    def __init__(self):
+        self._components = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def component_counts(self, cells, constraints):
+        """
+        Returns counts of placements of mines in component, see count_group,
+        or None when component is too big to be counted exactly.
+        """
+        key = frozenset(constraints)
+        if key in self._components:
+            self.cache_hits += 1
+            counts = self._components.pop(key)
+        else:
+            self.cache_misses += 1
+            counts = count_group(cells, constraints, self.max_exact_work)
+            if len(self._components) >= self.max_cached_components:
+                del self._components[next(iter(self._components))]
+        self._components[key] = counts
+        return counts
+
+    def approximate(self, approximated, components, other_cells, mines_left):
+        """
+        Approximates probabilities of mines in components given as pairs of cells and constraints,
+        see weighted_group. Density of mines is searched by bisection, so that expected number
+        of mines in all components and other cells is close to number of mines left.
+        Returns pair: dictionary cell -> probability of mine and expected number of mines in approximated cells.
+        """
+        distributions = [{amount: result[0] for amount, result in counts.items()} for cells, counts in components]
+        lowest, highest = 0.0, 1.0
+        for step in range(self.density_search_steps):
+            density = (lowest + highest) / 2
+            mine_weight = density / (1 - density)
+            probabilities = {}
+            expected_mines = 0.0
+            for cells, constraints in approximated:
+                cell_probabilities, group_mines = weighted_group(cells, constraints, mine_weight)
+                probabilities.update(cell_probabilities)
+                expected_mines += group_mines
+            all_expected_mines = expected_mines + other_cells * density
+            for distribution in distributions:
+                log_weights = {mines: log(count) + mines * log(mine_weight) for mines, count in distribution.items() if count}
+                log_total = log_sum(log_weights.values())
+                all_expected_mines += sum(mines * exp(value - log_total) for mines, value in log_weights.items())
+            if abs(all_expected_mines - mines_left) < 0.5:
+                break
+            if all_expected_mines > mines_left:
+                highest = density
+            else:
+                lowest = density
+        return probabilities, expected_mines
+
+    def calculate(self, rows, columns, revealed, mines_amount, mines=()):
+        """
+        Returns pair: dictionary of hidden cells next to revealed digits -> probability
+        of mine in them and probability of mine in every other hidden cell
+        (None when there are no such cells). Given mines (e.g. trusted flags) are not included.
+        Cells which can be deduced with cheap rules of solver are not enumerated.
+        Components too big to be counted exactly are approximated, see approximate,
+        and their expected number of mines is taken from mines left.
+        """
+        mines = set(mines)
+        solver = Solver(rows, columns, revealed, mines)
+        constraints = solver.simplify()
+        safe_cells, mine_cells = solver.deduced()
+        components = []
+        approximated = []
+        for cells, group_constraints in solver.groups(constraints):
+            counts = self.component_counts(cells, group_constraints)
+            if counts is None:
+                approximated.append((cells, group_constraints))
+            else:
+                components.append((cells, counts))
+        hidden_cells = rows * columns - len(revealed) - len(mines) - len(safe_cells) - len(mine_cells)
+        frontier_amount = sum(len(cells) for cells, counts in components)
+        frontier_amount += sum(len(cells) for cells, group_constraints in approximated)
+        other_cells = hidden_cells - frontier_amount
+        mines_left = mines_amount - len(mines) - len(mine_cells)
+
+        probabilities = dict.fromkeys(safe_cells, 0.0)
+        probabilities.update(dict.fromkeys(mine_cells, 1.0))
+        if approximated:
+            cell_probabilities, expected_mines = self.approximate(approximated, components, other_cells, mines_left)
+            probabilities.update(cell_probabilities)
+            fewest_mines = sum(min(counts, default=0) for cells, counts in components)
+            most_mines = sum(max(counts, default=0) for cells, counts in components) + other_cells
+            mines_left = min(max(mines_left - round(expected_mines), fewest_mines), most_mines)
+
+        distributions = [{amount: result[0] for amount, result in counts.items()} for cells, counts in components]
+        prefixes = [{0: 1}]
+        for distribution in distributions:
+            prefixes.append(convolve(prefixes[-1], distribution))
+        suffixes = [{0: 1}]
+        for distribution in reversed(distributions):
+            suffixes.append(convolve(suffixes[-1], distribution))
+        suffixes.reverse()
+
+        def log_weight(frontier_distribution, mines_outside):
+            return log_sum(
+                log(count) + log_comb(other_cells, mines_left - mines_outside - frontier_mines)
+                for frontier_mines, count in frontier_distribution.items() if count
+            )
+
+        log_total = log_weight(prefixes[-1], 0)
+        if log_total == -inf:
+            raise ValueError('Visible state of the board does not match number of mines')
+        for index, (cells, counts) in enumerate(components):
+            others = convolve(prefixes[index], suffixes[index + 1])
+            for cell in cells:
+                probabilities[cell] = 0.0
+            for component_mines, (count, cell_counts) in counts.items():
+                weight = exp(log_weight(others, component_mines) - log_total)
+                for cell, cell_count in cell_counts.items():
+                    probabilities[cell] += cell_count * weight
+        other_probability = None
+        if other_cells:
+            other_probability = sum(
+                exp(log(count) + log_comb(other_cells - 1, mines_left - frontier_mines - 1) - log_total)
+                for frontier_mines, count in prefixes[-1].items() if count
+            )
+        return probabilities, other_probability
+
+    def from_game(self, game, trust_flags=False):
+        """
+        Calculates probabilities for visible state of the game, see calculate.
+        Flags are treated as mines only when trust_flags is set.
+        """
+        board = game.play_board
+        mines = game.flags.flag_coordinates() if trust_flags else ()
+        return self.calculate(board.rows(), board.columns(), visible_digits(game), game.mines.amount(), mines)
+
+
+def bot_moves(game, engine, trust_flags=False):
+    """
+    Returns list of cells which bot reveals in its move: all hidden and not flagged cells
+    which surely don't have mine or, if there are none, one cell with the lowest probability of mine.
+    Returns empty list when there is no cell to reveal.
+    """
+    probabilities, other_probability = engine.from_game(game, trust_flags)
+    candidates = [(probability, cell) for cell, probability in probabilities.items() if not game.flags.has_flag(*cell)]
+    safe_cells = [cell for probability, cell in candidates if probability == 0]
+    if safe_cells:
+        return safe_cells
+    best = min(candidates, default=None)
+    if other_probability is not None and (best is None or other_probability < best[0]):
+        for cell in game.remaining_tiles():
+            if cell not in probabilities and not game.flags.has_flag(*cell):
+                return [cell]
+    return [best[1]] if best else []
+
+
+def play_bot(game, first_move, engine=None):
+    """
+    Plays game with created mine field, revealing safe cells and guessing the safest cell when there are none.
+    Returns True if bot has won.
+    """
+    engine = engine or MineProbabilities()
+    game.reveal(*first_move)
+    game.made_move()
+    while not game.lost() and not game.winning_conditions():
+        cells = bot_moves(game, engine)
+        if not cells:
+            break
+        for cell in cells:
+            game.reveal(*cell)
+            game.made_move()
+    return not game.lost() and game.winning_conditions()
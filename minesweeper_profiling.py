@@ -0,0 +1,102 @@
+import atexit
+import os
+import sys
+import time
+from bisect import bisect_left
+from functools import wraps
+
+
+ENVIRONMENT_VARIABLE = 'MINESWEEPER_PROFILE'
+COMMAND_LINE_FLAG = '--profile'
+
+
+def profiling_enabled(args=None):
+    """
+    Checks if profiling was requested by environment variable or command line flag.
+    """
+    if os.environ.get(ENVIRONMENT_VARIABLE, '') not in ('', '0'):
+        return True
+    return COMMAND_LINE_FLAG in (sys.argv if args is None else args)
+
+
+class Profiler:
+    """
+    Counts calls and cumulative time of instrumented functions
+    and keeps histogram of latency of clicks in buckets of milliseconds.
+    """
+    latency_buckets_ms = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = {}
+        self.seconds = {}
+        self.click_histogram = [0] * (len(self.latency_buckets_ms) + 1)
+
+    def has_records(self):
+        return bool(self.calls)
+
+    def add_call(self, name, seconds):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def add_click(self, seconds):
+        self.click_histogram[bisect_left(self.latency_buckets_ms, seconds * 1000)] += 1
+
+    def summary(self):
+        """
+        Returns text with statistics of all instrumented functions, the slowest first.
+        """
+        lines = ['Minesweeper profile:']
+        for name in sorted(self.calls, key=self.seconds.get, reverse=True):
+            calls, seconds = self.calls[name], self.seconds[name]
+            lines.append(
+                f'  {name}: {calls} calls, {seconds * 1000:.3f} ms total, {seconds * 1000 / calls:.3f} ms per call'
+            )
+        if any(self.click_histogram):
+            lines.append('Click latency:')
+            bounds = [f'<= {bound} ms' for bound in self.latency_buckets_ms]
+            bounds.append(f'> {self.latency_buckets_ms[-1]} ms')
+            lines += [f'  {bound}: {count}' for bound, count in zip(bounds, self.click_histogram) if count]
+        return '\n'.join(lines)
+
+    def dump(self, stream=None):
+        """
+        Writes summary to stream (standard error by default) and starts counting from zero.
+        """
+        if not self.has_records():
+            return
+        print(self.summary(), file=stream or sys.stderr)
+        self.reset()
+
+
+profiler = Profiler()
+_exit_dump_registered = False
+
+
+def instrument(owner, method_name, label=None, click=False):
+    """
+    Replaces method of given class with one which records its calls in profiler.
+    Time of click methods is also added to click latency histogram.
+    It is called only when profiling is enabled, so otherwise methods are not changed at all.
+    """
+    global _exit_dump_registered
+    method = getattr(owner, method_name)
+    label = label or f'{owner.__name__}.{method_name}'
+
+    @wraps(method)
+    def instrumented(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            profiler.add_call(label, seconds)
+            if click:
+                profiler.add_click(seconds)
+
+    setattr(owner, method_name, instrumented)
+    if not _exit_dump_registered:
+        atexit.register(profiler.dump)
+        _exit_dump_registered = True
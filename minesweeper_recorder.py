@@ -0,0 +1,219 @@
+import time
+
+import numpy as np
+
+
+MAGIC = b'MSWR'
+VERSION = 1
+REVEAL_EVENT = 0
+FLAG_EVENT = 1
+UNFLAG_EVENT = 2
+END_EVENT = 3
+EVENT_NAMES = {REVEAL_EVENT: 'reveal', FLAG_EVENT: 'flag', UNFLAG_EVENT: 'unflag', END_EVENT: 'end'}
+LOST_RESULT = 0
+WON_RESULT = 1
+ABANDONED_RESULT = 2
+RESULT_NAMES = {LOST_RESULT: 'lost', WON_RESULT: 'won', ABANDONED_RESULT: 'abandoned'}
+
+
+def encode_varint(value):
+    """
+    Encodes non negative integer in 7 bit groups, lowest first.
+    """
+    if value < 0:
+        raise ValueError('Only non negative numbers can be encoded')
+    encoded = bytearray()
+    while value > 0x7f:
+        encoded.append(value & 0x7f | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def decode_varint(data, position):
+    """
+    Decodes integer starting at given position of data.
+    Returns the integer and position after it.
+    """
+    value = 0
+    shift = 0
+    while True:
+        if position >= len(data):
+            raise EOFError('Recording ends in the middle of a number')
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+
+def encode_bytes(value):
+    return encode_varint(len(value)) + value
+
+
+def decode_bytes(data, position):
+    length, position = decode_varint(data, position)
+    if position + length > len(data):
+        raise EOFError('Recording ends in the middle of a header')
+    return bytes(data[position:position + length]), position + length
+
+
+class GameRecorder:
+    """
+    Appends events of one game to binary stream.
+    Header contains board size, seed and layout of mines, each event its type,
+    coordinates and time in milliseconds since previous event, all as varints.
+    Events are kept in memory buffer and written when it is full, so recording doesn't slow down clicks.
+    """
+    buffer_size = 64 * 1024
+
+    def __init__(self, stream, clock=time.monotonic):
+        self._stream = stream
+        self._buffer = bytearray()
+        self._clock = clock
+        self._last_time = None
+        self._events = 0
+
+    def start(self, game, seed=None):
+        """
+        Writes header with board of the game, mine field has to be already created.
+        Seed is stored as text, so it gives the same mine field again only when
+        the field was created with str(seed).
+        """
+        board = game.play_board
+        mine_mask = board.symbol_mask('*')
+        header = bytearray(MAGIC)
+        header += encode_varint(VERSION)
+        header += encode_varint(board.rows())
+        header += encode_varint(board.columns())
+        header += encode_varint(game.mines.amount())
+        header += encode_bytes(b'' if seed is None else str(seed).encode('utf-8'))
+        header += encode_bytes(np.packbits(mine_mask).tobytes())
+        self._buffer += header
+        self._last_time = self._clock()
+
+    def events_count(self):
+        return self._events
+
+    def record(self, event_type, row=0, column=0):
+        """
+        Adds event of given type, end event stores result of the game in its row.
+        """
+        if self._last_time is None:
+            raise RuntimeError('Recording has not been started')
+        if event_type not in EVENT_NAMES:
+            raise ValueError(f'Unknown event type {event_type}')
+        now = self._clock()
+        delta = max(0, round((now - self._last_time) * 1000))
+        self._last_time += delta / 1000
+        self._buffer += encode_varint(event_type)
+        self._buffer += encode_varint(row)
+        self._buffer += encode_varint(column)
+        self._buffer += encode_varint(delta)
+        self._events += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def reveal(self, row, column):
+        self.record(REVEAL_EVENT, row, column)
+
+    def flag(self, row, column):
+        self.record(FLAG_EVENT, row, column)
+
+    def unflag(self, row, column):
+        self.record(UNFLAG_EVENT, row, column)
+
+    def finish(self, game_won):
+        """
+        Records end of the game and writes everything to the stream.
+        """
+        self.record(END_EVENT, WON_RESULT if game_won else LOST_RESULT)
+        self.flush()
+
+    def abandon(self):
+        """
+        Records that player left the game unfinished, e.g. started new one,
+        and writes everything to the stream.
+        """
+        self.record(END_EVENT, ABANDONED_RESULT)
+        self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._stream.write(self._buffer)
+            self._buffer = bytearray()
+        self._stream.flush()
+
+    def close(self):
+        self.flush()
+        self._stream.close()
+
+
+class Recording:
+    """
+    Decoded game recording: header fields and list of events
+    as tuples of event type, row, column and time in milliseconds since start.
+    """
+    def __init__(self, rows, columns, mines_amount, seed, mine_mask, events):
+        self.rows = rows
+        self.columns = columns
+        self.mines_amount = mines_amount
+        self.seed = seed
+        self.mine_mask = mine_mask
+        self.events = events
+
+    def mines_coordinates(self):
+        return [tuple(cell) for cell in np.argwhere(self.mine_mask).tolist()]
+
+    def result(self):
+        """
+        Returns 'won', 'lost' or 'abandoned' from end event, None when recording has no end.
+        """
+        if self.events and self.events[-1][0] == END_EVENT:
+            return RESULT_NAMES.get(self.events[-1][1])
+        return None
+
+    def duration(self):
+        """
+        Returns time in milliseconds from start of recording to the last event.
+        """
+        return self.events[-1][3] if self.events else 0
+
+
+def decode_recording(data):
+    """
+    Decodes recording from bytes. Incomplete last event, e.g. of game
+    which was interrupted, is ignored.
+    """
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError('It is not a minesweeper recording')
+    position = len(MAGIC)
+    version, position = decode_varint(data, position)
+    if version != VERSION:
+        raise ValueError(f'Unsupported version of recording {version}')
+    rows, position = decode_varint(data, position)
+    columns, position = decode_varint(data, position)
+    mines_amount, position = decode_varint(data, position)
+    seed, position = decode_bytes(data, position)
+    layout, position = decode_bytes(data, position)
+    bits = np.unpackbits(np.frombuffer(layout, dtype=np.uint8))
+    mine_mask = bits[:rows * columns].reshape(rows, columns).astype(bool)
+    events = []
+    timestamp = 0
+    while position < len(data):
+        try:
+            event_type, position = decode_varint(data, position)
+            row, position = decode_varint(data, position)
+            column, position = decode_varint(data, position)
+            delta, position = decode_varint(data, position)
+        except EOFError:
+            break
+        timestamp += delta
+        events.append((event_type, row, column, timestamp))
+    return Recording(rows, columns, mines_amount, seed.decode('utf-8') or None, mine_mask, events)
+
+
+def read_recording(path):
+    with open(path, 'rb') as recording_file:
+        return decode_recording(recording_file.read())
@@ -0,0 +1,144 @@
+import argparse
+import sys
+
+from minesweeper_classes import Board, CompactBoard, Flag, Island, Mines, Game
+from minesweeper_recorder import read_recording, REVEAL_EVENT, FLAG_EVENT, UNFLAG_EVENT
+
+
+def recorded_game(recording, board_class=CompactBoard):
+    """
+    Creates game with mine field of the recording, before the first move.
+    """
+    rows, columns = recording.rows, recording.columns
+    play_board = board_class(rows, columns)
+    play_board.set_visualization(rows, columns)
+    island_board = Board(rows, columns)
+    island_board.set_visualization(rows, columns)
+    game = Game(play_board, Flag(), Island(island_board), Mines(recording.mines_amount))
+    game.index_tiles()
+    game.create_mine_field((0, 0), mines_coordinates=recording.mines_coordinates())
+    return game
+
+
+class Replay:
+    """
+    Rebuilds state of recorded game after any number of events.
+    Snapshot of the game is kept every keyframe_interval events, so seeking
+    replays at most that many events, no matter how long the game is.
+    """
+    keyframe_interval = 64
+
+    def __init__(self, recording, board_class=CompactBoard, keyframe_interval=None):
+        self.recording = recording
+        self.game = recorded_game(recording, board_class)
+        if keyframe_interval is not None:
+            self.keyframe_interval = keyframe_interval
+        if self.keyframe_interval < 1:
+            raise ValueError('Interval between keyframes must be positive')
+        self._index = 0
+        self._keyframes = [self.game.snapshot()]
+        while self._index < len(recording.events):
+            self.step()
+            if self._index % self.keyframe_interval == 0:
+                self._keyframes.append(self.game.snapshot())
+        self.seek(0)
+
+    @classmethod
+    def from_file(cls, path, board_class=CompactBoard, keyframe_interval=None):
+        return cls(read_recording(path), board_class, keyframe_interval)
+
+    def index(self):
+        """
+        Get number of events applied to the game.
+        """
+        return self._index
+
+    def events_count(self):
+        return len(self.recording.events)
+
+    def keyframes_count(self):
+        return len(self._keyframes)
+
+    def step(self):
+        """
+        Applies next event to the game.
+        Returns list of changed cells as tuples of row, column and symbol,
+        hidden cell has None as its symbol.
+        """
+        if self._index >= len(self.recording.events):
+            raise IndexError('There are no more events in the recording')
+        event_type, row, column, timestamp = self.recording.events[self._index]
+        self._index += 1
+        changed_cells = []
+        if event_type == REVEAL_EVENT:
+            changed_cells = self.game.reveal(row, column)
+            self.game.made_move()
+        elif event_type == FLAG_EVENT:
+            self.game.flags.add_flag(row, column)
+            self.game.made_move()
+            changed_cells = [(row, column, self.game.flags.symbol())]
+        elif event_type == UNFLAG_EVENT:
+            self.game.flags.remove_flag(row, column)
+            self.game.made_move()
+            changed_cells = [(row, column, None)]
+        return changed_cells
+
+    def seek(self, index):
+        """
+        Rebuilds state of the game after given number of events.
+        """
+        if not 0 <= index <= len(self.recording.events):
+            raise IndexError(f'Recording has only {len(self.recording.events)} events')
+        keyframe = index // self.keyframe_interval
+        if not keyframe * self.keyframe_interval <= self._index <= index:
+            self.game.restore(self._keyframes[keyframe])
+            self._index = keyframe * self.keyframe_interval
+        while self._index < index:
+            self.step()
+
+    def timestamp(self):
+        """
+        Returns time in milliseconds of the last applied event.
+        """
+        return self.recording.events[self._index - 1][3] if self._index else 0
+
+    def visible_cells(self):
+        """
+        Returns list of cells which player sees at current event, as tuples
+        of row, column and symbol. Hidden cells are not included.
+        """
+        return self.game.visible_tiles()
+
+
+def replayMain(args):
+    parser = argparse.ArgumentParser(description='Replays recorded minesweeper game.')
+    parser.add_argument('recording')
+    parser.add_argument('--start', type=int, default=0, help='number of event to start from')
+    parser.add_argument('--speed', type=float, default=1.0)
+    parser.add_argument('--headless', action='store_true', help='prints summary instead of showing the game')
+    arguments = parser.parse_args(args[1:])
+    replay = Replay.from_file(arguments.recording)
+    if arguments.headless:
+        replay.seek(replay.events_count())
+        game = replay.game
+        result = 'lost' if game.lost() else 'won' if game.winning_conditions() else 'not finished'
+        if replay.recording.result() == 'abandoned':
+            result = 'abandoned'
+        print(f'{replay.recording.rows}x{replay.recording.columns}, {replay.recording.mines_amount} mines: '
+              f'{result} after {game.number_of_moves()} moves in {replay.recording.duration() / 1000:.2f} seconds')
+        return 0
+    from PySide2.QtWidgets import QApplication
+    from minesweeper_gui import MinesweeperBoard, ReplayPlayer
+    app = QApplication(args)
+    rows, columns = replay.recording.rows, replay.recording.columns
+    viewer_game = Game(Board(rows, columns), Flag(), Island(Board(rows, columns)), Mines(replay.recording.mines_amount))
+    board_ui = MinesweeperBoard(viewer_game, virtual=rows * columns > 10000)
+    player = ReplayPlayer(board_ui, replay, arguments.speed)
+    player.seek(arguments.start)
+    board_ui.show()
+    player.play()
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(replayMain(sys.argv))
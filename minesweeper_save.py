@@ -0,0 +1,122 @@
+import mmap
+import struct
+
+import numpy as np
+
+from minesweeper_classes import Board, CompactBoard, Flag, Island, Mines, Game
+
+
+MAGIC = b'MSSV'
+VERSION = 1
+HEADER = struct.Struct('<4sHIIIIdBI')
+
+
+def packed_size(cells):
+    return (cells + 7) // 8
+
+
+def save_game(game, path, elapsed_time=0.0):
+    """
+    Saves whole state of the game: layout of mines and not revealed tiles
+    as bitmaps (one bit per cell each), flags in order of placing, number of moves,
+    elapsed time in seconds and if the game is lost.
+    """
+    board = game.play_board
+    remaining_tiles, flags, number_of_moves, lost = game.snapshot()
+    flags = np.array(flags, dtype='<i4').reshape(-1, 2)
+    with open(path, 'wb') as save_file:
+        save_file.write(HEADER.pack(
+            MAGIC, VERSION, board.rows(), board.columns(), game.mines.amount(),
+            number_of_moves, elapsed_time, int(lost), len(flags)
+        ))
+        save_file.write(np.packbits(board.symbol_mask('*')).tobytes())
+        save_file.write(remaining_tiles)
+        save_file.write(flags.tobytes())
+
+
+class SavedGame:
+    """
+    Game saved by save_game, mapped into memory. Only header is read when it is opened,
+    bitmaps are decoded when they are needed, so opening even huge saves is instant.
+    """
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError('It is not a minesweeper save')
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError('It is not a minesweeper save')
+        (
+            magic, version, self.rows, self.columns, self.mines_amount,
+            self.number_of_moves, self.elapsed_time, lost, self.flags_count
+        ) = HEADER.unpack_from(self._map)
+        self.lost = bool(lost)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError('It is not a minesweeper save or its version is not supported')
+        self._bitmap_size = packed_size(self.rows * self.columns)
+        if len(self._map) != HEADER.size + 2 * self._bitmap_size + 8 * self.flags_count:
+            self.close()
+            raise ValueError('Save file is damaged')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def _bits(self, offset):
+        packed = np.frombuffer(self._map, dtype=np.uint8, count=self._bitmap_size, offset=offset)
+        return np.unpackbits(packed)[:self.rows * self.columns].reshape(self.rows, self.columns).astype(bool)
+
+    def mine_mask(self):
+        return self._bits(HEADER.size)
+
+    def revealed_mask(self):
+        return ~self._bits(HEADER.size + self._bitmap_size)
+
+    def flag_coordinates(self):
+        """
+        Returns list of coordinates of flags in order of placing.
+        """
+        offset = HEADER.size + 2 * self._bitmap_size
+        flags = np.frombuffer(self._map, dtype='<i4', count=2 * self.flags_count, offset=offset)
+        return [tuple(flag) for flag in flags.reshape(-1, 2).tolist()]
+
+    def game(self, board_class=CompactBoard):
+        """
+        Creates game in saved state. Islands are not mapped,
+        game.mapped_islands() maps them when they are needed.
+        """
+        play_board = board_class(self.rows, self.columns, symbol_index=False)
+        play_board.set_visualization(self.rows, self.columns)
+        island_board = Board(self.rows, self.columns)
+        island_board.set_visualization(self.rows, self.columns)
+        game = Game(play_board, Flag(), Island(island_board), Mines(self.mines_amount))
+        game.index_tiles()
+        mines_coordinates = np.argwhere(self.mine_mask())
+        play_board.plant_mines(mines_coordinates if isinstance(play_board, CompactBoard) else mines_coordinates.tolist())
+        play_board.info_about_mines_pos()
+        game.track_mines()
+        remaining_offset = HEADER.size + self._bitmap_size
+        game.restore((
+            self._map[remaining_offset:remaining_offset + self._bitmap_size],
+            self.flag_coordinates(), self.number_of_moves, self.lost
+        ))
+        return game
+
+
+def load_game(path, board_class=CompactBoard):
+    """
+    Returns saved game and elapsed time in seconds. The whole game is decoded at once,
+    use SavedGame to read only header or some of the bitmaps.
+    """
+    with SavedGame(path) as saved_game:
+        return saved_game.game(board_class), saved_game.elapsed_time
@@ -0,0 +1,302 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from minesweeper_classes import Board, CompactBoard, Flag, Island, Mines, Game, Difficulty, premade_difficulties
+from minesweeper_errors import NegativeCoordinatesError, NotInRangeError, check_board_coordinates, check_if_in_range
+
+
+DEFAULT_PORT = 7878
+MAX_BOARD_CELLS = 10000
+PLAYING = 'playing'
+WON = 'won'
+LOST = 'lost'
+
+
+def parse_difficulty(arguments):
+    """
+    Returns difficulty and remaining arguments of new command,
+    given as name of premade level or as size and number of mines, e.g. 16x30 99.
+    Custom board can have at most MAX_BOARD_CELLS cells. Commands run synchronously on the event loop
+shared by all sessions, so the cap keeps one reveal or state short enough not to delay other clients.
+    """
+    levels = {name.lower(): difficulty for name, difficulty in premade_difficulties().items()}
+    if not arguments:
+        raise ValueError('Level or board size is required')
+    if arguments[0].lower() in levels:
+        return levels[arguments[0].lower()], arguments[1:]
+    if len(arguments) < 2:
+        raise ValueError(f'Unknown level {arguments[0]}')
+    rows, columns = (int(size) for size in arguments[0].lower().split('x'))
+    mines_amount = int(arguments[1])
+    if rows < 1 or columns < 1 or not 0 < mines_amount < rows * columns:
+        raise ValueError('Board must have at least one mine and one safe cell')
+    if rows * columns > MAX_BOARD_CELLS:
+        raise ValueError(f'Board can have at most {MAX_BOARD_CELLS} cells')
+    return Difficulty('Custom', (rows, columns), mines_amount), arguments[2:]
+
+
+class LatencyStats:
+    """
+    Keeps durations of the latest commands in ring buffer,
+    so percentiles are calculated in constant memory no matter how long server runs.
+    """
+    size = 100000
+
+    def __init__(self, size=None):
+        if size is not None:
+            self.size = size
+        self._durations = np.zeros(self.size)
+        self._count = 0
+
+    def add(self, seconds):
+        self._durations[self._count % self.size] = seconds
+        self._count += 1
+
+    def count(self):
+        return self._count
+
+    def percentile(self, percent):
+        """
+        Returns given percentile of kept durations in seconds.
+        """
+        if not self._count:
+            return 0.0
+        return float(np.percentile(self._durations[:min(self._count, self.size)], percent))
+
+    def summary(self):
+        return {
+            'commands': self._count,
+            'p50_ms': self.percentile(50) * 1000,
+            'p99_ms': self.percentile(99) * 1000
+        }
+
+
+class GameSession:
+    """
+    Game played by one client of the server. Mine field is created at the first move,
+    like in the window game, so the first revealed cell is always safe.
+    """
+    def __init__(self):
+        self.game = None
+        self.seed = None
+        self.mine_field_created = False
+
+    def new_game(self, difficulty, seed=None):
+        rows, columns = difficulty.board_size
+        play_board = CompactBoard(rows, columns, symbol_index=False)
+        play_board.set_visualization(rows, columns)
+        island_board = Board(rows, columns)
+        island_board.set_visualization(rows, columns)
+        self.game = Game(play_board, Flag(), Island(island_board), Mines(difficulty.number_of_mines))
+        self.game.index_tiles()
+        self.seed = seed
+        self.mine_field_created = False
+
+    def status(self):
+        if self.game.lost():
+            return LOST
+        if self.game.number_of_moves() and self.game.winning_conditions():
+            return WON
+        return PLAYING
+
+    def _check_move(self, row, column):
+        if self.game is None:
+            raise ValueError('There is no game, start new one')
+        if self.status() != PLAYING:
+            raise ValueError('Game has ended, start new one')
+        check_board_coordinates((row, column))
+        check_if_in_range(row, column, self.game.play_board.rows(), self.game.play_board.columns())
+        # chord before the first reveal doesn't count as a move, so number of moves can't tell it
+        if not self.mine_field_created:
+            self.game.create_mine_field((row, column), self.seed)
+            self.mine_field_created = True
+
+    def reveal(self, row, column):
+        self._check_move(row, column)
+        changed_cells = self.game.reveal(row, column)
+        if changed_cells:
+            self.game.made_move()
+        return changed_cells
+
+    def flag(self, row, column):
+        """
+        Places flag on hidden cell or removes it.
+        """
+        self._check_move(row, column)
+        if (row, column) not in self.game.remaining_tiles():
+            return []
+        self.game.made_move()
+        if self.game.flags.has_flag(row, column):
+            self.game.flags.remove_flag(row, column)
+            return [(row, column, None)]
+        self.game.flags.add_flag(row, column)
+        return [(row, column, self.game.flags.symbol())]
+
+    def chord(self, row, column):
+        self._check_move(row, column)
+        changed_cells = self.game.chord(row, column)
+        if changed_cells:
+            self.game.made_move()
+        return changed_cells
+
+    def state(self):
+        if self.game is None:
+            raise ValueError('There is no game, start new one')
+        board = self.game.play_board
+        return {
+            'rows': board.rows(),
+            'columns': board.columns(),
+            'mines': self.game.mines.amount(),
+            'flags': self.game.flags.flags_count(),
+            'cells': self.game.visible_tiles()
+        }
+
+
+class GameServer:
+    """
+    Hosts one game session for every connected client. Each command is one line of text,
+    e.g. 'new hard 12', 'reveal 3 4', 'flag 0 0', 'chord 3 4', 'state', 'stats' or 'quit',
+    and gets one line of JSON in response with changed cells, status of the game and number of moves.
+    Commands are handled synchronously, only reading and writing sockets is concurrent,
+    so sessions never see each other's half done moves. Board size is limited by MAX_BOARD_CELLS,
+    so no command blocks other sessions for long.
+    """
+    max_line_length = 1024
+
+    def __init__(self):
+        self.sessions = set()
+        self.latency = LatencyStats()
+        self.games_started = 0
+        self._server = None
+        self._baseline_memory = 0
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT):
+        """
+        Starts listening, port 0 chooses any free port. Returns port of the server.
+        """
+        if tracemalloc.is_tracing():
+            self._baseline_memory = tracemalloc.get_traced_memory()[0]
+        self._server = await asyncio.start_server(self.handle_client, host, port, limit=self.max_line_length)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def handle_client(self, reader, writer):
+        session = GameSession()
+        self.sessions.add(session)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b'{"ok": false, "error": "Command is too long"}\n')
+                    break
+                if not line:
+                    break
+                start = time.perf_counter()
+                response = self.execute(session, line.decode('utf-8', 'replace'))
+                payload = json.dumps(response).encode('utf-8') + b'\n'
+                self.latency.add(time.perf_counter() - start)
+                writer.write(payload)
+                if response.get('bye'):
+                    break
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.discard(session)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def execute(self, session, line):
+        """
+        Runs one command of the protocol and returns response.
+        """
+        command, *arguments = line.split() or ['']
+        command = command.lower()
+        try:
+            if command == 'new':
+                difficulty, arguments = parse_difficulty(arguments)
+                session.new_game(difficulty, arguments[0] if arguments else None)
+                self.games_started += 1
+                rows, columns = difficulty.board_size
+                return {'ok': True, 'rows': rows, 'columns': columns, 'mines': difficulty.number_of_mines,
+                        'status': session.status(), 'moves': 0}
+            if command in ('reveal', 'flag', 'chord'):
+                if len(arguments) != 2:
+                    raise ValueError(f'{command} needs row and column')
+                row, column = (int(argument) for argument in arguments)
+                changed_cells = getattr(session, command)(row, column)
+                return {'ok': True, 'cells': changed_cells, 'status': session.status(),
+                        'moves': session.game.number_of_moves()}
+            if command == 'state':
+                state = session.state()
+                state.update({'ok': True, 'status': session.status(), 'moves': session.game.number_of_moves()})
+                return state
+            if command == 'stats':
+                return dict(self.stats(), ok=True)
+            if command == 'quit':
+                return {'ok': True, 'bye': True}
+            raise ValueError(f'Unknown command {command!r}')
+        except (ValueError, NegativeCoordinatesError, NotInRangeError) as error:
+            return {'ok': False, 'error': str(error) or type(error).__name__}
+
+    def stats(self):
+        """
+        Returns number of sessions, latency of handling commands and, when tracemalloc
+        is tracing, memory allocated since start of the server divided by sessions.
+        """
+        stats = dict(self.latency.summary(), sessions=len(self.sessions), games=self.games_started)
+        if tracemalloc.is_tracing():
+            memory = tracemalloc.get_traced_memory()[0] - self._baseline_memory
+            stats['memory_bytes'] = memory
+            stats['memory_per_session_bytes'] = memory // max(1, len(self.sessions))
+        return stats
+
+
+async def run_server(host, port, stats_interval):
+    server = GameServer()
+    port = await server.start(host, port)
+    print(f'Minesweeper server listening on {host}:{port}', file=sys.stderr)
+    if stats_interval:
+        async def report():
+            while True:
+                await asyncio.sleep(stats_interval)
+                print(json.dumps(server.stats()), file=sys.stderr)
+        asyncio.ensure_future(report())
+    await server.serve_forever()
+
+
+def serverMain(args):
+    parser = argparse.ArgumentParser(description='Hosts minesweeper games for clients connected over TCP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--stats-interval', type=float, default=0, help='seconds between printed statistics')
+    parser.add_argument('--trace-memory', action='store_true', help='measures memory used by sessions')
+    arguments = parser.parse_args(args[1:])
+    if arguments.trace_memory:
+        tracemalloc.start()
+    try:
+        asyncio.run(run_server(arguments.host, arguments.port, arguments.stats_interval))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(serverMain(sys.argv))
@@ -0,0 +1,414 @@
+from collections import deque
+from functools import lru_cache
+from random import Random
+import time
+
+import numpy as np
+
+from minesweeper_classes import CompactBoard, Mines, adjacent_mines_count
+
+
+def cell_neighbours(row, column, rows, columns):
+    """
+    Returns list of coordinates of all neighbours of given cell,
+    in the same order as Board.cell_neighbours.
+    """
+    possible_rows = [check_row for check_row in (row, row + 1, row - 1) if 0 <= check_row < rows]
+    possible_columns = [
+        check_column for check_column in (column, column + 1, column - 1) if 0 <= check_column < columns
+    ]
+    return [
+        (neighbour_row, neighbour_column)
+        for neighbour_row in possible_rows for neighbour_column in possible_columns
+        if (neighbour_row, neighbour_column) != (row, column)
+    ]
+
+
+def visible_digits(game):
+    """
+    Returns dictionary: revealed cell -> number of mines around it.
+    """
+    board = game.play_board
+    revealed = {}
+    for row, column in game.remaining_tiles().revealed_tiles():
+        symbol = board.get_coordinates_info(row, column)
+        if symbol == '.':
+            revealed[(row, column)] = 0
+        elif symbol.isdigit():
+            revealed[(row, column)] = int(symbol)
+    return revealed
+
+
+@lru_cache(maxsize=8)
+def neighbour_table(rows, columns):
+    """
+    Returns dictionary: cell -> tuple of its neighbours, for board of given size.
+    Tables are shared between solvers working on boards of the same size.
+    """
+    return {
+        (row, column): tuple(cell_neighbours(row, column, rows, columns))
+        for row in range(rows) for column in range(columns)
+    }
+
+
+def enumerate_group(cells, constraints):
+    """
+    Checks every placement of mines in group of cells which satisfies
+    given constraints (pairs of set of cells and number of mines in them).
+    Returns dictionary: number of mines in group -> [number of placements,
+    list with number of placements in which each cell has a mine].
+    """
+    cell_positions = {cell: position for position, cell in enumerate(cells)}
+    cell_constraints = [[] for cell in cells]
+    mines_left = []
+    cells_left = []
+    for index, (constraint_cells, mines) in enumerate(constraints):
+        for cell in constraint_cells:
+            cell_constraints[cell_positions[cell]].append(index)
+        mines_left.append(mines)
+        cells_left.append(len(constraint_cells))
+    assignment = [0] * len(cells)
+    results = {}
+
+    def place(position, mines_placed):
+        if position == len(cells):
+            result = results.setdefault(mines_placed, [0, [0] * len(cells)])
+            result[0] += 1
+            for cell_position, is_mine in enumerate(assignment):
+                result[1][cell_position] += is_mine
+            return
+        for is_mine in (0, 1):
+            possible = True
+            for index in cell_constraints[position]:
+                cells_left[index] -= 1
+                mines_left[index] -= is_mine
+                if mines_left[index] < 0 or mines_left[index] > cells_left[index]:
+                    possible = False
+            if possible:
+                assignment[position] = is_mine
+                place(position + 1, mines_placed + is_mine)
+            for index in cell_constraints[position]:
+                cells_left[index] += 1
+                mines_left[index] += is_mine
+        assignment[position] = 0
+
+    place(0, 0)
+    return results
+
+
+class Solver:
+    """
+    Finds cells which are surely safe or surely contain mines,
+    knowing only digits revealed by player and (optionally) flags.
+    """
+    max_group_cells = 24
+
+    def __init__(self, rows, columns, revealed, mines=(), mines_amount=None):
+        self._rows = rows
+        self._columns = columns
+        self._revealed = dict(revealed)
+        self._known_mines = set(mines)
+        self._mines = set(mines)
+        self._safe = set()
+        self._mines_amount = mines_amount
+        self._neighbours = neighbour_table(rows, columns)
+        # revealed, mine and safe cells, kept up to date instead of joined on every pass
+        self._known = self._revealed.keys() | self._mines
+        self._frontier = {
+            cell for cell in self._revealed
+            if not self._known.issuperset(self._neighbours[cell])
+        }
+
+    @classmethod
+    def from_game(cls, game, trust_flags=False):
+        """
+        Creates solver from visible state of the game.
+        Flags are treated as mines only when trust_flags is set.
+        """
+        board = game.play_board
+        mines = game.flags.flag_coordinates() if trust_flags else ()
+        return cls(board.rows(), board.columns(), visible_digits(game), mines, game.mines.amount())
+
+    def reveal(self, cell, mines_around):
+        """
+        Adds newly revealed digit to the known state.
+        """
+        self._revealed[cell] = mines_around
+        self._safe.discard(cell)
+        self._known.add(cell)
+        if any(self._is_unknown(neighbour) for neighbour in self.neighbours(*cell)):
+            self._frontier.add(cell)
+
+    def neighbours(self, row, column):
+        """
+        Returns neighbours of given cell.
+        """
+        return self._neighbours[(row, column)]
+
+    def _is_unknown(self, cell):
+        return cell not in self._known
+
+    def constraints(self):
+        """
+        Returns dictionary of constraints: set of unknown cells around
+        revealed digit -> number of mines which are still hidden in them.
+        """
+        constraints = {}
+        known = self._known
+        for cell in list(self._frontier):
+            neighbours = self._neighbours[cell]
+            unknown_cells = [neighbour for neighbour in neighbours if neighbour not in known]
+            if unknown_cells:
+                mines_around = len(self._mines.intersection(neighbours))
+                constraints[frozenset(unknown_cells)] = self._revealed[cell] - mines_around
+            else:
+                self._frontier.discard(cell)
+        return constraints
+
+    def _mark(self, safe_cells=(), mine_cells=()):
+        """
+        Saves deduced cells, returns True if any of them was unknown.
+        """
+        new_safe_cells = [cell for cell in safe_cells if cell not in self._known]
+        self._safe.update(new_safe_cells)
+        self._known.update(new_safe_cells)
+        new_mine_cells = [cell for cell in mine_cells if cell not in self._known]
+        self._mines.update(new_mine_cells)
+        self._known.update(new_mine_cells)
+        return bool(new_safe_cells or new_mine_cells)
+
+    def _single_cell_rule(self, constraints):
+        progress = False
+        for cells, mines in constraints.items():
+            if mines == 0:
+                progress |= self._mark(safe_cells=cells)
+            elif mines == len(cells):
+                progress |= self._mark(mine_cells=cells)
+        return progress
+
+    def _subset_rule(self, constraints):
+        cell_constraints = {}
+        for cells in constraints:
+            for cell in cells:
+                cell_constraints.setdefault(cell, []).append(cells)
+        progress = False
+        for first_cells, first_mines in constraints.items():
+            overlapping = {cells for cell in first_cells for cells in cell_constraints[cell]}
+            for second_cells in overlapping:
+                only_first = first_cells - second_cells
+                if only_first and first_mines - constraints[second_cells] == len(only_first):
+                    progress |= self._mark(safe_cells=second_cells - first_cells, mine_cells=only_first)
+        return progress
+
+    def groups(self, constraints):
+        """
+        Splits frontier into groups of cells which share constraints.
+        Returns list of pairs: list of cells and list of their constraints.
+        """
+        cell_constraints = {}
+        for cells in constraints:
+            for cell in cells:
+                cell_constraints.setdefault(cell, []).append(cells)
+        visited = set()
+        groups = []
+        for start in cell_constraints:
+            if start in visited:
+                continue
+            group_cells = []
+            group_constraints = set()
+            cells_to_visit = deque([start])
+            visited.add(start)
+            while cells_to_visit:
+                cell = cells_to_visit.popleft()
+                group_cells.append(cell)
+                for cells in cell_constraints[cell]:
+                    group_constraints.add(cells)
+                    for neighbour in cells:
+                        if neighbour not in visited:
+                            visited.add(neighbour)
+                            cells_to_visit.append(neighbour)
+            groups.append((group_cells, [(cells, constraints[cells]) for cells in group_constraints]))
+        return groups
+
+    def _enumeration_rule(self, constraints):
+        progress = False
+        for cells, group_constraints in self.groups(constraints):
+            if len(cells) > self.max_group_cells:
+                continue
+            results = enumerate_group(cells, group_constraints)
+            solutions = sum(result[0] for result in results.values())
+            if not solutions:
+                continue
+            mine_counts = [sum(result[1][position] for result in results.values()) for position in range(len(cells))]
+            progress |= self._mark(
+                safe_cells=[cell for cell, count in zip(cells, mine_counts) if count == 0],
+                mine_cells=[cell for cell, count in zip(cells, mine_counts) if count == solutions]
+            )
+        return progress
+
+    def _mines_amount_rule(self):
+        if self._mines_amount is None:
+            return False
+        hidden_mines = self._mines_amount - len(self._mines)
+        unknown_amount = self._rows * self._columns - len(self._revealed) - len(self._mines) - len(self._safe)
+        if unknown_amount == 0 or (hidden_mines != 0 and hidden_mines != unknown_amount):
+            return False
+        unknown_cells = [
+            (row, column) for row in range(self._rows) for column in range(self._columns)
+            if self._is_unknown((row, column))
+        ]
+        if hidden_mines == 0:
+            return self._mark(safe_cells=unknown_cells)
+        return self._mark(mine_cells=unknown_cells)
+
+    def simplify(self):
+        """
+        Applies only cheap rules until they don't give anything new.
+        Returns constraints which are left.
+        """
+        while True:
+            constraints = self.constraints()
+            if not (self._single_cell_rule(constraints) or self._subset_rule(constraints)):
+                return constraints
+
+    def deduced(self):
+        """
+        Returns pair of sets: cells deduced to be safe and cells deduced to contain mines.
+        """
+        return set(self._safe), self._mines - self._known_mines
+
+    def solve(self, first_safe=False):
+        """
+        Returns pair of sets: coordinates of cells which are surely safe
+        and coordinates of cells which surely contain mines (without mines given to solver).
+        Cheap rules are tried first, enumeration only when they don't give anything new.
+        With first_safe set solver stops as soon as it knows any safe cell, which is enough to make a move.
+        """
+        progress = True
+        while progress and not (first_safe and self._safe):
+            constraints = self.constraints()
+            progress = (
+                self._single_cell_rule(constraints)
+                or self._subset_rule(constraints)
+                or self._enumeration_rule(constraints)
+                or self._mines_amount_rule()
+            )
+        return self.deduced()
+
+
+def _play(mine_mask, first_move, revealed=None):
+    rows, columns = mine_mask.shape
+    numbers = adjacent_mines_count(mine_mask).tolist()
+    mines = mine_mask.tolist()
+    safe_amount = rows * columns - int(mine_mask.sum())
+    revealed = set(revealed or ())
+    solver = Solver(
+        rows, columns, {(row, column): numbers[row][column] for row, column in revealed},
+        mines_amount=rows * columns - safe_amount
+    )
+
+    def reveal(cell):
+        cells_to_reveal = deque([cell])
+        while cells_to_reveal:
+            row, column = cells_to_reveal.popleft()
+            if (row, column) in revealed or mines[row][column]:
+                continue
+            revealed.add((row, column))
+            solver.reveal((row, column), numbers[row][column])
+            if numbers[row][column] == 0:
+                cells_to_reveal.extend(solver.neighbours(row, column))
+
+    if not revealed:
+        reveal(tuple(first_move))
+    while len(revealed) < safe_amount:
+        safe_cells, mine_cells = solver.solve(first_safe=True)
+        if not safe_cells:
+            return False, revealed, mine_cells
+        for cell in safe_cells:
+            reveal(cell)
+    return True, revealed, set()
+
+
+def play_without_guessing(mine_mask, first_move, revealed=None):
+    """
+    Plays board with given boolean mask of mines starting from first move,
+    revealing only cells which solver proves to be safe.
+    Play can be continued from already revealed safe cells.
+    Returns True if all safe cells were revealed and set of revealed cells.
+    """
+    cleared, revealed, deduced_mines = _play(mine_mask, first_move, revealed)
+    return cleared, revealed
+
+
+def _move_frontier_mine(mine_mask, revealed, deduced_mines, first_move, generator):
+    """
+    Moves one mine which blocks the solver (hidden cell next to revealed ones,
+    preferably one which solver couldn't deduce) to a hidden cell far from revealed area. When there is no such cell,
+    mine is moved inside revealed area, to a cell surrounded only by revealed cells,
+    which is hidden again. Returns False if it is not possible.
+    """
+    rows, columns = mine_mask.shape
+    revealed_mask = np.zeros((rows, columns), dtype=bool)
+    revealed_mask[tuple(zip(*revealed))] = True
+    near_revealed = adjacent_mines_count(revealed_mask) > 0
+    frontier_mines = [
+        cell for cell in np.argwhere(mine_mask & near_revealed & ~revealed_mask).tolist()
+        if tuple(cell) not in deduced_mines
+    ] or np.argwhere(mine_mask & near_revealed & ~revealed_mask).tolist()
+    target_cells = ~mine_mask & ~near_revealed & ~revealed_mask
+    first_row, first_column = first_move
+    first_area = (slice(max(first_row - 1, 0), first_row + 2), slice(max(first_column - 1, 0), first_column + 2))
+    target_cells[first_area] = False
+    if not target_cells.any():
+        hidden_mask = ~revealed_mask
+        target_cells = revealed_mask & (adjacent_mines_count(hidden_mask) == 0)
+        target_cells[first_area] = False
+    target_cells = np.argwhere(target_cells).tolist()
+    if not frontier_mines or not target_cells:
+        return False
+    mine_row, mine_column = generator.choice(frontier_mines)
+    target_row, target_column = generator.choice(target_cells)
+    mine_mask[mine_row, mine_column] = False
+    mine_mask[target_row, target_column] = True
+    revealed.discard((target_row, target_column))
+    return True
+
+
+def generate_no_guess_layout(rows, columns, mines_amount, first_move, seed=None, time_budget=0.1):
+    """
+    Generates layout of mines which can be cleared from first move without guessing.
+    When solver gets stuck, one of mines blocking it is moved away from revealed area
+    and play continues from the same place. Cleared layout is checked once more
+    by playing it from the first move. New layout is drawn when no mine can be moved.
+    Returns list of coordinates of mines and dictionary with statistics. When time budget
+    (in seconds) runs out, the last layout is returned and statistics show it is not solved.
+    """
+    generator = seed if isinstance(seed, Random) else Random(seed)
+    start = time.perf_counter()
+    statistics = {'layouts': 0, 'repairs': 0, 'checks': 0, 'solved': False, 'seconds': 0.0}
+
+    def random_layout():
+        board = CompactBoard(rows, columns, symbol_index=False)
+        board.set_visualization(rows, columns)
+        board.fill_mines(Mines(mines_amount), first_move, generator, safe_neighbours=True)
+        statistics['layouts'] += 1
+        return board.symbol_mask('*')
+
+    mine_mask = random_layout()
+    revealed = None
+    while True:
+        cleared, revealed, deduced_mines = _play(mine_mask, first_move, revealed)
+        if cleared:
+            statistics['checks'] += 1
+            statistics['solved'], revealed, deduced_mines = _play(mine_mask, first_move)
+            if statistics['solved']:
+                break
+        if time.perf_counter() - start > time_budget:
+            break
+        if _move_frontier_mine(mine_mask, revealed, deduced_mines, first_move, generator):
+            statistics['repairs'] += 1
+        else:
+            mine_mask = random_layout()
+            revealed = None
+    statistics['seconds'] = time.perf_counter() - start
+    return [tuple(cell) for cell in np.argwhere(mine_mask).tolist()], statistics
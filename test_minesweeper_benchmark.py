@@ -0,0 +1,20 @@
+import json
+
+from minesweeper_benchmark import run_benchmarks, benchmarkMain, benchmark_cases
+
+
+def test_run_benchmarks():
+    results = run_benchmarks([(9, 9)], [0.12], repeat=1, board='compact')
+    assert [result['operation'] for result in results] == list(benchmark_cases(0))
+    assert all(result['mines'] == 9 for result in results)
+    assert all(result['min_seconds'] >= 0 for result in results)
+
+
+def test_benchmark_main(tmp_path):
+    output = tmp_path / 'bench.json'
+    benchmarkMain(['minesweeper_benchmark.py', '--sizes', '9x9', '16x30', '--densities', '0.2',
+                   '--operations', 'fill_mines', 'full_game', '--repeat', '1', '--output', str(output)])
+    report = json.loads(output.read_text())
+    assert len(report['results']) == 4
+    assert report['results'][1]['rows'] == 9
+    assert report['results'][3]['columns'] == 30
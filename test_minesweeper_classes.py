@@ -1,5 +1,13 @@
+from random import Random
+
+import numpy as np
+
 from minesweeper_classes import (
+    board_3bv,
+    batch_board_3bv,
+    count_openings,
     Board,
+    CompactBoard,
     Flag,
     Island,
     Mines,
@@ -235,3 +243,322 @@ def test_3bv_calculation():
     game = Game(board, flags, islands, mines)
     islands.calculate_islands()
     assert game.calculate_3bv() == 4
+
+
+def test_compact_board_view():
+    board = CompactBoard(2, 3)
+    board.set_visualization(2, 3)
+    assert board.cells.dtype.itemsize == 1
+    board.set_coordinates(0, 1, '*')
+    board.set_coordinates(1, 1, 2)
+    assert board.visualization == [['.', '*', '.'],
+                                   ['.', '2', '.']]
+    assert board.visualization[1][1] == '2'
+    assert board.get_coordinates_info(0, 1) == '*'
+    assert board.search_symbol_coordinates('*') == [(0, 1)]
+
+
+def test_compact_board_assign_visualization():
+    board = CompactBoard(2, 2)
+    board.visualization = [['*', '1'],
+                           ['?', '.']]
+    assert board.get_code(0, 0) == 9
+    assert board.get_code(1, 0) == 10
+    assert board.visualization[0].count('*') == 1
+
+
+def test_compact_board_info_about_mines():
+    board = CompactBoard(3, 4)
+    board.visualization = [['*', '.', '.', '.'],
+                           ['.', '.', '.', '*'],
+                           ['*', '.', '.', '.']]
+    board.info_about_mines_pos()
+    assert board.visualization == [['*', '1', '1', '1'],
+                                   ['2', '2', '1', '*'],
+                                   ['*', '1', '1', '1']]
+
+
+def test_island_sizes_and_boundaries():
+    board1 = Board(2, 5)
+    board1.set_visualization(2, 5)
+    board_islands = Board(2, 5)
+    board_islands.set_visualization(2, 5)
+    islands = Island(board_islands)
+    board1.visualization = [['1', '1', '1', '.', '.'],
+                            ['1', '*', '1', '.', '.']]
+    islands.map_islands(board1)
+    assert islands.amount() == 1
+    assert islands.island_sizes() == {1: 4}
+    assert islands.island_boundaries() == {1: {(0, 2), (1, 2)}}
+
+
+def test_island_connected_through_long_chain():
+    board1 = Board(3, 5)
+    board_islands = Board(3, 5)
+    board_islands.set_visualization(3, 5)
+    islands = Island(board_islands)
+    board1.visualization = [['.', '1', '*', '1', '.'],
+                            ['.', '1', '1', '1', '.'],
+                            ['.', '.', '.', '.', '.']]
+    islands.map_islands(board1)
+    assert islands.calculate_islands() == ['1']
+    assert islands.island_sizes() == {1: 9}
+
+
+def test_symbol_index_follows_set_coordinates():
+    board = Board(10, 10)
+    board.set_visualization(10, 10)
+    assert board.uses_symbol_index() is True
+    assert board.search_symbol_coordinates('*') == []
+    board.set_coordinates(4, 2, '*')
+    board.set_coordinates(1, 7, '*')
+    assert board.search_symbol_coordinates('*') == [(1, 7), (4, 2)]
+    board.set_coordinates(4, 2, 3)
+    assert board.search_symbol_coordinates('*') == [(1, 7)]
+    assert board.search_symbol_coordinates('3') == [(4, 2)]
+    assert len(board.search_symbol_coordinates('.')) == 98
+
+
+def test_symbol_index_small_board_scans():
+    board = Board(3, 3)
+    board.set_visualization(3, 3)
+    assert board.uses_symbol_index() is False
+    assert Board(10, 10, symbol_index=False).uses_symbol_index() is False
+    board.visualization[2][1] = '*'
+    assert board.search_symbol_coordinates('*') == [(2, 1)]
+
+
+def test_fill_mines_seeded():
+    first_board = Board(9, 9)
+    first_board.set_visualization(9, 9)
+    second_board = Board(9, 9)
+    second_board.set_visualization(9, 9)
+    first_board.fill_mines(Mines(10), (4, 4), seed=7)
+    second_board.fill_mines(Mines(10), (4, 4), seed=Random(7))
+    assert first_board.visualization == second_board.visualization
+    assert len(first_board.search_symbol_coordinates('*')) == 10
+
+
+def test_fill_mines_whole_board():
+    board = Board(4, 5)
+    board.set_visualization(4, 5)
+    board.fill_mines(Mines(19), (2, 3))
+    assert board.search_symbol_coordinates('.') == [(2, 3)]
+
+
+def test_fill_mines_skips_existing_mines(monkeypatch):
+    board = Board(30, 30)
+    board.set_visualization(30, 30)
+
+    def build_symbol_index():
+        raise AssertionError('Filling fresh board must not index all cells')
+    monkeypatch.setattr(board, '_build_symbol_index', build_symbol_index)
+    board.fill_mines(Mines(10), (0, 0), seed=1)
+    board.fill_mines(Mines(889), (0, 0), seed=2)
+    assert board.symbol_mask('*').sum() == 899
+    assert board.get_coordinates_info(0, 0) == '.'
+
+
+def test_fill_mines_safe_neighbours():
+    board = Board(4, 4)
+    board.set_visualization(4, 4)
+    board.fill_mines(Mines(12), (0, 0), seed=3, safe_neighbours=True)
+    assert board.search_symbol_coordinates('.') == [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+
+def test_reveal_tile():
+    game = Game(Board(2, 3), Flag(), Island(Board(2, 3)), Mines(1))
+    game.index_tiles()
+    assert game.remaining_tiles_count() == 6
+    assert game.reveal_tile(1, 2) is True
+    assert game.reveal_tile(1, 2) is False
+    assert (1, 2) not in game.remaining_tiles()
+    assert (0, 2) in game.remaining_tiles()
+    assert game.remaining_tiles_count() == 5
+    assert game.remaining_tiles() == [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1)]
+
+
+def test_game_winning_flags():
+    board = Board(2, 3)
+    flags = Flag()
+    game = Game(board, flags, Island(Board(2, 3)), Mines(2))
+    game.index_tiles()
+    board.visualization = [['*', '2', '1'],
+                           ['*', '2', '1']]
+    game.track_mines()
+    flags.add_flag(0, 0)
+    flags.add_flag(0, 1)
+    assert game.winning_conditions() is False
+    flags.add_flag(1, 0)
+    assert game.winning_conditions() is False
+    flags.remove_flag(0, 1)
+    assert game.winning_conditions() is True
+
+
+def test_bulk_flags():
+    flags = Flag()
+    flags.add_flags([(0, 1), (2, 2), (0, 1)])
+    assert flags.flags_count() == 2
+    assert flags.has_flag(2, 2) is True
+    assert flags.has_flag(1, 1) is False
+    flags.clear()
+    assert flags.flags_count() == 0
+    assert flags.flag_coordinates() == []
+
+
+def test_count_openings():
+    empty_mask = np.array([[1, 0, 0, 1],
+                           [0, 1, 0, 0],
+                           [0, 0, 0, 1]], dtype=bool)
+    assert count_openings(empty_mask) == 3
+
+
+def test_board_3bv_batch():
+    first_layout = [[0, 0, 0, 0, 0],
+                    [0, 1, 0, 0, 0]]
+    second_layout = [[1, 0, 0, 0, 1],
+                     [0, 0, 0, 0, 0]]
+    assert board_3bv(first_layout) == 4
+    assert list(batch_board_3bv([first_layout, second_layout])) == [4, board_3bv(second_layout)]
+
+
+def test_reveal_island():
+    board = Board(3, 5)
+    flags = Flag()
+    game = Game(board, flags, Island(Board(3, 5)), Mines(1))
+    board.visualization = [['1', '1', '1', '.', '.'],
+                           ['1', '*', '1', '.', '.'],
+                           ['1', '1', '1', '.', '.']]
+    game.index_tiles()
+    flags.add_flag(0, 4)
+    changed_tiles = game.reveal(1, 3)
+    assert sorted(changed_tiles) == [
+        (0, 2, '1'), (0, 3, '.'), (1, 2, '1'), (1, 3, '.'), (1, 4, '.'),
+        (2, 2, '1'), (2, 3, '.'), (2, 4, '.')]
+    assert changed_tiles[0] == (1, 3, '.')
+    assert (0, 4) in game.remaining_tiles()
+    assert game.reveal(1, 3) == []
+    assert game.reveal(0, 0) == [(0, 0, '1')]
+    assert game.lost() is False
+
+
+def test_reveal_mine():
+    board = Board(2, 2)
+    game = Game(board, Flag(), Island(Board(2, 2)), Mines(2))
+    board.visualization = [['*', '2'],
+                           ['2', '*']]
+    game.index_tiles()
+    assert game.reveal(1, 1) == [(0, 0, '*'), (1, 1, '*')]
+    assert game.lost() is True
+
+
+def test_create_mine_field():
+    board = Board(5, 6)
+    board.set_visualization(5, 6)
+    board_islands = Board(5, 6)
+    board_islands.set_visualization(5, 6)
+    game = Game(board, Flag(), Island(board_islands), Mines(5))
+    game.index_tiles()
+    game.create_mine_field((2, 2), seed=4, safe_neighbours=True)
+    assert len(board.search_symbol_coordinates('*')) == 5
+    changed_tiles = game.reveal(2, 2)
+    assert len(changed_tiles) > 1
+    assert game.remaining_tiles_count() == 30 - len(changed_tiles)
+
+
+def test_islands_are_mapped_when_needed():
+    board = CompactBoard(5, 6)
+    board.set_visualization(5, 6)
+    board_islands = Board(5, 6)
+    board_islands.set_visualization(5, 6)
+    game = Game(board, Flag(), Island(board_islands), Mines(3))
+    game.index_tiles()
+    game.create_mine_field((0, 0), seed=4, safe_neighbours=True)
+    assert game.islands.island_sizes() == {}
+    islands = game.mapped_islands()
+    assert islands is game.islands
+    assert sum(islands.island_sizes().values()) == len(board.search_symbol_coordinates('.'))
+    assert game.mapped_islands().island_sizes() == islands.island_sizes()
+
+
+def test_chord():
+    board = Board(3, 3)
+    flags = Flag()
+    game = Game(board, flags, Island(Board(3, 3)), Mines(2))
+    board.visualization = [['*', '2', '1'],
+                           ['2', '3', '*'],
+                           ['1', '*', '2']]
+    game.index_tiles()
+    game.reveal(1, 1)
+    assert game.chord(1, 1) == []
+    flags.add_flag(0, 0)
+    flags.add_flag(1, 2)
+    assert game.chord(0, 0) == []
+    assert game.chord(1, 1) == []
+    flags.add_flag(2, 1)
+    assert sorted(game.chord(1, 1)) == [(0, 1, '2'), (0, 2, '1'), (1, 0, '2'), (2, 0, '1'), (2, 2, '2')]
+
+
+def test_chord_with_wrong_flag():
+    board = Board(3, 3)
+    flags = Flag()
+    game = Game(board, flags, Island(Board(3, 3)), Mines(2))
+    board.visualization = [['*', '2', '1'],
+                           ['2', '3', '*'],
+                           ['1', '*', '2']]
+    game.index_tiles()
+    game.reveal(0, 1)
+    flags.add_flag(0, 0)
+    flags.add_flag(1, 1)
+    changed_tiles = game.chord(0, 1)
+    assert game.lost() is True
+    assert (0, 2, '1') in changed_tiles and (1, 2, '*') in changed_tiles
+    assert (1, 0) in game.remaining_tiles()
+    assert game.chord(0, 1) == []
+
+
+def test_game_reset_reuses_buffers():
+    board = CompactBoard(16, 30)
+    board.set_visualization(16, 30)
+    island_board = Board(16, 30)
+    island_board.set_visualization(16, 30)
+    game = Game(board, Flag(), Island(island_board), Mines(99))
+    game.index_tiles()
+    game.reset(Difficulty('Expert', (16, 30), 99), seed=7)
+    game.create_mine_field((8, 8))
+    first_layout = board.symbol_mask('*')
+    game.reveal(8, 8)
+    game.flags.add_flag(0, 0)
+    game.made_move()
+    cells = board.cells
+    island_rows = island_board.visualization[:]
+    remaining_tiles = game.remaining_tiles()
+    game.reset(Difficulty('Expert', (16, 30), 80), seed=7)
+    assert board.cells is cells and (cells == 0).all()
+    assert all(row is old_row for row, old_row in zip(island_board.visualization, island_rows))
+    assert island_board.visualization == [['.'] * 30 for row in range(16)]
+    assert game.remaining_tiles() is remaining_tiles and game.remaining_tiles_count() == 480
+    assert game.flags.flags_count() == 0 and game.number_of_moves() == 0 and game.mines.amount() == 80
+    assert game.islands.island_sizes() == {}
+    game.reset(Difficulty('Expert', (16, 30), 99), seed=7)
+    game.create_mine_field((8, 8))
+    assert (board.symbol_mask('*') == first_layout).all()
+    assert game.reveal(8, 8)
+    assert not game.winning_conditions()
+
+
+def test_game_reset_to_other_size():
+    board = Board(3, 3)
+    board.set_visualization(3, 3)
+    island_board = Board(3, 3)
+    island_board.set_visualization(3, 3)
+    game = Game(board, Flag(), Island(island_board), Mines(1))
+    game.index_tiles()
+    game.create_mine_field((0, 0), seed=1)
+    game.reveal(0, 0)
+    game.reset(Difficulty('Custom', (4, 6), 5))
+    assert (board.rows(), board.columns()) == (4, 6)
+    assert board.visualization == [['.'] * 6 for row in range(4)]
+    assert game.remaining_tiles_count() == 24
+    game.create_mine_field((1, 1), seed=2)
+    assert len(board.search_symbol_coordinates('*')) == 5
@@ -2,6 +2,7 @@ import pytest
 
 from minesweeper_classes import (
     Board,
+    CompactBoard,
     Flag,
     Island,
     Mines,
@@ -89,3 +90,24 @@ def test_insert_difficulty_wrong_class():
     easy = Difficulty("Easy", (8, 8), 10)
     with pytest.raises(WrongClassError):
         easy.insert_difficulty(Flag(), Mines(), Flag())
+
+
+def test_compact_board_read_only_view():
+    board = CompactBoard(2, 2)
+    board.set_visualization(2, 2)
+    with pytest.raises(TypeError):
+        board.visualization[0][0] = '*'
+
+
+def test_compact_board_wrong_symbol():
+    board = CompactBoard(2, 2)
+    board.set_visualization(2, 2)
+    with pytest.raises(WrongSymbolError):
+        board.set_coordinates(0, 0, 'X')
+
+
+def test_fill_mines_too_many():
+    board = Board(3, 3)
+    board.set_visualization(3, 3)
+    with pytest.raises(ValueError):
+        board.fill_mines(Mines(6), (1, 1), safe_neighbours=True)
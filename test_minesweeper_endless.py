@@ -0,0 +1,119 @@
+import io
+
+import numpy as np
+import pytest
+
+from minesweeper_classes import HIDDEN_CODE, MINE_CODE, FLAG_CODE
+from minesweeper_endless import EndlessBoard, play_endless, render_window
+
+
+def test_chunks_are_deterministic():
+    board = EndlessBoard(seed=5, chunk_size=8)
+    other_board = EndlessBoard(seed=5, chunk_size=8)
+    for chunk in [(0, 0), (-3, 7), (100, -100)]:
+        assert (board.chunk_mine_mask(*chunk) == other_board.chunk_mine_mask(*chunk)).all()
+    assert not (board.chunk_mine_mask(1, 1) == EndlessBoard(seed=6, chunk_size=8).chunk_mine_mask(1, 1)).all()
+
+
+def test_digits_across_chunk_borders():
+    board = EndlessBoard(seed=1, density=0.2, chunk_size=4)
+    for row in range(-6, 6):
+        for column in range(-6, 6):
+            symbol = board.get_coordinates_info(row, column)
+            mines = sum(
+                board.get_coordinates_info(row + row_shift, column + column_shift) == '*'
+                for row_shift in (-1, 0, 1) for column_shift in (-1, 0, 1) if row_shift or column_shift
+            )
+            if symbol != '*':
+                assert symbol == ('.' if mines == 0 else str(mines))
+
+
+def test_start_is_safe_and_opens_island():
+    board = EndlessBoard(seed=3, density=0.15, chunk_size=8)
+    assert board.active_chunks_count() == 0
+    changed_cells = board.reveal(0, 0)
+    assert changed_cells[0] == (0, 0, '.')
+    assert not board.lost()
+    assert board.revealed_count() == len(changed_cells)
+    assert all(board.is_revealed(row, column) for row, column, symbol in changed_cells)
+    assert board.reveal(0, 0) == []
+
+
+def test_revealing_mine_loses():
+    board = EndlessBoard(seed=3, chunk_size=8)
+    row, column = np.argwhere(board.chunk_mine_mask(5, 5))[0] + 40
+    assert board.reveal(row, column) == [(row, column, '*')]
+    assert board.lost()
+    assert board.is_revealed(row, column)
+    assert board.visible_codes(row, column, 1, 1)[0, 0] == MINE_CODE
+    assert render_window(board, row - 1, column - 1, 3, 3).splitlines()[1][1] == '*'
+    assert board.revealed_count() == 0
+    assert board.reveal(0, 0) == []
+
+
+def test_flags():
+    board = EndlessBoard(seed=3, chunk_size=8)
+    assert board.toggle_flag(-20, 30)
+    assert board.has_flag(-20, 30)
+    assert board.reveal(-20, 30) == []
+    assert not board.toggle_flag(-20, 30)
+    assert not board.has_flag(-20, 30)
+
+
+def test_evicted_chunks_keep_player_state():
+    board = EndlessBoard(seed=8, density=0.15, chunk_size=8)
+    board.max_active_chunks = 4
+    changed_cells = board.reveal(0, 0)
+    board.toggle_flag(500, 500)
+    for chunk_column in range(10, 30):
+        board.get_coordinates_info(0, chunk_column * 8)
+    assert board.active_chunks_count() == 4
+    assert board.compressed_chunks_count() > 0
+    assert board.has_flag(500, 500)
+    assert all(board.is_revealed(row, column) for row, column, symbol in changed_cells)
+    window = board.visible_codes(495, 495, 10, 10)
+    assert window[5, 5] == FLAG_CODE
+    assert (window == HIDDEN_CODE).sum() == 99
+
+
+def test_memory_scales_with_explored_area():
+    board = EndlessBoard(seed=2, density=0.2, chunk_size=16)
+    board.max_active_chunks = 16
+    for step in range(200):
+        board.toggle_flag(step * 16, step * 16)
+    assert board.active_chunks_count() == 16
+    assert board.memory_usage() < 16 * 16 * 16 * 2 + 200 * 64
+
+
+def test_invalid_board():
+    with pytest.raises(ValueError):
+        EndlessBoard(density=0)
+    with pytest.raises(ValueError):
+        EndlessBoard(chunk_size=1)
+
+
+def test_big_island_is_revealed_in_parts():
+    board = EndlessBoard(seed=3, density=0.15, chunk_size=8)
+    whole_island = EndlessBoard(seed=3, density=0.15, chunk_size=8).reveal(0, 0)
+    board.max_flood_cells = 10
+    changed_cells = board.reveal(0, 0)
+    assert len(changed_cells) == 10
+    assert board.has_pending_reveal()
+    while board.has_pending_reveal():
+        changed_cells += board.continue_reveal()
+    assert sorted(changed_cells) == sorted(whole_island)
+    assert board.revealed_count() == len(whole_island)
+    assert board.number_of_moves() == 1
+
+
+def test_play_endless():
+    board = EndlessBoard(seed=3, density=0.15, chunk_size=8)
+    output = io.StringIO()
+    score = play_endless(board, ['reveal 0 0', 'flag 30 30', 'reveal a b', 'quit', 'reveal 5 5'], output, 5, 9)
+    lines = output.getvalue().splitlines()
+    assert score == board.revealed_count() > 0
+    assert lines[5] == f'Score: {score}, moves: 1'
+    assert lines[6:11] == render_window(board, 28, 26, 5, 9).splitlines()
+    assert lines[8][4] == '?'
+    assert lines[12] == 'Wrong command: reveal a b'
+    assert len(lines) == 13
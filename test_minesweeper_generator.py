@@ -0,0 +1,37 @@
+import json
+
+from minesweeper_classes import Difficulty, board_3bv
+from minesweeper_generator import generate_board, generate_boards, generatorMain, unpack_layout
+
+
+def test_generate_board():
+    difficulty = Difficulty("Custom", (6, 7), 10)
+    board = generate_board(difficulty, 3, True, 0)
+    mine_mask = unpack_layout(board['layout'], 6, 7)
+    assert mine_mask.sum() == 10
+    assert not mine_mask[2:5, 2:5].any()
+    assert board['3bv'] == board_3bv(mine_mask)
+    assert board['islands'] == len(board['openings'])
+    assert board == generate_board(difficulty, 3, True, 0)
+
+
+def test_generate_boards_workers():
+    difficulty = Difficulty("Easy", (9, 9), 10)
+    single = list(generate_boards(difficulty, 6, seed=1))
+    pooled = list(generate_boards(difficulty, 6, seed=1, workers=2))
+    assert single == pooled
+
+
+def test_generator_main(tmp_path):
+    output = tmp_path / 'boards.jsonl'
+    generatorMain(['minesweeper_generator.py', '--custom', '5', '5', '4', '--count', '3', '--output', str(output)])
+    boards = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [board['index'] for board in boards] == [0, 1, 2]
+    assert all(board['mines'] == 4 for board in boards)
+
+
+def test_generate_no_guess_boards():
+    difficulty = Difficulty("Custom", (9, 9), 10, no_guess=True)
+    boards = list(generate_boards(difficulty, 3, seed=2))
+    assert all(board['no_guess'] for board in boards)
+    assert all(unpack_layout(board['layout'], 9, 9).sum() == 10 for board in boards)
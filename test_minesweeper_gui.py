@@ -1,9 +1,10 @@
 import pytest
-from PySide2.QtCore import Qt
+from PySide2.QtCore import Qt, QSize
 
-from minesweeper_classes import Game, Flag, Island, Board, Mines
+from minesweeper_classes import Game, Flag, Island, Board, Mines, Difficulty, HIDDEN_CODE, FLAG_CODE
 from minesweeper_errors import IconNotInKeysError
-from minesweeper_gui import icon_path, SetDifficulty, MinesweeperBoard
+from minesweeper_gui import icon_path, SetDifficulty, MinesweeperBoard, IconCache
+from minesweeper_recorder import read_recording, REVEAL_EVENT, END_EVENT, ABANDONED_RESULT
 
 
 def test_icon_paths():
@@ -69,3 +70,171 @@ def test_wrong_difficulty(qtbot):
     qtbot.mouseClick(confirm_button, Qt.LeftButton)
     assert difficulty_gui.difficulty_ui.startButton.isEnabled() is False
 
+
+def test_too_many_mines_for_no_guess(qtbot, monkeypatch):
+    game1 = Game(Board(), Flag(), Island(Board()), Mines())
+    difficulty_gui = SetDifficulty(MinesweeperBoard(game1), game1)
+    qtbot.addWidget(difficulty_gui)
+    errors = []
+    monkeypatch.setattr(difficulty_gui, 'amount_error_popup', errors.append)
+    difficulty_gui.difficulty_ui.customBox.setChecked(True)
+    difficulty_gui.difficulty_ui.noGuessBox.setChecked(True)
+    difficulty_gui.difficulty_ui.columnsSlider.setValue(5)
+    difficulty_gui.difficulty_ui.rowsSlider.setValue(5)
+    difficulty_gui.difficulty_ui.minesSlider.setValue(17)
+    qtbot.mouseClick(difficulty_gui.difficulty_ui.confirmButton, Qt.LeftButton)
+    assert errors == [9]
+    assert difficulty_gui.difficulty_ui.startButton.isEnabled() is False
+    difficulty_gui.difficulty_ui.minesSlider.setValue(16)
+    qtbot.mouseClick(difficulty_gui.difficulty_ui.confirmButton, Qt.LeftButton)
+    assert errors == [9]
+    assert difficulty_gui.board_gui.no_guess is True
+
+
+
+def test_virtual_board_flags(qtbot):
+    game1 = Game(Board(3, 5), Flag(), Island(Board(3, 5)), Mines(2))
+    board_gui = MinesweeperBoard(game1, virtual=True)
+    qtbot.addWidget(board_gui)
+    board_gui.build_game()
+    assert board_gui.board_model.rowCount() == 3
+    assert board_gui.board_model.columnCount() == 5
+    assert board_gui.buttons == {}
+    board_gui.right_click(1, 2)
+    assert board_gui.board_model.cell_state(1, 2) == FLAG_CODE
+    assert board_gui.is_cell_enabled(1, 2) is False
+    board_gui.right_click(1, 2)
+    assert board_gui.board_model.cell_state(1, 2) == HIDDEN_CODE
+
+
+def test_icon_cache(qtbot):
+    cache = IconCache()
+    cache.load(QSize(28, 28))
+    assert cache.icon('number_icon', '3', QSize(28, 28)) is cache.icon('number_icon', 3, QSize(28, 28))
+    assert cache.icon('flag_icon', size=QSize(28, 28)) is not cache.icon('flag_icon', size=QSize(45, 45))
+    with pytest.raises(IconNotInKeysError):
+        cache.icon('Bombs')
+
+
+def test_virtual_board_batch_reveal(qtbot):
+    game1 = Game(Board(3, 5), Flag(), Island(Board(3, 5)), Mines(1))
+    board_gui = MinesweeperBoard(game1, virtual=True)
+    qtbot.addWidget(board_gui)
+    board_gui.build_game()
+    with qtbot.waitSignal(board_gui.board_model.dataChanged):
+        board_gui.show_cells([(0, 0, 'blank_icon', None, True), (2, 4, 'number_icon', '2', True)])
+    assert board_gui.board_model.cell_state(0, 0) == 0
+    assert board_gui.board_model.cell_state(2, 4) == 2
+    assert board_gui.is_cell_enabled(1, 1) is True
+
+
+def plant_mines_on_first_click(board_gui, monkeypatch, mines_coordinates):
+    """
+    makes mine field of the board fixed, so first click can't end the game by chance
+    """
+    def create_mine_field(first_click_coordinates):
+        board_gui.Game.create_mine_field(first_click_coordinates, mines_coordinates=mines_coordinates)
+    monkeypatch.setattr(board_gui, 'create_mine_field', create_mine_field)
+
+
+def plant_mines_in_game(game, monkeypatch, mines_coordinates):
+    """
+    makes mine field of the game fixed, while board still creates it (and starts recording) itself
+    """
+    create_mine_field = game.create_mine_field
+
+    def create_planted_mine_field(first_move, *args, **kwargs):
+        create_mine_field(first_move, mines_coordinates=mines_coordinates)
+    monkeypatch.setattr(game, 'create_mine_field', create_planted_mine_field)
+
+
+def test_recording_has_seed(qtbot, monkeypatch, tmp_path):
+    game1 = Game(Board(3, 5), Flag(), Island(Board(3, 5)), Mines(1))
+    record_path = tmp_path / 'game.msr'
+    board_gui = MinesweeperBoard(game1, virtual=True, record_path=str(record_path))
+    qtbot.addWidget(board_gui)
+    board_gui.build_game()
+    plant_mines_in_game(game1, monkeypatch, [(0, 2)])
+    board_gui.left_click(1, 2)
+    board_gui.recorder.flush()
+    recording = read_recording(record_path)
+    assert isinstance(game1.seed, str)
+    assert recording.seed == game1.seed
+    assert recording.mines_coordinates() == [(0, 2)]
+
+
+def test_virtual_board_hints(qtbot, monkeypatch):
+    game1 = Game(Board(3, 5), Flag(), Island(Board(3, 5)), Mines(1))
+    board_gui = MinesweeperBoard(game1, virtual=True)
+    qtbot.addWidget(board_gui)
+    board_gui.build_game()
+    plant_mines_on_first_click(board_gui, monkeypatch, [(0, 2)])
+    board_gui.left_click(1, 2)
+    assert game1.lost() is False and game1.winning_conditions() is False
+    board_gui.toggle_hints()
+    assert board_gui.board_model.hint(1, 2) is None
+    assert board_gui.board_model.data(board_gui.board_model.index(0, 0), Qt.ToolTipRole) is not None
+    board_gui.toggle_hints()
+    assert board_gui.board_model.hint(0, 0) is None
+
+
+def test_restart_reuses_buttons(qtbot):
+    game1 = Game(Board(3, 5), Flag(), Island(Board(3, 5)), Mines(2))
+    board_gui = MinesweeperBoard(game1)
+    qtbot.addWidget(board_gui)
+    board_gui.build_game()
+    buttons = dict(board_gui.buttons)
+    board_gui.right_click(1, 2)
+    board_gui.restart_game()
+    assert board_gui.buttons == buttons
+    assert board_gui.is_cell_enabled(1, 2) is True
+    assert game1.number_of_moves() == 0 and game1.flags.flags_count() == 0
+    board_gui.restart_game(Difficulty("Custom", (4, 4), 3))
+    assert board_gui.table.rowCount() == 4
+    assert len(board_gui.buttons) == 16
+
+
+def test_virtual_board_restart(qtbot, monkeypatch):
+    game1 = Game(Board(3, 5), Flag(), Island(Board(3, 5)), Mines(2))
+    board_gui = MinesweeperBoard(game1, virtual=True)
+    qtbot.addWidget(board_gui)
+    board_gui.build_game()
+    plant_mines_on_first_click(board_gui, monkeypatch, [(0, 2), (2, 2)])
+    board_gui.left_click(1, 2)
+    assert game1.lost() is False and game1.winning_conditions() is False
+    board_gui.restart_game(seed=3)
+    assert board_gui.board_model.cell_state(1, 2) == HIDDEN_CODE
+    assert game1.seed == 3
+
+
+def test_restart_while_recording(qtbot, monkeypatch, tmp_path):
+    game1 = Game(Board(3, 5), Flag(), Island(Board(3, 5)), Mines(2))
+    board_gui = MinesweeperBoard(game1, virtual=True, record_path=str(tmp_path / 'game.msr'))
+    qtbot.addWidget(board_gui)
+    board_gui.build_game()
+    plant_mines_in_game(game1, monkeypatch, [(0, 2), (2, 2)])
+    board_gui.left_click(1, 2)
+    board_gui.restart_game()
+    board_gui.left_click(1, 1)
+    board_gui.recorder.flush()
+    first_game = read_recording(tmp_path / 'game.msr')
+    assert [event[:3] for event in first_game.events] == [(REVEAL_EVENT, 1, 2), (END_EVENT, ABANDONED_RESULT, 0)]
+    assert first_game.result() == 'abandoned'
+    second_game = read_recording(tmp_path / 'game-2.msr')
+    assert [event[:3] for event in second_game.events] == [(REVEAL_EVENT, 1, 1)]
+
+
+def test_endgame_popup_after_click(qtbot, monkeypatch):
+    game1 = Game(Board(3, 5), Flag(), Island(Board(3, 5)), Mines(1))
+    board_gui = MinesweeperBoard(game1, virtual=True)
+    qtbot.addWidget(board_gui)
+    board_gui.build_game()
+    plant_mines_on_first_click(board_gui, monkeypatch, [(0, 0)])
+    popups = []
+    monkeypatch.setattr(board_gui, 'endgame_popup', lambda game_won, time: popups.append(game_won))
+    board_gui.cell_left_clicked(2, 4)
+    assert game1.winning_conditions() is True
+    assert popups == []
+    qtbot.waitUntil(lambda: popups == [True])
+    qtbot.wait(10)
+    assert popups == [True]
@@ -0,0 +1,121 @@
+import time
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from minesweeper_classes import Board, CompactBoard, Flag, Island, Mines, Game, adjacent_mines_count
+from minesweeper_probability import MineProbabilities, count_group, weighted_group, bot_moves, play_bot
+from minesweeper_solver import Solver, enumerate_group
+
+
+def brute_force_probabilities(rows, columns, revealed, mines_amount):
+    hidden_cells = [(row, column) for row in range(rows) for column in range(columns) if (row, column) not in revealed]
+    mine_counts = dict.fromkeys(hidden_cells, 0)
+    layouts = 0
+    for mines in combinations(hidden_cells, mines_amount):
+        mine_mask = np.zeros((rows, columns), dtype=bool)
+        mine_mask[tuple(zip(*mines))] = True
+        numbers = adjacent_mines_count(mine_mask)
+        if all(numbers[cell] == mines_around for cell, mines_around in revealed.items()):
+            layouts += 1
+            for cell in mines:
+                mine_counts[cell] += 1
+    return {cell: count / layouts for cell, count in mine_counts.items()}
+
+
+def test_count_group_like_enumerate_group():
+    cells = [(0, 0), (0, 1), (0, 2), (0, 3)]
+    constraints = [({(0, 0), (0, 1)}, 1), ({(0, 1), (0, 2), (0, 3)}, 1), ({(0, 3)}, 0)]
+    expected = enumerate_group(cells, constraints)
+    results = count_group(cells, constraints)
+    assert {mines: [count, [cell_counts[cell] for cell in cells]] for mines, (count, cell_counts) in results.items()} == expected
+
+
+def test_weighted_group_like_enumerate_group():
+    cells = [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4)]
+    constraints = [({(0, 0), (0, 1), (0, 2)}, 1), ({(0, 2), (0, 3), (0, 4)}, 1)]
+    mine_weight = 0.5
+    counts = enumerate_group(cells, constraints)
+    total = sum(count * mine_weight ** mines for mines, (count, cell_counts) in counts.items())
+    probabilities, expected_mines = weighted_group(cells, constraints, mine_weight)
+    for index, cell in enumerate(cells):
+        expected = sum(cell_counts[index] * mine_weight ** mines for mines, (count, cell_counts) in counts.items()) / total
+        assert probabilities[cell] == pytest.approx(expected)
+    assert expected_mines == pytest.approx(sum(probabilities.values()))
+
+
+def loose_frontier(columns):
+    """
+    Digits 1 under every other cell of the middle row: long frontier with wide range of numbers of mines.
+    """
+    return {(2, column): 1 for column in range(1, columns, 2)}
+
+
+def test_approximation_close_to_exact():
+    revealed = loose_frontier(201)
+    exact_engine = MineProbabilities()
+    approximate_engine = MineProbabilities()
+    approximate_engine.max_exact_work = 0
+    exact, exact_other = exact_engine.calculate(3, 201, revealed, 67)
+    approximated, approximated_other = approximate_engine.calculate(3, 201, revealed, 67)
+    assert approximated.keys() == exact.keys()
+    for cell, probability in exact.items():
+        assert approximated[cell] == pytest.approx(probability, abs=0.01)
+    assert approximated_other == pytest.approx(exact_other, abs=0.01)
+
+
+def test_large_frontier_time():
+    columns = 3001
+    revealed = loose_frontier(columns)
+    engine = MineProbabilities()
+    start = time.perf_counter()
+    probabilities, other_probability = engine.calculate(3, columns, revealed, columns // 3)
+    assert time.perf_counter() - start < 15
+    assert len(probabilities) == 2 * columns - len(revealed)
+    assert all(0 <= probability <= 1 for probability in probabilities.values())
+    assert 0 < other_probability < 1
+
+
+def test_probabilities_like_brute_force():
+    revealed = {(1, 0): 1, (1, 1): 2, (2, 0): 0, (2, 1): 1, (2, 2): 1}
+    engine = MineProbabilities()
+    probabilities, other_probability = engine.calculate(3, 4, revealed, 3)
+    expected = brute_force_probabilities(3, 4, revealed, 3)
+    for cell, probability in expected.items():
+        assert probabilities.get(cell, other_probability) == pytest.approx(probability)
+
+
+def test_probabilities_cache():
+    engine = MineProbabilities()
+    revealed = {(0, 0): 1, (1, 0): 1, (0, 8): 1, (1, 8): 1}
+    engine.calculate(2, 9, revealed, 3)
+    assert engine.cache_misses == 2
+    revealed[(0, 4)] = 0
+    engine.calculate(2, 9, revealed, 3)
+    assert engine.cache_hits == 2
+    assert engine.cache_misses == 2
+
+
+def test_wrong_state():
+    with pytest.raises(ValueError):
+        MineProbabilities().calculate(2, 2, {(0, 0): 3}, 1)
+
+
+def test_bot():
+    rows, columns = 9, 9
+    board = CompactBoard(rows, columns)
+    board.set_visualization(rows, columns)
+    island_board = Board(rows, columns)
+    island_board.set_visualization(rows, columns)
+    game = Game(board, Flag(), Island(island_board), Mines(10))
+    game.index_tiles()
+    game.create_mine_field((4, 4), seed=5, safe_neighbours=True)
+    engine = MineProbabilities()
+    game.reveal(4, 4)
+    cells = bot_moves(game, engine)
+    safe_cells, mines = Solver.from_game(game).solve()
+    assert cells and (set(cells) <= safe_cells or not safe_cells)
+    won = play_bot(game, (4, 4), engine)
+    assert won == (not game.lost())
+    assert game.lost() or game.winning_conditions()
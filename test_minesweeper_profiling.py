@@ -0,0 +1,68 @@
+import io
+import os
+import subprocess
+import sys
+
+from minesweeper_classes import Board
+from minesweeper_profiling import Profiler, profiling_enabled, instrument, profiler, ENVIRONMENT_VARIABLE
+
+
+class Clicker:
+    def click(self, value):
+        return value * 2
+
+
+def test_profiling_enabled(monkeypatch):
+    monkeypatch.delenv(ENVIRONMENT_VARIABLE, raising=False)
+    assert profiling_enabled([]) is False
+    assert profiling_enabled(['minesweeper_main.py', '--profile']) is True
+    monkeypatch.setenv(ENVIRONMENT_VARIABLE, '0')
+    assert profiling_enabled([]) is False
+    monkeypatch.setenv(ENVIRONMENT_VARIABLE, '1')
+    assert profiling_enabled([]) is True
+
+
+def test_model_is_not_instrumented_by_default():
+    if not profiling_enabled():
+        assert not hasattr(Board.fill_mines, '__wrapped__')
+
+
+def test_click_histogram():
+    statistics = Profiler()
+    for seconds in (0.0005, 0.001, 0.003, 0.004, 2.0):
+        statistics.add_click(seconds)
+    assert statistics.click_histogram == [2, 0, 2, 0, 0, 0, 0, 0, 0, 0, 1]
+    summary = statistics.summary()
+    assert '<= 1 ms: 2' in summary and '> 1000 ms: 1' in summary
+
+
+def test_instrument_method():
+    profiler.reset()
+    instrument(Clicker, 'click', click=True)
+    assert Clicker().click(4) == 8
+    assert Clicker().click(5) == 10
+    assert Clicker.click.__name__ == 'click'
+    assert profiler.calls == {'Clicker.click': 2}
+    assert sum(profiler.click_histogram) == 2
+    stream = io.StringIO()
+    profiler.dump(stream)
+    assert 'Clicker.click: 2 calls' in stream.getvalue()
+    assert not profiler.has_records()
+
+
+def test_environment_variable_instruments_model():
+    script = (
+        'from minesweeper_classes import CompactBoard, Mines\n'
+        'board = CompactBoard(9, 9)\n'
+        'board.set_visualization(9, 9)\n'
+        'board.fill_mines(Mines(10), (0, 0), seed=1)\n'
+        'board.info_about_mines_pos()\n'
+    )
+    environment = dict(os.environ, **{ENVIRONMENT_VARIABLE: '1'})
+    result = subprocess.run(
+        [sys.executable, '-c', script], env=environment, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    assert result.returncode == 0
+    assert 'Board.fill_mines: 1 calls' in result.stderr
+    assert 'CompactBoard.info_about_mines_pos: 1 calls' in result.stderr
@@ -0,0 +1,110 @@
+import io
+
+import pytest
+
+from minesweeper_classes import Board, Flag, Island, Mines, Game
+from minesweeper_recorder import (
+    GameRecorder,
+    decode_recording,
+    encode_varint,
+    decode_varint,
+    REVEAL_EVENT,
+    FLAG_EVENT,
+    UNFLAG_EVENT,
+    END_EVENT,
+    ABANDONED_RESULT
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+
+def create_game(rows, columns, mines_amount, seed):
+    board = Board(rows, columns)
+    board.set_visualization(rows, columns)
+    island_board = Board(rows, columns)
+    island_board.set_visualization(rows, columns)
+    game = Game(board, Flag(), Island(island_board), Mines(mines_amount))
+    game.index_tiles()
+    game.create_mine_field((0, 0), seed)
+    return game
+
+
+def test_varint():
+    for value in (0, 1, 127, 128, 300, 2 ** 40):
+        encoded = encode_varint(value)
+        assert decode_varint(encoded + b'\x05', 0) == (value, len(encoded))
+    assert len(encode_varint(127)) == 1
+    assert len(encode_varint(16383)) == 2
+    with pytest.raises(ValueError):
+        encode_varint(-1)
+
+
+def test_record_game():
+    game = create_game(6, 7, 5, 3)
+    stream = io.BytesIO()
+    clock = FakeClock()
+    recorder = GameRecorder(stream, clock)
+    recorder.start(game, seed=3)
+    clock.now += 0.25
+    recorder.reveal(0, 0)
+    clock.now += 1.5
+    recorder.flag(5, 6)
+    recorder.unflag(5, 6)
+    assert stream.getvalue() == b''
+    recorder.finish(False)
+    recording = decode_recording(stream.getvalue())
+    assert (recording.rows, recording.columns, recording.mines_amount, recording.seed) == (6, 7, 5, '3')
+    assert sorted(recording.mines_coordinates()) == sorted(game.play_board.search_symbol_coordinates('*'))
+    assert recording.events == [
+        (REVEAL_EVENT, 0, 0, 250),
+        (FLAG_EVENT, 5, 6, 1750),
+        (UNFLAG_EVENT, 5, 6, 1750),
+        (END_EVENT, 0, 0, 1750)
+    ]
+    assert recording.result() == 'lost'
+    assert len(stream.getvalue()) < 40
+
+
+def test_abandoned_recording():
+    game = create_game(3, 3, 1, 1)
+    stream = io.BytesIO()
+    recorder = GameRecorder(stream)
+    recorder.start(game)
+    recorder.reveal(2, 2)
+    recorder.abandon()
+    recording = decode_recording(stream.getvalue())
+    assert recording.events[-1][:3] == (END_EVENT, ABANDONED_RESULT, 0)
+    assert recording.result() == 'abandoned'
+
+
+def test_mine_field_from_recorded_seed():
+    game = create_game(9, 9, 10, '123')
+    stream = io.BytesIO()
+    recorder = GameRecorder(stream)
+    recorder.start(game, seed='123')
+    recorder.finish(False)
+    recording = decode_recording(stream.getvalue())
+    regenerated_game = create_game(9, 9, 10, recording.seed)
+    assert (regenerated_game.play_board.symbol_mask('*') == recording.mine_mask).all()
+
+
+def test_interrupted_recording():
+    game = create_game(3, 3, 1, 1)
+    stream = io.BytesIO()
+    recorder = GameRecorder(stream)
+    recorder.start(game)
+    recorder.reveal(2, 2)
+    recorder.reveal(1, 2)
+    recorder.flush()
+    recording = decode_recording(stream.getvalue()[:-2])
+    assert recording.seed is None
+    assert [event[:3] for event in recording.events] == [(REVEAL_EVENT, 2, 2)]
+    assert recording.result() is None
+    with pytest.raises(ValueError):
+        decode_recording(b'game')
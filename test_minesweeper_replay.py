@@ -0,0 +1,86 @@
+import io
+
+import pytest
+
+from minesweeper_recorder import GameRecorder, decode_recording
+from minesweeper_replay import Replay, recorded_game, replayMain
+from test_minesweeper_recorder import FakeClock, create_game
+
+
+def record_game(game, moves):
+    stream = io.BytesIO()
+    clock = FakeClock()
+    recorder = GameRecorder(stream, clock)
+    recorder.start(game)
+    for event, row, column in moves:
+        clock.now += 0.1
+        if event == 'reveal':
+            game.reveal(row, column)
+            recorder.reveal(row, column)
+        elif event == 'flag':
+            game.flags.add_flag(row, column)
+            recorder.flag(row, column)
+        else:
+            game.flags.remove_flag(row, column)
+            recorder.unflag(row, column)
+        game.made_move()
+    recorder.finish(game.winning_conditions())
+    return decode_recording(stream.getvalue())
+
+
+def test_recorded_game():
+    game = create_game(5, 6, 4, 2)
+    recording = record_game(game, [])
+    replayed = recorded_game(recording)
+    assert sorted(replayed.play_board.search_symbol_coordinates('*')) == sorted(recording.mines_coordinates())
+    assert replayed.play_board.get_coordinates_info(1, 1) == game.play_board.get_coordinates_info(1, 1)
+
+
+def test_seek():
+    game = create_game(8, 8, 10, 4)
+    mines = set(game.play_board.search_symbol_coordinates('*'))
+    moves = []
+    for row in range(8):
+        for column in range(8):
+            if (row, column) in mines:
+                moves += [('flag', row, column), ('unflag', row, column), ('flag', row, column)]
+            else:
+                moves.append(('reveal', row, column))
+    recording = record_game(game, moves)
+    assert game.winning_conditions()
+    replay = Replay(recording, keyframe_interval=5)
+    assert replay.keyframes_count() == len(recording.events) // 5 + 1
+    states = []
+    for index in range(replay.events_count() + 1):
+        replay.seek(index)
+        states.append(replay.game.snapshot())
+    for index in (50, 3, 77, 0, 12, 13, len(states) - 1):
+        replay.seek(index)
+        assert replay.game.snapshot() == states[index]
+        assert replay.index() == index
+    assert replay.game.winning_conditions()
+    assert len(replay.visible_cells()) == 64
+    with pytest.raises(IndexError):
+        replay.seek(len(states))
+
+
+def test_lost_game(tmp_path, capsys):
+    game = create_game(4, 4, 3, 1)
+    mine = game.play_board.search_symbol_coordinates('*')[0]
+    recording = record_game(game, [('reveal', *mine)])
+    replay = Replay(recording)
+    replay.seek(1)
+    assert replay.game.lost()
+    assert replay.timestamp() == 100
+    assert sum(symbol == '*' for row, column, symbol in replay.visible_cells()) == 3
+    replay.seek(0)
+    assert not replay.game.lost()
+    path = tmp_path / 'game.msr'
+    stream = io.BytesIO()
+    recorder = GameRecorder(stream)
+    recorder.start(game)
+    recorder.reveal(*mine)
+    recorder.finish(False)
+    path.write_bytes(stream.getvalue())
+    replayMain(['minesweeper_replay.py', str(path), '--headless'])
+    assert 'lost after 1 moves' in capsys.readouterr().out
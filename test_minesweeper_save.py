@@ -0,0 +1,60 @@
+import pytest
+
+from minesweeper_classes import Board, CompactBoard, Flag, Island, Mines, Game
+from minesweeper_save import save_game, load_game, SavedGame
+
+
+def create_game(board_class, rows, columns, mines_amount, seed):
+    board = board_class(rows, columns)
+    board.set_visualization(rows, columns)
+    island_board = Board(rows, columns)
+    island_board.set_visualization(rows, columns)
+    game = Game(board, Flag(), Island(island_board), Mines(mines_amount))
+    game.index_tiles()
+    game.create_mine_field((0, 0), seed, safe_neighbours=True)
+    game.reveal(0, 0)
+    game.made_move()
+    return game
+
+
+@pytest.mark.parametrize('board_class', [Board, CompactBoard])
+def test_save_and_load(tmp_path, board_class):
+    game = create_game(board_class, 7, 9, 10, 2)
+    mine = game.play_board.search_symbol_coordinates('*')[0]
+    game.flags.add_flag(*mine)
+    if (6, 8) in game.remaining_tiles():
+        game.flags.add_flag(6, 8)
+    game.made_move()
+    path = tmp_path / 'game.mss'
+    save_game(game, path, 31.5)
+    loaded_game, elapsed_time = load_game(path, board_class)
+    assert elapsed_time == 31.5
+    assert loaded_game.snapshot() == game.snapshot()
+    assert loaded_game.flags.flag_coordinates()[0] == mine
+    assert loaded_game.flags.correct_flags() == game.flags.correct_flags()
+    assert loaded_game.play_board.visualization == game.play_board.visualization
+    assert loaded_game.visible_tiles() == game.visible_tiles()
+    assert loaded_game.winning_conditions() == game.winning_conditions()
+
+
+def test_saved_game_is_small(tmp_path):
+    game = create_game(CompactBoard, 300, 400, 20000, 1)
+    path = tmp_path / 'big.mss'
+    save_game(game, path)
+    assert path.stat().st_size < 300 * 400 // 4 + 100
+    with SavedGame(path) as saved_game:
+        assert (saved_game.rows, saved_game.columns, saved_game.mines_amount) == (300, 400, 20000)
+        assert saved_game.number_of_moves == 1
+        assert (saved_game.mine_mask() == game.play_board.symbol_mask('*')).all()
+        assert saved_game.revealed_mask().sum() == 300 * 400 - game.remaining_tiles_count()
+
+
+def test_damaged_save(tmp_path):
+    path = tmp_path / 'game.mss'
+    save_game(create_game(Board, 4, 4, 2, 1), path)
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        load_game(path)
+    path.write_bytes(b'')
+    with pytest.raises(ValueError):
+        load_game(path)
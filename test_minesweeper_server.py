@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from minesweeper_server import GameServer, GameSession, LatencyStats, parse_difficulty, LOST, PLAYING, WON
+from minesweeper_loadgen import run_load
+
+
+def test_parse_difficulty():
+    difficulty, arguments = parse_difficulty(['Hard', '5'])
+    assert difficulty.board_size == (30, 16) and arguments == ['5']
+    difficulty, arguments = parse_difficulty(['16x30', '99'])
+    assert difficulty.board_size == (16, 30) and difficulty.number_of_mines == 99 and arguments == []
+    with pytest.raises(ValueError):
+        parse_difficulty(['3x3', '9'])
+    with pytest.raises(ValueError):
+        parse_difficulty(['impossible'])
+    difficulty, arguments = parse_difficulty(['100x100', '1000'])
+    assert difficulty.board_size == (100, 100)
+    with pytest.raises(ValueError):
+        parse_difficulty(['101x100', '10'])
+
+
+def test_latency_stats():
+    latency = LatencyStats(size=10)
+    for milliseconds in range(1, 21):
+        latency.add(milliseconds / 1000)
+    assert latency.count() == 20
+    assert latency.percentile(50) == pytest.approx(0.0155)
+    assert latency.summary()['p99_ms'] == pytest.approx(19.91)
+
+
+def test_session_plays_until_end():
+    session = GameSession()
+    session.new_game(parse_difficulty(['easy'])[0], seed='3')
+    assert session.status() == PLAYING
+    assert session.flag(4, 4) == [(4, 4, '?')]
+    assert session.flag(4, 4) == [(4, 4, None)]
+    assert session.reveal(4, 4)[0][:2] == (4, 4)
+    mines = set(session.game.play_board.search_symbol_coordinates('*'))
+    for row in range(9):
+        for column in range(9):
+            if (row, column) not in mines and session.status() == PLAYING:
+                session.reveal(row, column)
+    assert session.status() == WON
+    with pytest.raises(ValueError):
+        session.reveal(0, 0)
+
+
+def test_chord_before_first_reveal():
+    server = GameServer()
+    session = GameSession()
+    server.execute(session, 'new easy 1')
+    response = server.execute(session, 'chord 0 0')
+    assert response['ok'] and response['cells'] == [] and response['moves'] == 0
+    server.execute(session, 'reveal 8 8')
+    assert session.game.play_board.symbol_mask('*').sum() == 10
+    server.execute(session, 'new easy 1')
+    response = server.execute(session, 'reveal 8 8')
+    assert response['status'] != LOST
+    assert session.game.play_board.symbol_mask('*').sum() == 10
+
+
+def test_server_commands():
+    server = GameServer()
+    session = GameSession()
+    assert server.execute(session, 'reveal 0 0')['ok'] is False
+    response = server.execute(session, 'new 5x5 3 1')
+    assert response == {'ok': True, 'rows': 5, 'columns': 5, 'mines': 3, 'status': PLAYING, 'moves': 0}
+    assert server.execute(session, 'reveal 9 0')['ok'] is False
+    assert server.execute(session, 'reveal -1 0')['ok'] is False
+    assert server.execute(session, 'flag 1')['ok'] is False
+    response = server.execute(session, 'reveal 2 2')
+    assert response['ok'] and response['moves'] == 1
+    state = server.execute(session, 'state')
+    assert sorted(map(tuple, state['cells'])) == sorted(response['cells'])
+    mine = session.game.play_board.search_symbol_coordinates('*')[0]
+    response = server.execute(session, f'reveal {mine[0]} {mine[1]}')
+    assert response['status'] == LOST
+    assert server.execute(session, 'dance')['ok'] is False
+    assert server.execute(session, 'quit') == {'ok': True, 'bye': True}
+
+
+def test_load_generator_against_server():
+    async def run():
+        server = GameServer()
+        port = await server.start(port=0)
+        try:
+            return await run_load('127.0.0.1', port, sessions=20, games=2, level='easy')
+        finally:
+            await server.close()
+
+    report = asyncio.run(run())
+    assert report['games'] == 40
+    assert sum(report['results'].values()) == 40
+    assert report['server']['sessions'] == 21
+    assert report['server']['games'] == 40
+    assert report['client']['commands'] > 40
+    assert report['client']['p99_ms'] >= report['client']['p50_ms']
@@ -0,0 +1,105 @@
+import numpy as np
+
+from minesweeper_classes import Board, Flag, Island, Mines, Game, Difficulty
+from minesweeper_solver import (
+    Solver,
+    cell_neighbours,
+    enumerate_group,
+    play_without_guessing,
+    generate_no_guess_layout
+)
+
+
+def create_game(visualization, mines_amount):
+    rows = len(visualization)
+    columns = len(visualization[0])
+    board = Board(rows, columns)
+    board.visualization = visualization
+    game = Game(board, Flag(), Island(Board(rows, columns)), Mines(mines_amount))
+    game.index_tiles()
+    return game
+
+
+def test_cell_neighbours_like_board():
+    board = Board(3, 4)
+    for row in range(3):
+        for column in range(4):
+            assert cell_neighbours(row, column, 3, 4) == board.cell_neighbours(row, column)
+
+
+def test_single_cell_rule():
+    game = create_game([['1', '*', '1'],
+                        ['1', '1', '1'],
+                        ['.', '.', '.']], 1)
+    game.reveal(2, 0)
+    safe_cells, mine_cells = Solver.from_game(game).solve()
+    assert mine_cells == {(0, 1)}
+    assert safe_cells == {(0, 0), (0, 2)}
+
+
+def test_subset_rule():
+    solver = Solver(2, 3, {(1, 0): 1, (1, 1): 2, (1, 2): 1})
+    safe_cells, mine_cells = solver.solve()
+    assert mine_cells == {(0, 0), (0, 2)}
+    assert safe_cells == {(0, 1)}
+
+
+def test_fifty_fifty_is_not_solved():
+    solver = Solver(2, 2, {(1, 0): 1, (1, 1): 1})
+    assert solver.solve() == (set(), set())
+
+
+def test_mines_amount_rule():
+    solver = Solver(2, 2, {(1, 0): 1, (1, 1): 1}, mines=[(0, 0)], mines_amount=1)
+    assert solver.solve() == ({(0, 1)}, set())
+
+
+def test_trusted_flags():
+    game = create_game([['1', '*', '1', '.'],
+                        ['1', '1', '1', '.']], 1)
+    game.reveal(1, 1)
+    game.flags.add_flag(0, 1)
+    assert Solver.from_game(game).solve() == (set(), set())
+    safe_cells, mine_cells = Solver.from_game(game, trust_flags=True).solve()
+    assert safe_cells == {(0, 0), (0, 2), (0, 3), (1, 0), (1, 2), (1, 3)}
+    assert mine_cells == set()
+
+
+def test_enumerate_group():
+    cells = [(0, 0), (0, 1), (0, 2)]
+    results = enumerate_group(cells, [({(0, 0), (0, 1)}, 1), ({(0, 1), (0, 2)}, 1)])
+    assert results == {1: [1, [0, 1, 0]], 2: [1, [1, 0, 1]]}
+
+
+def test_play_without_guessing():
+    mine_mask = np.zeros((2, 2), dtype=bool)
+    mine_mask[0, 0] = True
+    assert play_without_guessing(mine_mask, (1, 1)) == (False, {(1, 1)})
+    mine_mask = np.zeros((3, 5), dtype=bool)
+    mine_mask[0, 4] = True
+    cleared, revealed = play_without_guessing(mine_mask, (2, 0))
+    assert cleared
+    assert len(revealed) == 14
+
+
+def test_generate_no_guess_layout():
+    for seed in range(5):
+        mines_coordinates, statistics = generate_no_guess_layout(16, 30, 99, (8, 15), seed, time_budget=5)
+        assert statistics['solved']
+        assert len(set(mines_coordinates)) == 99
+        assert all(abs(row - 8) > 1 or abs(column - 15) > 1 for row, column in mines_coordinates)
+        mine_mask = np.zeros((16, 30), dtype=bool)
+        mine_mask[tuple(zip(*mines_coordinates))] = True
+        assert play_without_guessing(mine_mask, (8, 15))[0]
+    first_layout = generate_no_guess_layout(9, 9, 10, (4, 4), 3, time_budget=5)[0]
+    assert first_layout == generate_no_guess_layout(9, 9, 10, (4, 4), 3, time_budget=5)[0]
+
+
+def test_no_guess_game():
+    game = create_game([['.'] * 9 for row in range(9)], 10)
+    game.islands.island_board().set_visualization(9, 9)
+    mines_coordinates, statistics = generate_no_guess_layout(9, 9, 10, (4, 4), 1)
+    game.create_mine_field((4, 4), mines_coordinates=mines_coordinates)
+    assert sorted(game.play_board.search_symbol_coordinates('*')) == sorted(mines_coordinates)
+    assert game.reveal(4, 4)
+    assert Difficulty("Easy", (9, 9), 10, no_guess=True).no_guess
@@ -66,6 +66,9 @@ class Ui_MainWindow(object):
         self.customBox = QCheckBox(self.centralwidget)
         self.customBox.setObjectName(u"customBox")
         self.customBox.setGeometry(QRect(160, 170, 201, 41))
+        self.noGuessBox = QCheckBox(self.centralwidget)
+        self.noGuessBox.setObjectName(u"noGuessBox")
+        self.noGuessBox.setGeometry(QRect(360, 460, 201, 41))
         self.difficultyBox = QComboBox(self.centralwidget)
         self.difficultyBox.addItem("")
         self.difficultyBox.addItem("")
@@ -124,6 +127,7 @@ class Ui_MainWindow(object):
         self.startButton.setText(QCoreApplication.translate("MainWindow", u"Start Game", None))
         self.columnsSliderLabel.setText("")
         self.customBox.setText(QCoreApplication.translate("MainWindow", u"Custom Settings", None))
+        self.noGuessBox.setText(QCoreApplication.translate("MainWindow", u"No guessing", None))
         self.difficultyBox.setItemText(0, QCoreApplication.translate("MainWindow", u"Easy", None))
         self.difficultyBox.setItemText(1, QCoreApplication.translate("MainWindow", u"Medium", None))
         self.difficultyBox.setItemText(2, QCoreApplication.translate("MainWindow", u"Hard", None))